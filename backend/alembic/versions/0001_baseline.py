@@ -0,0 +1,22 @@
+"""Baseline: the schema created by the Supabase SQL scripts
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-07-01
+
+Tables like applicant, licenseapplication and appointment, together with their
+id sequences (application_seq, history_seq, ...), already exist in every
+deployed database. Mark such a database with `alembic stamp 0001`, then run
+`alembic upgrade head`.
+"""
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    pass
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,76 @@
+"""Tables and sequences the application added outside the Supabase scripts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-07-01
+
+email_otps, emailoutbox and license_number_seq were declared on the models
+but never had DDL. Databases where they were created by hand are left as
+they are (offline `--sql` output assumes they are missing).
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def _has_table(name: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade() -> None:
+    if not _has_table("email_otps"):
+        op.create_table(
+            "email_otps",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("otp_code", sa.String(4), nullable=False),
+            sa.Column(
+                "otp_type",
+                sa.Enum("REGISTRATION", "LOGIN", "PASSWORD_RESET", name="otptype"),
+                nullable=False
+            ),
+            sa.Column("is_used", sa.Boolean(), server_default=sa.false()),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("used_at", sa.DateTime(timezone=True), nullable=True)
+        )
+        op.create_index("ix_email_otps_id", "email_otps", ["id"])
+        op.create_index("ix_email_otps_email", "email_otps", ["email"])
+
+    if not _has_table("emailoutbox"):
+        op.create_table(
+            "emailoutbox",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("to_email", sa.String(), nullable=False),
+            sa.Column("subject", sa.String(), nullable=False),
+            sa.Column("html_content", sa.Text(), nullable=False),
+            sa.Column("text_content", sa.Text()),
+            sa.Column("status", sa.Text(), nullable=False, server_default="Pending"),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("last_error", sa.Text()),
+            sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+            sa.CheckConstraint(
+                "status IN ('Pending', 'Sending', 'Sent', 'Failed')",
+                name="check_email_outbox_status"
+            )
+        )
+        op.create_index("ix_emailoutbox_status_next_attempt", "emailoutbox", ["status", "next_attempt_at"])
+
+    op.execute("CREATE SEQUENCE IF NOT EXISTS license_number_seq START WITH 1 INCREMENT BY 100")
+    op.create_index(
+        "ux_applicant_license_number", "applicant", ["license_number"],
+        unique=True, if_not_exists=True
+    )
+
+def downgrade() -> None:
+    op.drop_index("ux_applicant_license_number", table_name="applicant", if_exists=True)
+    op.execute("DROP SEQUENCE IF EXISTS license_number_seq")
+    op.drop_table("emailoutbox")
+    op.drop_table("email_otps")
+    op.execute("DROP TYPE IF EXISTS otptype")
@@ -0,0 +1,109 @@
+"""Indexes for the lookups in app/crud
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-07-01
+
+Each index matches the filter and sort of one CRUD query:
+
+  licenseapplication (applicant_id, submission_date DESC)       get_by_applicant
+  licenseapplication (application_status_id, submission_date DESC)  get_by_status, status filters
+  licenseapplication (submission_date DESC)                     admin listing, date ranges
+  applicationstatushistory (application_id, status_change_date) status history
+  applicationvehiclecategory (application_id)                   vehicle categories per application
+  submitteddocuments (application_id, document_type)            get_by_application, get_by_type
+  submitteddocuments (uploaded_at) WHERE NOT is_verified        get_unverified_documents
+  appointment (location_id, appointment_date, appointment_time) get_by_date, get_available_slots
+  appointment (application_id, appointment_date DESC)           get_by_application
+  email_otps (email, otp_type, expires_at) WHERE NOT is_used    verify_otp, get_by_email_and_type
+  emailoutbox (next_attempt_at) WHERE status IN (Pending, Sending)  claim_batch
+  familyinformation / emergencycontact / employment (applicant_id)  get_by_applicant
+
+The partial indexes only hold the rows their query can return. Verified
+documents, used OTPs and sent mail make up most of those tables, and they
+never enter the index. The emailoutbox partial index replaces the
+(status, next_attempt_at) index from 0002.
+
+Indexes are built CONCURRENTLY outside the migration transaction, so writes
+are not blocked on a live database. A build that fails leaves an INVALID
+index behind; drop it and run the upgrade again. applicant.email is only
+indexed when no unique constraint or index covers it already (checked
+online only).
+
+Check the plans against a seeded copy with `python -m app.testing.query_plans`.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial WHERE clause)
+INDEXES = [
+    ("ix_licenseapplication_applicant_submitted", "licenseapplication",
+     ["applicant_id", sa.text("submission_date DESC")], None),
+    ("ix_licenseapplication_status_submitted", "licenseapplication",
+     ["application_status_id", sa.text("submission_date DESC")], None),
+    ("ix_licenseapplication_submitted", "licenseapplication",
+     [sa.text("submission_date DESC")], None),
+    ("ix_applicationstatushistory_application_changed", "applicationstatushistory",
+     ["application_id", "status_change_date"], None),
+    ("ix_applicationvehiclecategory_application", "applicationvehiclecategory",
+     ["application_id"], None),
+    ("ix_submitteddocuments_application_type", "submitteddocuments",
+     ["application_id", "document_type"], None),
+    ("ix_submitteddocuments_unverified_uploaded", "submitteddocuments",
+     ["uploaded_at"], "is_verified = false"),
+    ("ix_appointment_location_date_time", "appointment",
+     ["location_id", "appointment_date", "appointment_time"], None),
+    ("ix_appointment_application_date", "appointment",
+     ["application_id", sa.text("appointment_date DESC")], None),
+    ("ix_email_otps_active_lookup", "email_otps",
+     ["email", "otp_type", "expires_at"], "is_used = false"),
+    ("ix_emailoutbox_due", "emailoutbox",
+     ["next_attempt_at"], "status IN ('Pending', 'Sending')"),
+    ("ix_familyinformation_applicant", "familyinformation", ["applicant_id"], None),
+    ("ix_emergencycontact_applicant", "emergencycontact", ["applicant_id"], None),
+    ("ix_employment_applicant", "employment", ["applicant_id"], None),
+]
+
+def _email_is_indexed() -> bool:
+    if context.is_offline_mode():
+        # the Supabase schema declares applicant.email UNIQUE
+        return True
+    inspector = sa.inspect(op.get_bind())
+    unique_columns = [constraint["column_names"] for constraint in inspector.get_unique_constraints("applicant")]
+    index_columns = [index["column_names"] for index in inspector.get_indexes("applicant")]
+    return any(columns and columns[0] == "email" for columns in unique_columns + index_columns)
+
+def upgrade() -> None:
+    index_email = not _email_is_indexed()
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+        if index_email:
+            op.create_index(
+                "ux_applicant_email", "applicant", ["email"],
+                unique=True, postgresql_concurrently=True, if_not_exists=True
+            )
+        op.drop_index(
+            "ix_emailoutbox_status_next_attempt", table_name="emailoutbox",
+            postgresql_concurrently=True, if_exists=True
+        )
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_emailoutbox_status_next_attempt", "emailoutbox", ["status", "next_attempt_at"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,230 @@
+"""Partition licenseapplication and applicationstatushistory by month
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-07-15
+
+Both tables become RANGE partitioned on their timestamp (submission_date,
+status_change_date) with one partition per calendar month (UTC) plus a
+DEFAULT partition. Date-bounded queries such as the analytics trends and
+monthly statistics only read the partitions their range overlaps.
+
+ensure_monthly_partitions(parent, months_ahead, from_month) creates any
+missing monthly partitions from `from_month` (default: the current month)
+through `months_ahead` months ahead. The partition maintenance worker
+(app/utils/partitions.py) calls it at startup and then daily, so inserts
+never fall through to the DEFAULT partition.
+
+A unique constraint on a partitioned table must include the partition key.
+The primary keys therefore become (application_id, submission_date) and
+(history_id, status_change_date). Foreign keys cannot reference
+licenseapplication(application_id) any more, so application ids are also
+kept in licenseapplication_ids, an unpartitioned table maintained by
+triggers. That table enforces global uniqueness, and every foreign key that
+used to point at licenseapplication (history, vehicle categories, documents,
+appointments, ...) now points at it with the same ON DELETE/ON UPDATE actions.
+application_id and submission_date can no longer be updated. The application
+never changes either of them.
+
+Migration path: each table is renamed, a partitioned copy is created with
+the same columns, defaults and checks, the rows are copied, and the old
+table is dropped. It runs in one transaction and holds exclusive locks on
+both tables until it commits, so schedule a maintenance window. Views
+(or other objects) that depend on the old tables make the DROP fail; recreate
+them after the upgrade. Grants, row level security policies and indexes
+other than those from 0003 are not copied.
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+ENSURE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(
+    parent text,
+    months_ahead integer,
+    from_month date DEFAULT NULL
+) RETURNS SETOF text LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', coalesce(from_month, (now() AT TIME ZONE 'UTC')::date))::date;
+    last_month date := date_trunc('month', (now() AT TIME ZONE 'UTC')::date)::date + make_interval(months => months_ahead);
+    partition_name text;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := format('%s_p%s', parent, to_char(month_start, 'YYYY_MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                parent,
+                month_start::timestamp AT TIME ZONE 'UTC',
+                (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+            );
+            RETURN NEXT partition_name;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$;
+"""
+
+SYNC_APPLICATION_IDS = """
+CREATE OR REPLACE FUNCTION licenseapplication_ids_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO licenseapplication_ids (application_id) VALUES (NEW.application_id);
+        RETURN NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM licenseapplication_ids WHERE application_id = OLD.application_id;
+        RETURN NULL;
+    END IF;
+    IF NEW.application_id IS DISTINCT FROM OLD.application_id
+        OR NEW.submission_date IS DISTINCT FROM OLD.submission_date THEN
+        RAISE EXCEPTION 'application_id and submission_date of licenseapplication cannot be changed';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+"""
+
+PROTECT_HISTORY_KEY = """
+CREATE OR REPLACE FUNCTION applicationstatushistory_protect_key() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.history_id IS DISTINCT FROM OLD.history_id
+        OR NEW.status_change_date IS DISTINCT FROM OLD.status_change_date THEN
+        RAISE EXCEPTION 'history_id and status_change_date of applicationstatushistory cannot be changed';
+    END IF;
+    RETURN NEW;
+END;
+$$;
+"""
+
+# Re-point every foreign key that references `source` at `target` (same columns and actions)
+RETARGET_FOREIGN_KEYS = """
+DO $$
+DECLARE
+    fk record;
+BEGIN
+    FOR fk IN
+        SELECT conrelid::regclass AS child, conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = '{source}'::regclass
+    LOOP
+        EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.child, fk.conname);
+        EXECUTE format(
+            'ALTER TABLE %s ADD CONSTRAINT %I %s',
+            fk.child, fk.conname,
+            regexp_replace(fk.definition, 'REFERENCES (public\\.)?{source}\\(', 'REFERENCES {target}(')
+        );
+    END LOOP;
+END;
+$$;
+"""
+
+# Copy the foreign keys declared on `source` to `target`
+COPY_OWN_FOREIGN_KEYS = """
+DO $$
+DECLARE
+    fk record;
+BEGIN
+    FOR fk IN
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = '{source}'::regclass
+    LOOP
+        EXECUTE format('ALTER TABLE {target} ADD CONSTRAINT %I %s', fk.conname, fk.definition);
+    END LOOP;
+END;
+$$;
+"""
+
+# table -> (partition column, primary key, sequence behind the id default, indexes to recreate)
+TABLES = {
+    "licenseapplication": ("submission_date", ["application_id"], "application_seq", [
+        "CREATE INDEX ix_licenseapplication_applicant_submitted "
+        "ON licenseapplication (applicant_id, submission_date DESC)",
+        "CREATE INDEX ix_licenseapplication_status_submitted "
+        "ON licenseapplication (application_status_id, submission_date DESC)",
+        "CREATE INDEX ix_licenseapplication_submitted ON licenseapplication (submission_date DESC)",
+    ]),
+    "applicationstatushistory": ("status_change_date", ["history_id"], "history_seq", [
+        "CREATE INDEX ix_applicationstatushistory_application_changed "
+        "ON applicationstatushistory (application_id, status_change_date)",
+    ]),
+}
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Swap `table` for a copy that is (or is no longer) partitioned by month"""
+    column, key, sequence, indexes = TABLES[table]
+    old = f"{table}_rebuild"
+
+    # The id default draws from a sequence that may be owned by the old column
+    op.execute(f"ALTER SEQUENCE IF EXISTS {sequence} OWNED BY NONE")
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+
+    partition_clause = f" PARTITION BY RANGE ({column})" if partitioned else ""
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+        f"INCLUDING GENERATED INCLUDING COMMENTS){partition_clause}"
+    )
+    if partitioned:
+        op.execute(f"UPDATE {old} SET {column} = now() WHERE {column} IS NULL")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(
+            f"SELECT ensure_monthly_partitions('{table}', {MONTHS_AHEAD}, "
+            f"(SELECT min({column} AT TIME ZONE 'UTC')::date FROM {old}))"
+        )
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(COPY_OWN_FOREIGN_KEYS.format(source=old, target=table))
+    op.execute(f"DROP TABLE {old}")
+
+    primary_key = key + [column] if partitioned else key
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({', '.join(primary_key)})")
+    for statement in indexes:
+        op.execute(statement)
+
+def upgrade() -> None:
+    op.execute(ENSURE_MONTHLY_PARTITIONS)
+
+    # Global application ids, referenced by every child table from now on
+    op.execute("CREATE TABLE licenseapplication_ids (application_id varchar PRIMARY KEY)")
+    op.execute("INSERT INTO licenseapplication_ids SELECT application_id FROM licenseapplication")
+    op.execute(RETARGET_FOREIGN_KEYS.format(source="licenseapplication", target="licenseapplication_ids"))
+
+    _rebuild("licenseapplication", partitioned=True)
+    _rebuild("applicationstatushistory", partitioned=True)
+
+    op.execute(SYNC_APPLICATION_IDS)
+    op.execute(
+        "CREATE TRIGGER licenseapplication_ids_sync AFTER INSERT OR DELETE ON licenseapplication "
+        "FOR EACH ROW EXECUTE FUNCTION licenseapplication_ids_sync()"
+    )
+    op.execute(
+        "CREATE TRIGGER licenseapplication_protect_key BEFORE UPDATE ON licenseapplication "
+        "FOR EACH ROW EXECUTE FUNCTION licenseapplication_ids_sync()"
+    )
+    op.execute(PROTECT_HISTORY_KEY)
+    op.execute(
+        "CREATE TRIGGER applicationstatushistory_protect_key BEFORE UPDATE ON applicationstatushistory "
+        "FOR EACH ROW EXECUTE FUNCTION applicationstatushistory_protect_key()"
+    )
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS applicationstatushistory_protect_key ON applicationstatushistory")
+    op.execute("DROP TRIGGER IF EXISTS licenseapplication_protect_key ON licenseapplication")
+    op.execute("DROP TRIGGER IF EXISTS licenseapplication_ids_sync ON licenseapplication")
+
+    _rebuild("applicationstatushistory", partitioned=False)
+    _rebuild("licenseapplication", partitioned=False)
+
+    op.execute(RETARGET_FOREIGN_KEYS.format(source="licenseapplication_ids", target="licenseapplication"))
+    op.execute("DROP TABLE licenseapplication_ids")
+    op.execute("DROP FUNCTION IF EXISTS applicationstatushistory_protect_key()")
+    op.execute("DROP FUNCTION IF EXISTS licenseapplication_ids_sync()")
+    op.execute("DROP FUNCTION IF EXISTS ensure_monthly_partitions(text, integer, date)")
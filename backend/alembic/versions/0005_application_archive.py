@@ -0,0 +1,76 @@
+"""Archive table for finalized applications
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-07-22
+
+archivedapplications already holds the application columns; it gains
+archived_at and application_graph (the application with all child rows, see
+app/crud/archive.py). The graph is stored with lz4 compression where the
+server supports it (pglz otherwise); it is TOASTed, so listing the archive
+only reads the narrow stub columns.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def _has_table(name: str) -> bool:
+    if context.is_offline_mode():
+        return True
+    return sa.inspect(op.get_bind()).has_table(name)
+
+def upgrade() -> None:
+    if not _has_table("archivedapplications"):
+        op.execute("CREATE SEQUENCE IF NOT EXISTS archive_seq")
+        op.create_table(
+            "archivedapplications",
+            sa.Column(
+                "archive_id", sa.String(), primary_key=True,
+                server_default=sa.text("'ARCH_' || lpad(nextval('archive_seq')::text, 3, '0')")
+            ),
+            sa.Column("application_id", sa.String(), nullable=False),
+            sa.Column("applicant_id", sa.String()),
+            sa.Column("application_type_id", sa.String()),
+            sa.Column("application_status_id", sa.String()),
+            sa.Column("submission_date", sa.DateTime(timezone=True)),
+            sa.Column("last_updated_date", sa.DateTime(timezone=True)),
+            sa.Column("rejection_reason", sa.Text()),
+            sa.Column("additional_requirements", sa.String())
+        )
+
+    op.execute("ALTER TABLE archivedapplications ADD COLUMN IF NOT EXISTS archived_at timestamptz DEFAULT now()")
+    op.add_column("archivedapplications", sa.Column("application_graph", postgresql.JSONB()), if_not_exists=True)
+    op.execute("""
+        DO $$
+        BEGIN
+            ALTER TABLE archivedapplications ALTER COLUMN application_graph SET COMPRESSION lz4;
+        EXCEPTION WHEN OTHERS THEN
+            RAISE NOTICE 'lz4 unavailable, application_graph keeps the default compression';
+        END;
+        $$
+    """)
+
+    op.create_index(
+        "ux_archivedapplications_application", "archivedapplications", ["application_id"],
+        unique=True, if_not_exists=True
+    )
+    op.create_index(
+        "ix_archivedapplications_applicant_submitted", "archivedapplications",
+        ["applicant_id", sa.text("submission_date DESC")], if_not_exists=True
+    )
+    op.create_index(
+        "ix_archivedapplications_submitted", "archivedapplications",
+        [sa.text("submission_date DESC")], if_not_exists=True
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_archivedapplications_submitted", table_name="archivedapplications", if_exists=True)
+    op.drop_index("ix_archivedapplications_applicant_submitted", table_name="archivedapplications", if_exists=True)
+    op.drop_index("ux_archivedapplications_application", table_name="archivedapplications", if_exists=True)
+    op.drop_column("archivedapplications", "application_graph")
+    op.drop_column("archivedapplications", "archived_at")
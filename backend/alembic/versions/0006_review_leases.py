@@ -0,0 +1,41 @@
+"""Leases of the admin review work-queue
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-08-05
+
+One row per application or document a reviewer has claimed (see
+app/crud/review_queue.py). Rows are replaced when an expired lease is
+claimed again and deleted when the review is completed or released.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "reviewlease",
+        sa.Column("queue", sa.Text(), primary_key=True),
+        sa.Column("item_id", sa.String(), primary_key=True),
+        sa.Column("lease_id", postgresql.UUID(as_uuid=True), nullable=False, unique=True),
+        sa.Column("reviewer", sa.String(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.CheckConstraint(
+            "queue IN ('applications', 'documents')",
+            name="check_review_lease_queue"
+        ),
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_reviewlease_reviewer", "reviewlease", ["reviewer", "expires_at"], if_not_exists=True
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_reviewlease_reviewer", table_name="reviewlease", if_exists=True)
+    op.drop_table("reviewlease")
@@ -0,0 +1,44 @@
+"""Idempotency keys of retried write requests
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-08-12
+
+Stores the Idempotency-Key of submit-complete, document upload and
+appointment booking requests with the response they produced, so retries
+are answered from here (see app/api/idempotency.py). Rows expire after
+IDEMPOTENCY_TTL_HOURS and are purged by IdempotencyPurgeWorker.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotencykey",
+        sa.Column("owner", sa.String(), primary_key=True),
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("endpoint", sa.Text(), nullable=False),
+        sa.Column("fingerprint", sa.String(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default="Processing"),
+        sa.Column("locked_until", sa.DateTime(timezone=True)),
+        sa.Column("response_status", sa.Integer()),
+        sa.Column("response_content_type", sa.Text()),
+        sa.Column("response_body", sa.LargeBinary()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.CheckConstraint(
+            "status IN ('Processing', 'Completed')",
+            name="check_idempotency_key_status"
+        ),
+        if_not_exists=True
+    )
+    op.create_index("ix_idempotencykey_expires", "idempotencykey", ["expires_at"], if_not_exists=True)
+
+def downgrade() -> None:
+    op.drop_index("ix_idempotencykey_expires", table_name="idempotencykey", if_exists=True)
+    op.drop_table("idempotencykey")
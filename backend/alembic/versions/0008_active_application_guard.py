@@ -0,0 +1,89 @@
+"""One active application per applicant and type
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-08-19
+
+An applicant may have at most one active application (pending, subject for
+approval or for resubmission) of each type. submit-complete used to check
+this by reading the applicant's applications, which two concurrent
+submissions could both pass.
+
+A partial unique index would say it directly, but licenseapplication is
+partitioned (0004) and its unique indexes must include submission_date. As
+with licenseapplication_ids, the rule is kept in an unpartitioned table
+instead: licenseapplication_active holds one row per active application,
+keyed by (applicant_id, application_type_id), and a trigger inserts and
+deletes its rows as applications are inserted, change status or are
+deleted. A second active application of a type fails with a unique
+violation on licenseapplication_active_pkey, in whichever statement makes
+it active.
+
+The backfill keeps the most recent active application of each applicant
+and type. Older duplicates that already exist stay untracked: the trigger
+lets them move between active statuses (a row that was active but had no
+licenseapplication_active row is not added), and once they leave the
+active statuses they are gone from the rule. List them with
+
+    SELECT applicant_id, application_type_id, count(*) FROM licenseapplication
+    WHERE application_status_id IN ('ASID_PEN', 'ASID_SFA', 'ASID_RSB')
+    GROUP BY 1, 2 HAVING count(*) > 1;
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUS_IDS = "('ASID_PEN', 'ASID_SFA', 'ASID_RSB')"
+
+# An active row without a licenseapplication_active row is a duplicate from
+# before the backfill; it stays untracked while it remains active
+SYNC_ACTIVE_APPLICATIONS = f"""
+CREATE OR REPLACE FUNCTION licenseapplication_active_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    untracked boolean := false;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.application_status_id IN {ACTIVE_STATUS_IDS} THEN
+        DELETE FROM licenseapplication_active WHERE application_id = OLD.application_id;
+        untracked := NOT FOUND;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.application_status_id IN {ACTIVE_STATUS_IDS} AND NOT untracked THEN
+        INSERT INTO licenseapplication_active (applicant_id, application_type_id, application_id)
+        VALUES (NEW.applicant_id, NEW.application_type_id, NEW.application_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS licenseapplication_active (
+            applicant_id varchar NOT NULL,
+            application_type_id varchar NOT NULL,
+            application_id varchar NOT NULL UNIQUE,
+            PRIMARY KEY (applicant_id, application_type_id)
+        )
+    """)
+    op.execute(f"""
+        INSERT INTO licenseapplication_active (applicant_id, application_type_id, application_id)
+        SELECT DISTINCT ON (applicant_id, application_type_id) applicant_id, application_type_id, application_id
+        FROM licenseapplication
+        WHERE application_status_id IN {ACTIVE_STATUS_IDS}
+        ORDER BY applicant_id, application_type_id, submission_date DESC
+        ON CONFLICT DO NOTHING
+    """)
+
+    op.execute(SYNC_ACTIVE_APPLICATIONS)
+    op.execute(
+        "CREATE TRIGGER licenseapplication_active_sync "
+        "AFTER INSERT OR DELETE OR UPDATE OF application_status_id, applicant_id, application_type_id "
+        "ON licenseapplication FOR EACH ROW EXECUTE FUNCTION licenseapplication_active_sync()"
+    )
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS licenseapplication_active_sync ON licenseapplication")
+    op.execute("DROP FUNCTION IF EXISTS licenseapplication_active_sync()")
+    op.execute("DROP TABLE IF EXISTS licenseapplication_active")
@@ -8,9 +8,10 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import SessionLocal
-from app.crud import crud_applicant, crud_application, crud_document, crud_appointment
+from app.crud import crud_applicant
 from app.models.applicant import Applicant
 from app.utils.supabase_auth import supabase_auth
+from app.api.loaders import RequestLoader
 
 from contextlib import contextmanager
 from datetime import datetime, timedelta
@@ -27,6 +28,10 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+def get_loader(db: Session = Depends(get_db)) -> RequestLoader:
+    """Request-scoped entity loader; FastAPI reuses one instance per request."""
+    return RequestLoader(db)
+
 async def get_current_user_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -48,9 +53,22 @@ async def get_current_user_token(
     
     return user_data
 
+async def get_optional_user_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[dict]:
+    """
+    Supabase user data when the request carries a valid bearer token, None
+    when it carries none or an invalid/expired one, so the caller is served
+    as anonymous instead of rejected.
+    """
+    if not credentials:
+        return None
+    return await supabase_auth.verify_token(credentials.credentials) or None
+
 async def get_current_applicant(
     db: Session = Depends(get_db),
-    user_data: dict = Depends(get_current_user_token)
+    user_data: dict = Depends(get_current_user_token),
+    loader: RequestLoader = Depends(get_loader)
 ) -> Applicant:
     """
     Get current authenticated applicant using Supabase user data.
@@ -66,7 +84,7 @@ async def get_current_applicant(
         )
     
     # Find applicant by UUID or email
-    applicant = crud_applicant.get_by_uuid(db, user_uuid=user_uuid)
+    applicant = loader.applicant_by_uuid(user_uuid)
     
     if not applicant:
         # Fallback to email if UUID not found (for migration purposes)
@@ -81,6 +99,7 @@ async def get_current_applicant(
         # Update applicant with UUID for future lookups
         applicant.uuid = user_uuid
         db.commit()
+        loader.prime("applicant_uuid", str(user_uuid), applicant)
     
     return applicant
 
@@ -156,27 +175,6 @@ async def validate_file_upload(file: UploadFile = File(...)) -> UploadFile:
     # Your existing validation logic
     return file
 
-def get_application_owner(
-    application_id: str,
-    db: Session = Depends(get_db),
-    current_applicant: Applicant = Depends(get_current_applicant)
-):
-    """Verify that the current user owns the specified application."""
-    application = crud_application.get_by_id(db, application_id=application_id)
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
-        )
-    
-    if application.applicant_id != current_applicant.applicant_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this application"
-        )
-    
-    return application
-
 # Add other existing dependencies (get_application_for_admin, get_document_owner, etc.)
 
 
@@ -214,14 +212,14 @@ async def validate_document_upload(
 
 def get_application_owner(
     application_id: str,
-    db: Session = Depends(get_db),
+    loader: RequestLoader = Depends(get_loader),
     current_applicant: Applicant = Depends(get_current_applicant)
 ):
     """
     Verify that the current user owns the specified application.
     """
     
-    application = crud_application.get_by_id(db, application_id=application_id)
+    application = loader.application(application_id)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -238,14 +236,14 @@ def get_application_owner(
 
 async def get_application_for_admin(
     application_id: str,
-    db: Session = Depends(get_db),
+    loader: RequestLoader = Depends(get_loader),
     admin_user: dict = Depends(get_admin_user)
 ):
     """
     Get application for admin access (no ownership verification).
     """
     
-    application = crud_application.get_by_id(db, application_id=application_id)
+    application = loader.application(application_id)
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -256,23 +254,22 @@ async def get_application_for_admin(
 
 def get_document_owner(
     document_id: str,
-    db: Session = Depends(get_db),
+    loader: RequestLoader = Depends(get_loader),
     current_applicant: Applicant = Depends(get_current_applicant)
 ):
     """
     Verify that the current user owns the specified document.
     """
     
-    document = crud_document.get_by_id(db, document_id=document_id)
+    document = loader.document(document_id)
     if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found"
         )
     
-    # Check if the document belongs to user's application
-    application = crud_application.get_by_id(db, application_id=document.application_id)
-    if not application or application.applicant_id != current_applicant.applicant_id:
+    # Check if the document belongs to user's application (owner was loaded with the document)
+    if loader.application_owner(document.application_id) != current_applicant.applicant_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this document"
@@ -282,23 +279,22 @@ def get_document_owner(
 
 def get_appointment_owner(
     appointment_id: str,
-    db: Session = Depends(get_db),
+    loader: RequestLoader = Depends(get_loader),
     current_applicant: Applicant = Depends(get_current_applicant)
 ):
     """
     Verify that the current user owns the specified appointment.
     """
     
-    appointment = crud_appointment.get_by_id(db, appointment_id=appointment_id)
+    appointment = loader.appointment(appointment_id)
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Appointment not found"
         )
     
-    # Check if the appointment belongs to user's application
-    application = crud_application.get_by_id(db, application_id=appointment.application_id)
-    if not application or application.applicant_id != current_applicant.applicant_id:
+    # Check if the appointment belongs to user's application (owner was loaded with the appointment)
+    if loader.application_owner(appointment.application_id) != current_applicant.applicant_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this appointment"
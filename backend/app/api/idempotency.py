@@ -0,0 +1,176 @@
+# app/api/idempotency.py
+"""
+Idempotency-Key support for write endpoints that mobile clients retry.
+
+An endpoint opts in by depending on `claim_idempotency_key` and living on a
+router with `route_class=IdempotentRoute`. A client sends the same
+`Idempotency-Key` header with every attempt of one logical request:
+
+- The first attempt claims the key (one upsert into idempotencykey) and
+  runs. The response it returns is stored with the key for
+  IDEMPOTENCY_TTL_HOURS. If it raises an error or returns a 5xx, the key is
+  dropped so a retry runs again.
+- A retry of a completed request gets the stored response, with an
+  `Idempotent-Replayed: true` header, without running the endpoint.
+- A retry that arrives while the first attempt still runs waits for it, up
+  to IDEMPOTENCY_WAIT_SECONDS, then gets 409 with Retry-After. It checks
+  the key again after IDEMPOTENCY_POLL_SECONDS, doubling the pause up to
+  IDEMPOTENCY_POLL_MAX_SECONDS, so a retry storm costs few queries; each
+  check runs in the threadpool.
+- Reusing a key for a different request (other endpoint, query or body)
+  gets 422.
+
+Keys are scoped to the authenticated user. A first attempt that dies
+without finishing holds its key for IDEMPOTENCY_LOCK_SECONDS at most.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Callable, Coroutine, Optional
+
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+
+from app.api.deps import get_db, get_current_user_token
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import IDEMPOTENT_REQUESTS
+from app.crud import crud_idempotency
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+class IdempotentReplay(Exception):
+    """Raised by the dependency to answer with a stored response"""
+
+    def __init__(self, response: Response):
+        self.response = response
+
+async def request_fingerprint(request: Request) -> str:
+    """
+    Hash of the method, path, query and body. Multipart bodies are hashed by
+    field (file contents included) because clients pick a new boundary on
+    every attempt.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.url.path}\0".encode())
+    for name, value in sorted(request.query_params.multi_items()):
+        digest.update(f"{name}={value}\0".encode())
+
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        for name, value in sorted(form.multi_items(), key=lambda item: item[0]):
+            digest.update(f"{name}\0".encode())
+            if isinstance(value, UploadFile):
+                digest.update(f"{value.filename}\0".encode())
+                await value.seek(0)
+                while chunk := await value.read(1 << 16):
+                    digest.update(chunk)
+                await value.seek(0)
+            else:
+                digest.update(f"{value}\0".encode())
+    else:
+        digest.update(await request.body())
+    return digest.hexdigest()
+
+async def claim_idempotency_key(
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None, max_length=255, description="Client-chosen key, the same for every retry of one request"
+    ),
+    db: Session = Depends(get_db),
+    user_data: dict = Depends(get_current_user_token)
+) -> Optional[str]:
+    """Claim the request's Idempotency-Key, or answer it from an earlier attempt"""
+    if not idempotency_key:
+        return None
+
+    owner = user_data.get("id")
+    fingerprint = await request_fingerprint(request)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    delay = settings.IDEMPOTENCY_POLL_SECONDS
+    while True:
+        claimed, existing = await run_in_threadpool(
+            crud_idempotency.claim,
+            db,
+            owner=owner,
+            key=idempotency_key,
+            endpoint=f"{request.method} {request.url.path}",
+            fingerprint=fingerprint,
+            lock_seconds=settings.IDEMPOTENCY_LOCK_SECONDS,
+            ttl_hours=settings.IDEMPOTENCY_TTL_HOURS
+        )
+        if claimed:
+            request.state.idempotency = (owner, idempotency_key, fingerprint)
+            IDEMPOTENT_REQUESTS.labels("executed").inc()
+            return idempotency_key
+        if existing is None:
+            # The other attempt failed and let go of the key
+            continue
+
+        if existing.fingerprint != fingerprint:
+            IDEMPOTENT_REQUESTS.labels("mismatch").inc()
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="This Idempotency-Key was already used for a different request"
+            )
+        if existing.status == "Completed":
+            IDEMPOTENT_REQUESTS.labels("replayed").inc()
+            raise IdempotentReplay(Response(
+                content=existing.response_body,
+                status_code=existing.response_status,
+                media_type=existing.response_content_type,
+                headers={REPLAYED_HEADER: "true"}
+            ))
+        if time.monotonic() >= deadline:
+            IDEMPOTENT_REQUESTS.labels("in_progress").inc()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": str(max(1, round(settings.IDEMPOTENCY_WAIT_SECONDS)))}
+            )
+        await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        delay = min(delay * 2, settings.IDEMPOTENCY_POLL_MAX_SECONDS)
+
+def _finish(claim: tuple, response: Optional[Response]) -> None:
+    """Store the response for retries, or drop the key when there is none worth replaying"""
+    owner, key, fingerprint = claim
+    with SessionLocal() as db:
+        if response is not None and response.status_code < 500 and hasattr(response, "body"):
+            crud_idempotency.complete(
+                db,
+                owner=owner,
+                key=key,
+                fingerprint=fingerprint,
+                status_code=response.status_code,
+                content_type=response.headers.get("content-type"),
+                body=bytes(response.body)
+            )
+        else:
+            crud_idempotency.release(db, owner=owner, key=key, fingerprint=fingerprint)
+
+class IdempotentRoute(APIRoute):
+    """Route that answers replays and records the outcome of requests holding a key"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def idempotent_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except IdempotentReplay as replay:
+                return replay.response
+            except Exception:
+                claim = getattr(request.state, "idempotency", None)
+                if claim:
+                    await run_in_threadpool(_finish, claim, None)
+                raise
+
+            claim = getattr(request.state, "idempotency", None)
+            if claim:
+                await run_in_threadpool(_finish, claim, response)
+            return response
+
+        return idempotent_handler
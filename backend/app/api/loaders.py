@@ -0,0 +1,106 @@
+# app/api/loaders.py
+"""
+Request-scoped entity loader.
+
+One `RequestLoader` is created per request (FastAPI caches the `get_loader`
+dependency for the duration of a request) and memoizes lookups by key, in
+the style of DataLoader. Dependencies and endpoints that need the same row
+share one query, and ownership checks read only `applicant_id` instead of
+loading whole applications.
+
+Loading a document or appointment primes the owner of its application, and
+loading an application primes its owner, so a later ownership check for the
+same application costs nothing.
+"""
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import record_cache_lookup
+from app.crud import crud_applicant, crud_application, crud_appointment, crud_document
+from app.models.applicant import Applicant
+from app.models.application import LicenseApplication
+from app.models.appointment import Appointment
+from app.models.document import SubmittedDocument
+
+_MISSING = object()
+
+class RequestLoader:
+    def __init__(self, db: Session):
+        self.db = db
+        self._cache: Dict[Tuple[str, Any], Any] = {}
+
+    def _load(self, kind: str, key: Any, fetch: Callable[[], Any]) -> Any:
+        cache_key = (kind, key)
+        value = self._cache.get(cache_key, _MISSING)
+        record_cache_lookup("request_loader", value is not _MISSING)
+        if value is _MISSING:
+            value = fetch()
+            self._cache[cache_key] = value
+        return value
+
+    def prime(self, kind: str, key: Any, value: Any) -> None:
+        self._cache[(kind, key)] = value
+
+    def application(self, application_id: str) -> Optional[LicenseApplication]:
+        """Application with applicant, type, status and vehicle categories loaded"""
+        application = self._load(
+            "application",
+            application_id,
+            lambda: crud_application.get_by_id(self.db, application_id=application_id)
+        )
+        if application is not None:
+            self.prime("application_owner", application_id, application.applicant_id)
+        return application
+
+    def application_owners(self, application_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """applicant_id per application, fetching every uncached id in one query"""
+        application_ids = list(dict.fromkeys(application_ids))
+        missing = [
+            application_id for application_id in application_ids
+            if ("application_owner", application_id) not in self._cache
+        ]
+        for application_id in application_ids:
+            record_cache_lookup("request_loader", application_id not in missing)
+        if missing:
+            owners = crud_application.get_owner_ids(self.db, application_ids=missing)
+            for application_id in missing:
+                self._cache[("application_owner", application_id)] = owners.get(application_id)
+        return {
+            application_id: self._cache[("application_owner", application_id)]
+            for application_id in application_ids
+        }
+
+    def application_owner(self, application_id: str) -> Optional[str]:
+        return self.application_owners([application_id])[application_id]
+
+    def document(self, document_id: str) -> Optional[SubmittedDocument]:
+        result = self._load(
+            "document",
+            document_id,
+            lambda: crud_document.get_with_owner(self.db, document_id=document_id)
+        )
+        if result is None:
+            return None
+        document, owner_id = result
+        self.prime("application_owner", document.application_id, owner_id)
+        return document
+
+    def appointment(self, appointment_id: str) -> Optional[Appointment]:
+        result = self._load(
+            "appointment",
+            appointment_id,
+            lambda: crud_appointment.get_with_owner(self.db, appointment_id=appointment_id)
+        )
+        if result is None:
+            return None
+        appointment, owner_id = result
+        self.prime("application_owner", appointment.application_id, owner_id)
+        return appointment
+
+    def applicant_by_uuid(self, user_uuid: str) -> Optional[Applicant]:
+        return self._load(
+            "applicant_uuid",
+            str(user_uuid),
+            lambda: crud_applicant.get_by_uuid(self.db, user_uuid=user_uuid)
+        )
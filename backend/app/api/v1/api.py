@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, auth_supabase, applicants, applications, appointments, documents, admin, public
+from app.api.v1.endpoints import auth, auth_supabase, applicants, applications, appointments, documents, admin, public, bootstrap
 
 api_router = APIRouter()
 
 api_router.include_router(public.router, prefix="/public", tags=["public"])
+api_router.include_router(bootstrap.router, prefix="/bootstrap", tags=["bootstrap"])
 # api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(auth_supabase.router, prefix="/auth-supabase", tags=["supabase-authentication"])
 api_router.include_router(applicants.router, prefix="/applicants", tags=["applicants"])
@@ -1,7 +1,9 @@
 # app/api/v1/endpoints/admin.py
+from datetime import datetime, timezone
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import (
     get_db, 
@@ -10,20 +12,73 @@ from app.api.deps import (
     validate_pagination,
     validate_date_range
 )
-from app.crud import crud_admin, crud_analytics, crud_document, crud_application
+from app.crud.admin import EXPORT_COLUMNS
+from app.crud.review_queue import REVIEW_QUEUES, REVIEW_STATUS_IDS
+from app.crud import (
+    crud_admin,
+    crud_analytics,
+    crud_application_detail,
+    crud_archive,
+    crud_document,
+    crud_application,
+    crud_review_queue
+)
 from app.models.applicant import Applicant
 from app.models.application import LicenseApplication
 from app.schemas.admin import (
     DashboardStats,
     AdminApplicationResponse,
     ApplicationRejection,
-    DocumentVerification
+    DocumentVerification,
+    InstrumentationUpdate,
+    ReviewLeaseIds,
+    ReviewLeaseResponse,
+    ArchivedApplicationResponse,
+    ArchivedApplicationDetail
 )
 from app.schemas.document import DocumentResponse
 from app.schemas.response import ResponseModel, PaginatedResponse
+from app.utils import bulk_import
+from app.utils.email import send_status_notifications
+from app.utils.events import event_broker
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.instrumentation import request_instrumentation
+from app.core.responses import EXPORT_MEDIA_TYPES, event_stream_response, paginated_response, rows_response
 
 router = APIRouter()
 
+async def notify_status_change(db: Session, application_ids: List[str], new_status: str):
+    """Queue status-change emails for the applicants of the given applications"""
+    if not application_ids:
+        return
+    recipients = crud_admin.get_notification_recipients(db, application_ids=application_ids)
+    # Rendering and queuing run in a worker thread so large batches don't block the event loop
+    await run_in_threadpool(send_status_notifications, recipients, new_status)
+
+def validate_application_filters(sort_by: str, type_filter: Optional[str], status_filter: Optional[str]):
+    """Reject unknown sort and filter values of the filtered listing and export"""
+    # Validate sort_by parameter
+    if sort_by not in ["date_asc", "date_desc"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sort_by parameter. Must be 'date_asc' or 'date_desc'"
+        )
+
+    # Validate type_filter parameter
+    if type_filter and type_filter.lower() not in ["new", "renewal", "duplicate"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid type_filter. Must be 'New', 'Renewal', or 'Duplicate'"
+        )
+
+    # Validate status_filter parameter
+    if status_filter and status_filter.lower() not in ["verifying", "resubmission", "rejected", "approved"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid status_filter. Must be 'Verifying', 'Resubmission', 'Rejected', or 'Approved'"
+        )
+
 @router.get("/dashboard", response_model=ResponseModel[DashboardStats])
 async def get_dashboard_stats(
     db: Session = Depends(get_db),
@@ -68,11 +123,12 @@ async def get_all_applications(
         limit=1000
     )
     total = len(total_applications)
+    crud_document.attach_document_completeness(db, applications=applications)
     
-    return PaginatedResponse(
-        success=True,
+    return paginated_response(
+        AdminApplicationResponse,
         message="Applications retrieved successfully",
-        data=applications,
+        items=applications,
         total=total,
         page=skip // limit + 1,
         size=limit,
@@ -110,26 +166,7 @@ async def get_filtered_applications(
     
     skip, limit = pagination
     
-    # Validate sort_by parameter
-    if sort_by not in ["date_asc", "date_desc"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid sort_by parameter. Must be 'date_asc' or 'date_desc'"
-        )
-    
-    # Validate type_filter parameter
-    if type_filter and type_filter.lower() not in ["new", "renewal", "duplicate"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid type_filter. Must be 'New', 'Renewal', or 'Duplicate'"
-        )
-    
-    # Validate status_filter parameter
-    if status_filter and status_filter.lower() not in ["verifying", "resubmission", "rejected", "approved"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid status_filter. Must be 'Verifying', 'Resubmission', 'Rejected', or 'Approved'"
-        )
+    validate_application_filters(sort_by, type_filter, status_filter)
     
     result = crud_admin.get_filtered_applications(
         db,
@@ -140,17 +177,95 @@ async def get_filtered_applications(
         skip=skip,
         limit=limit
     )
+    crud_document.attach_document_completeness(db, applications=result["applications"])
     
-    return PaginatedResponse(
-        success=True,
+    return paginated_response(
+        AdminApplicationResponse,
         message="Filtered applications retrieved successfully",
-        data=result["applications"],
+        items=result["applications"],
         total=result["total"],
         page=result["page"],
         size=result["size"],
         pages=result["pages"]
     )
 
+@router.get("/applications/export")
+async def export_filtered_applications(
+    admin: dict = Depends(get_admin_user),
+    export_format: str = Query("csv", alias="format", description="File format: csv or jsonl"),
+    compress: bool = Query(False, alias="gzip", description="Gzip the file while it streams"),
+    type_filter: Optional[str] = Query(None, description="Filter by application type: New, Renewal, Duplicate"),
+    status_filter: Optional[str] = Query(None, description="Filter by status: Verifying, Resubmission, Rejected, Approved"),
+    sort_by: str = Query("date_desc", description="Sort by: date_asc (ascending) or date_desc (descending)"),
+    search_query: Optional[str] = Query(None, description="Search by name, ID, or contact")
+):
+    """
+    Download every application matching the filters of /applications/filtered
+    as CSV or JSON Lines, one row per application with the applicant, type and
+    status columns flattened in.
+
+    Rows are streamed from a server-side cursor in batches and written out as
+    they arrive, so exports of any size run in constant memory.
+    """
+    
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid format. Must be 'csv' or 'jsonl'"
+        )
+    validate_application_filters(sort_by, type_filter, status_filter)
+    
+    def batches():
+        # The request's session is closed before the body finishes streaming
+        db = SessionLocal()
+        try:
+            yield from crud_admin.iter_filtered_application_rows(
+                db,
+                type_filter=type_filter,
+                status_filter=status_filter,
+                sort_by=sort_by,
+                search_query=search_query,
+                batch_size=settings.EXPORT_BATCH_SIZE
+            )
+        finally:
+            db.close()
+    
+    return rows_response(
+        [column.key for column in EXPORT_COLUMNS],
+        batches(),
+        export_format=export_format,
+        filename=f"applications-{datetime.now(timezone.utc):%Y%m%d}",
+        compress=compress
+    )
+
+@router.post("/applications/import", response_model=ResponseModel[dict])
+async def import_applications(
+    admin: dict = Depends(get_admin_user),
+    file: UploadFile = File(..., description="JSON Lines, one application record per line")
+):
+    """
+    Bulk import application records (legacy records, walk-in paper forms).
+
+    Each line is a submit-complete payload plus the applicant's `email`. Valid
+    records are imported in chunks with COPY; invalid ones are skipped and
+    listed under `errors` (line number and validation errors, up to
+    BULK_IMPORT_MAX_REPORTED_ERRORS). See app/utils/bulk_import.py.
+    """
+    
+    rejected = []
+    
+    def collect(entry: dict):
+        if len(rejected) < settings.BULK_IMPORT_MAX_REPORTED_ERRORS:
+            rejected.append({"line": entry["line"], "errors": entry["errors"]})
+    
+    summary = await run_in_threadpool(bulk_import.import_applications, file.file, on_rejected=collect)
+    
+    return ResponseModel(
+        success=True,
+        message=f"{summary['imported']} application(s) imported, {summary['rejected']} rejected",
+        data={**summary, "errors": rejected}
+    )
+
 @router.get("/applications/filter-options", response_model=ResponseModel[dict])
 async def get_application_filter_options(
     admin: dict = Depends(get_admin_user)
@@ -193,19 +308,44 @@ async def get_application_for_review(
         data=application
     )
 
+@router.get("/applications/{application_id}/detail", response_model=ResponseModel[dict])
+async def get_application_detail(
+    application_id: str,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """
+    Everything needed to review an application in one response: the
+    application with its type and status, the applicant with family,
+    employment, emergency contacts and donations, and the documents, vehicle
+    categories, conditions, driving skills, appointments and status history.
+    Served from a per-worker cache while the application is unchanged.
+    """
+    
+    detail = crud_application_detail.get(db, application_id=application_id)
+    if detail is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    return ResponseModel(
+        success=True,
+        message="Application details retrieved successfully",
+        data=detail
+    )
+
 @router.post("/applications/{application_id}/approve", response_model=ResponseModel[AdminApplicationResponse])
 async def approve_application(
     application_id: str,
+    application: LicenseApplication = Depends(get_application_for_admin),
     db: Session = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
     """Approve an application - simplified process requiring only application_id"""
     
-    # Get application to check if it exists and is in valid status
-    application = await get_application_for_admin(application_id, db, admin)
-    
     # Check if application is in approvable status
-    if application.application_status_id not in ["ASID_PEN", "ASID_REV", "ASID_SFA"]:
+    if application.application_status_id not in REVIEW_STATUS_IDS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Application cannot be approved. Current status: {application.application_status_id}"
@@ -224,6 +364,8 @@ async def approve_application(
             detail="Application not found"
         )
     
+    await notify_status_change(db, [application_id], "approved")
+    
     return ResponseModel(
         success=True,
         message="Application approved successfully",
@@ -257,6 +399,8 @@ async def bulk_approve_applications(
         approved_by=admin["uuid"]
     )
     
+    await notify_status_change(db, result["successful_applications"], "approved")
+    
     return ResponseModel(
         success=True,
         message=f"Bulk approval completed. {result['successful_count']} successful, {result['failed_count']} failed.",
@@ -288,6 +432,8 @@ async def reject_application(
         additional_requirements=rejection_data.additional_requirements
     )
     
+    await notify_status_change(db, [application.application_id], "rejected")
+    
     return ResponseModel(
         success=True,
         message="Application rejected successfully",
@@ -324,6 +470,8 @@ async def bulk_reject_applications(
         additional_requirements=request_data.additional_requirements
     )
     
+    await notify_status_change(db, result["successful_applications"], "rejected")
+    
     return ResponseModel(
         success=True,
         message=f"Bulk rejection completed. {result['successful_count']} successful, {result['failed_count']} failed.",
@@ -389,12 +537,34 @@ async def bulk_application_actions(
         )
         message = f"Bulk rejection completed. {result['successful_count']} successful, {result['failed_count']} failed."
     
+    await notify_status_change(db, result["successful_applications"], "approved" if action == "approve" else "rejected")
+    
     return ResponseModel(
         success=True,
         message=message,
         data=result
     )
 
+@router.get("/events")
+async def stream_admin_events(
+    admin: dict = Depends(get_admin_user)
+):
+    """
+    Server-sent events for every application (see app/utils/events.py).
+    Each event carries `dashboard` deltas for the /dashboard counters and
+    `queue` deltas for the /applications/filtered status filters and pending
+    document verifications. A `resync` event means events were missed;
+    re-fetch the dashboard and listings.
+    """
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live events are disabled"
+        )
+    
+    subscription = event_broker.subscribe(is_admin=True)
+    return event_stream_response(subscription.events(), lambda: event_broker.unsubscribe(subscription))
+
 @router.get("/documents/pending-verification", response_model=PaginatedResponse[DocumentResponse])
 async def get_pending_verifications(
     db: Session = Depends(get_db),
@@ -411,10 +581,10 @@ async def get_pending_verifications(
     total_pending = crud_admin.get_pending_verifications(db, skip=0, limit=1000)
     total = len(total_pending)
     
-    return PaginatedResponse(
-        success=True,
+    return paginated_response(
+        DocumentResponse,
         message="Pending verifications retrieved successfully",
-        data=documents,
+        items=documents,
         total=total,
         page=skip // limit + 1,
         size=limit,
@@ -475,6 +645,106 @@ async def bulk_verify_documents(
         data={"verified_count": count}
     )
 
+@router.get("/review-queue", response_model=ResponseModel[dict])
+async def get_review_queue(
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """Waiting and leased items per review queue, and the reviewer's own leases"""
+    
+    queues = crud_review_queue.get_queue_depths(db)
+    leases = crud_review_queue.get_reviewer_leases(db, reviewer=admin["uuid"])
+    
+    return ResponseModel(
+        success=True,
+        message="Review queue retrieved successfully",
+        data={
+            "queues": queues,
+            "leases": [
+                {
+                    "lease_id": lease.lease_id,
+                    "queue": lease.queue,
+                    "item_id": lease.item_id,
+                    "expires_at": lease.expires_at
+                }
+                for lease in leases
+            ],
+            "lease_seconds": settings.REVIEW_LEASE_SECONDS
+        }
+    )
+
+@router.post("/review-queue/{queue}/claim", response_model=ResponseModel[List[ReviewLeaseResponse]])
+async def claim_review_items(
+    queue: str,
+    limit: int = Query(5, ge=1, le=settings.REVIEW_CLAIM_MAX),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """
+    Claim the next `limit` items of a review queue ('applications' or
+    'documents'). Items are leased to the calling admin for
+    REVIEW_LEASE_SECONDS and not handed to other reviewers meanwhile; send
+    heartbeats to keep them. Approving, rejecting or verifying an item
+    completes its lease; release items you will not review.
+    """
+    
+    if queue not in REVIEW_QUEUES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid queue. Must be 'applications' or 'documents'"
+        )
+    
+    leases = crud_review_queue.claim(
+        db,
+        queue=queue,
+        reviewer=admin["uuid"],
+        limit=limit,
+        lease_seconds=settings.REVIEW_LEASE_SECONDS
+    )
+    
+    return ResponseModel(
+        success=True,
+        message=f"{len(leases)} items claimed" if leases else "No items waiting for review",
+        data=leases
+    )
+
+@router.post("/review-queue/heartbeat", response_model=ResponseModel[dict])
+async def heartbeat_review_leases(
+    request: ReviewLeaseIds,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """Extend the caller's leases; `lost` leases were completed or claimed by another reviewer"""
+    
+    result = crud_review_queue.heartbeat(
+        db,
+        reviewer=admin["uuid"],
+        lease_ids=request.lease_ids,
+        lease_seconds=settings.REVIEW_LEASE_SECONDS
+    )
+    
+    return ResponseModel(
+        success=True,
+        message=f"{len(result['renewed'])} leases renewed, {len(result['lost'])} lost",
+        data=result
+    )
+
+@router.post("/review-queue/release", response_model=ResponseModel[dict])
+async def release_review_leases(
+    request: ReviewLeaseIds,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """Hand the caller's leased items back to the queue without reviewing them"""
+    
+    released = crud_review_queue.release(db, reviewer=admin["uuid"], lease_ids=request.lease_ids)
+    
+    return ResponseModel(
+        success=True,
+        message=f"{len(released)} leases released",
+        data={"released": released, "released_count": len(released)}
+    )
+
 @router.get("/analytics/trends", response_model=ResponseModel[List[dict]])
 async def get_application_trends(
     days: int = Query(30, description="Number of days for trend analysis"),
@@ -537,6 +807,45 @@ async def get_system_health(
         data=health_metrics
     )
 
+@router.get("/system/instrumentation", response_model=ResponseModel[dict])
+async def get_instrumentation(
+    admin: dict = Depends(get_admin_user)
+):
+    """Get the request instrumentation settings of this worker"""
+    
+    return ResponseModel(
+        success=True,
+        message="Instrumentation settings retrieved successfully",
+        data=request_instrumentation.get_state()
+    )
+
+@router.put("/system/instrumentation", response_model=ResponseModel[dict])
+async def update_instrumentation(
+    update: InstrumentationUpdate,
+    admin: dict = Depends(get_admin_user)
+):
+    """Switch request instrumentation (Server-Timing, slow query EXPLAIN, N+1 detection) on or off for this worker"""
+    
+    if update.slow_query_ms is not None and update.slow_query_ms < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="slow_query_ms must not be negative"
+        )
+    
+    state = request_instrumentation.update(
+        enabled=update.enabled,
+        slow_query_ms=update.slow_query_ms,
+        explain_slow_queries=update.explain_slow_queries,
+        detect_n_plus_one=update.detect_n_plus_one,
+        n_plus_one_threshold=update.n_plus_one_threshold
+    )
+    
+    return ResponseModel(
+        success=True,
+        message="Instrumentation settings updated successfully",
+        data=state
+    )
+
 @router.post("/generate-license-number", response_model=ResponseModel[dict])
 async def generate_license_number(
     db: Session = Depends(get_db),
@@ -550,4 +859,55 @@ async def generate_license_number(
         success=True,
         message="License number generated successfully",
         data={"license_number": license_number}
-    )
\ No newline at end of file
+    )
+
+@router.get("/archive/applications", response_model=PaginatedResponse[ArchivedApplicationResponse])
+async def get_archived_applications(
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user),
+    pagination: tuple = Depends(validate_pagination),
+    applicant_id: Optional[str] = Query(None, description="Filter by applicant ID"),
+    status_filter: Optional[str] = Query(None, description="Filter by final status (ASID_APR, ASID_REJ)")
+):
+    """List archived applications (read-only)"""
+    
+    skip, limit = pagination
+    
+    archived, total = crud_archive.get_multi_filtered(
+        db,
+        applicant_id=applicant_id,
+        status_filter=status_filter,
+        skip=skip,
+        limit=limit
+    )
+    
+    return paginated_response(
+        ArchivedApplicationResponse,
+        message="Archived applications retrieved successfully",
+        items=archived,
+        total=total,
+        page=skip // limit + 1,
+        size=limit,
+        pages=(total + limit - 1) // limit
+    )
+
+@router.get("/archive/applications/{application_id}", response_model=ResponseModel[ArchivedApplicationDetail])
+async def get_archived_application(
+    application_id: str,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """Get an archived application with all of its archived records (read-only)"""
+    
+    archived = crud_archive.get_by_application_id(db, application_id=application_id)
+    if not archived:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived application not found"
+        )
+    
+    return ResponseModel(
+        success=True,
+        message="Archived application retrieved successfully",
+        data=archived
+    )
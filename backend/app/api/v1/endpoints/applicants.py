@@ -6,12 +6,15 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_applicant, get_current_user_token, validate_pagination
 from app.crud import crud_applicant, crud_family, crud_employment, crud_emergency, crud_donation
 from app.models.applicant import Applicant
-from app.schemas.applicant import ApplicantUpdate, ApplicantProfile
+from app.schemas.applicant import ApplicantUpdate, ApplicantProfile, applicant_profile, user_status
 from app.schemas.family import FamilyInformationCreate, FamilyInformationResponse
 from app.schemas.employment import EmploymentCreate, EmploymentResponse
 from app.schemas.emergency import EmergencyContactCreate, EmergencyContactResponse
 from app.schemas.donation import DonationCreate, DonationResponse
 from app.schemas.response import ResponseModel, PaginatedResponse
+from app.core.config import settings
+from app.core.responses import event_stream_response
+from app.utils.events import event_broker
 
 router = APIRouter()
 
@@ -37,19 +40,10 @@ async def get_my_status(
     if not applicant:
         applicant = crud_applicant.get_by_email(db, email=user_email)
     
-    is_applicant = applicant is not None
-    
     return ResponseModel(
         success=True,
         message="User status retrieved successfully",
-        data={
-            "user_id": user_uuid,
-            "email": user_email,
-            "is_applicant": is_applicant,
-            "applicant_id": applicant.applicant_id if is_applicant else None,
-            "message": "You can submit applications and manage your profile" if is_applicant 
-                      else "Submit your first application to become an applicant"
-        }
+        data=user_status(user_data, applicant)
     )
 
 @router.get("/me", response_model=ResponseModel[ApplicantProfile])
@@ -58,26 +52,33 @@ async def get_my_profile(
 ):
     """Get current user's profile"""
     
-    # Calculate age if birthdate exists
-    age = None
-    if current_applicant.birthdate:
-        from datetime import date
-        today = date.today()
-        age = today.year - current_applicant.birthdate.year - (
-            (today.month, today.day) < (current_applicant.birthdate.month, current_applicant.birthdate.day)
-        )
-    
-    # Create profile response with computed fields
-    profile_data = ApplicantProfile.from_orm(current_applicant)
-    profile_data.age = age
-    profile_data.full_name = f"{current_applicant.first_name} {current_applicant.family_name}"
-    
     return ResponseModel(
         success=True,
         message="Profile retrieved successfully",
-        data=profile_data
+        data=applicant_profile(current_applicant)
     )
 
+@router.get("/events")
+async def stream_my_events(
+    db: Session = Depends(get_db),
+    current_applicant: Applicant = Depends(get_current_applicant)
+):
+    """
+    Server-sent events for the current applicant's applications: submissions,
+    status changes and document verifications (see app/utils/events.py).
+    A `resync` event means events were missed; re-fetch /applications/.
+    """
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Live events are disabled"
+        )
+    
+    subscription = event_broker.subscribe(applicant_id=current_applicant.applicant_id)
+    # Give the connection back to the pool; the stream may stay open for hours
+    db.close()
+    return event_stream_response(subscription.events(), lambda: event_broker.unsubscribe(subscription))
+
 @router.put("/me", response_model=ResponseModel[ApplicantProfile])
 async def update_my_profile(
     applicant_update: ApplicantUpdate,
@@ -1,9 +1,9 @@
 # app/api/v1/endpoints/applications.py
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 import logging
-import json
 from pydantic import ValidationError
 
 # Configure logging
@@ -17,42 +17,60 @@ from app.api.deps import (
     validate_pagination,
 
 )
+from app.api.idempotency import IdempotentRoute, claim_idempotency_key
 from app.crud import crud_application, crud_vehicle_category, crud_applicant, crud_family, crud_employment, crud_emergency, crud_document
+from app.crud.application import is_active_application_conflict
 from app.models.applicant import Applicant
 from app.models.application import LicenseApplication
 from app.schemas.application import (
     LicenseApplicationCreate, 
     LicenseApplicationResponse,
     ApplicationStatusHistoryResponse,
-    CompleteApplicationCreate,
-    CompleteApplicationResponse
+    CompleteApplicationResponse,
+    parse_complete_application
 )
 from app.schemas.applicant import ApplicantCreate
 from app.schemas.response import ResponseModel, PaginatedResponse
+from app.utils import events
+from app.utils.id_allocation import id_allocator
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
-@router.post("/submit-complete", response_model=ResponseModel[CompleteApplicationResponse])
+ACTIVE_APPLICATION_DETAIL = (
+    "You already have an active application of type {application_type_id}. "
+    "Please wait for it to be processed or complete it first."
+)
+
+@router.post(
+    "/submit-complete",
+    response_model=ResponseModel[CompleteApplicationResponse],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"title": "CompleteApplicationCreate", "type": "object"}}}
+        }
+    }
+)
 async def submit_complete_application(
-    raw_data: dict = Body(...),
+    request: Request,
     db: Session = Depends(get_db),
-    user_data: dict = Depends(get_current_user_token)
+    user_data: dict = Depends(get_current_user_token),
+    idempotency_key: Optional[str] = Depends(claim_idempotency_key)
 ):
     """
     Submit a complete license application with all information at once.
     This creates or updates applicant profile, creates application, and processes all related data.
+    Retries with the same Idempotency-Key header get the first attempt's response.
     """
     
-    logger.info("=== SUBMIT COMPLETE APPLICATION START ===")
-    logger.info(f"User data: {user_data}")
-    logger.info(f"Raw data received: {json.dumps(raw_data, indent=2, default=str)}")
+    logger.info("Submit complete application started", extra={"user_id": user_data.get("id")})
     
-    # Parse and validate the application data manually to catch validation errors
+    # Parse and validate the raw body in one pass (no intermediate dict) to catch validation errors
     application_data = None
     try:
         logger.info("Attempting to parse application data...")
-        application_data = CompleteApplicationCreate(**raw_data)
-        logger.info(f"Application data parsed successfully: {application_data.dict()}")
+        application_data = parse_complete_application(await request.body())
+        logger.info(f"Application data parsed for type: {application_data.application_type_id}")
     except ValidationError as ve:
         logger.error(f"Pydantic validation error: {ve}")
         logger.error(f"Validation errors: {ve.errors()}")
@@ -70,8 +88,6 @@ async def submit_complete_application(
     user_email = user_data.get("email")
     user_uuid = user_data.get("id")
     
-    logger.info(f"User email: {user_email}, User UUID: {user_uuid}")
-    
     if not user_email or not user_uuid:
         logger.error("Missing user email or UUID")
         raise HTTPException(
@@ -94,62 +110,58 @@ async def submit_complete_application(
         
         # 2. Check for duplicate application type FIRST (before any writes)
         logger.info("Step 2: Checking for duplicate applications")
+        application_type_id = application_data.application_type_id
         if current_applicant:
-            existing_applications = crud_application.get_by_applicant(
-                db, applicant_id=current_applicant.applicant_id, skip=0, limit=100
+            existing = crud_application.get_submission_state(
+                db, applicant_id=current_applicant.applicant_id, application_type_id=application_type_id
             )
         else:
-            existing_applications = []  # New applicant, no existing applications
+            existing = None  # New applicant, no existing applications
         
         # Smart duplicate check based on business rules
-        for existing_app in existing_applications:
-            if existing_app.application_type_id == application_data.application_type_id:
-                # Business Rule 1: If applicant was rejected, they can reapply
-                if existing_app.application_status_id == "ASID_REJ":
-                    logger.info(f"Previous application was rejected. Allowing reapplication for type: {application_data.application_type_id}")
-                    continue  # Allow reapplication
-                
-                # Business Rule 2: If applicant has pending/in-progress application, block new submission
-                if existing_app.application_status_id in ["ASID_PEN", "ASID_SFA", "ASID_RSB"]:
-                    logger.warning(f"Active application exists for type: {application_data.application_type_id}")
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"You already have an active application of type {application_data.application_type_id}. Please wait for it to be processed or complete it first."
-                    )
-                
-                # Business Rule 3: If applicant has approved application, check specific rules
-                if existing_app.application_status_id == "ASID_APR":
-                    # For renewals (ATID_B) - allowed if existing license is about to expire
-                    if application_data.application_type_id == "ATID_B":
-                        # Check if license is about to expire (within 60 days or already expired)
-                        if application_data.license_details and application_data.license_details.license_expiry_date:
-                            from datetime import datetime, timedelta
-                            expiry_date = application_data.license_details.license_expiry_date
-                            sixty_days_from_now = datetime.now().date() + timedelta(days=60)
-                            
-                            if expiry_date <= sixty_days_from_now:
-                                logger.info(f"License expires soon ({expiry_date}). Allowing renewal application.")
-                                continue  # Allow renewal
-                            else:
-                                raise HTTPException(
-                                    status_code=status.HTTP_400_BAD_REQUEST,
-                                    detail=f"Your license is not yet eligible for renewal. License expires on {expiry_date}. You can renew 60 days before expiry."
-                                )
-                        else:
-                            logger.info("No expiry date provided. Allowing renewal application.")
-                            continue  # Allow renewal if no expiry date provided
-                    
-                    # For duplicates (ATID_D) - allowed anytime (due to loss, damage, theft)
-                    elif application_data.application_type_id == "ATID_D":
-                        logger.info("Duplicate license application. Allowing due to potential loss/damage/theft.")
-                        continue  # Allow duplicate
+        if existing and existing["latest_status_id"] == "ASID_REJ":
+            # Business Rule 1: If applicant was rejected, they can reapply
+            logger.info(f"Previous application was rejected. Allowing reapplication for type: {application_type_id}")
+        
+        # Business Rule 2: If applicant has pending/in-progress application, block new submission
+        # (the database enforces this too, see the IntegrityError handler below)
+        if existing and existing["active_application_id"]:
+            logger.warning(f"Active application exists for type: {application_type_id}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ACTIVE_APPLICATION_DETAIL.format(application_type_id=application_type_id)
+            )
+        
+        # Business Rule 3: If applicant has approved application, check specific rules
+        if existing and existing["has_approved"]:
+            # For renewals (ATID_B) - allowed if existing license is about to expire
+            if application_type_id == "ATID_B":
+                # Check if license is about to expire (within 60 days or already expired)
+                if application_data.license_details and application_data.license_details.license_expiry_date:
+                    from datetime import datetime, timedelta
+                    expiry_date = application_data.license_details.license_expiry_date
+                    sixty_days_from_now = datetime.now().date() + timedelta(days=60)
                     
-                    # For new applications (ATID_A) - generally not allowed if already approved
+                    if expiry_date <= sixty_days_from_now:
+                        logger.info(f"License expires soon ({expiry_date}). Allowing renewal application.")
                     else:
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"You already have an approved {application_data.application_type_id} application. New applications are only allowed for first-time applicants."
+                            detail=f"Your license is not yet eligible for renewal. License expires on {expiry_date}. You can renew 60 days before expiry."
                         )
+                else:
+                    logger.info("No expiry date provided. Allowing renewal application.")
+            
+            # For duplicates (ATID_D) - allowed anytime (due to loss, damage, theft)
+            elif application_type_id == "ATID_D":
+                logger.info("Duplicate license application. Allowing due to potential loss/damage/theft.")
+            
+            # For new applications (ATID_A) - generally not allowed if already approved
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"You already have an approved {application_type_id} application. New applications are only allowed for first-time applicants."
+                )
         
         # 3. Validate vehicle categories exist (before any database writes)
         logger.info("Step 3: Validating vehicle categories")
@@ -169,16 +181,16 @@ async def submit_complete_application(
         # 4. Create or update applicant profile (now that validations passed)
         logger.info("Step 4: Creating/updating applicant profile")
         is_new_applicant = False
+        # personal_info is already validated; dump it once and reuse it for create or update
+        personal_info = application_data.personal_info.model_dump()
         if not current_applicant:
             logger.info("Creating new applicant")
-            logger.info(f"Personal info for new applicant: {application_data.personal_info.dict()}")
-            # Create new applicant from personal info
-            applicant_data = ApplicantCreate(
+            # Create new applicant from personal info (same validators as ApplicantCreate, so no re-validation)
+            applicant_data = ApplicantCreate.model_construct(
                 email=user_email,
                 uuid=user_uuid,
-                **application_data.personal_info.dict()
+                **personal_info
             )
-            logger.info(f"Applicant data to create: {applicant_data.dict()}")
             current_applicant = crud_applicant.create(db, obj_in=applicant_data)
             is_new_applicant = True
         else:
@@ -187,7 +199,7 @@ async def submit_complete_application(
             if not current_applicant.uuid:
                 current_applicant.uuid = user_uuid
             # Update personal info
-            for field, value in application_data.personal_info.dict().items():
+            for field, value in personal_info.items():
                 if hasattr(current_applicant, field):
                     setattr(current_applicant, field, value)
             # Don't commit yet - will commit everything at the end
@@ -198,7 +210,10 @@ async def submit_complete_application(
         logger.info("Step 5: Creating application")
         from app.models.application import LicenseApplication
         
+        # Ids are allocated client-side, so no flush is needed to learn them and the
+        # vehicle category rows below go out as one batched INSERT
         application = LicenseApplication(
+            application_id=id_allocator.next_id(db, "application"),
             applicant_id=current_applicant.applicant_id,
             application_type_id=application_data.application_type_id,
             application_status_id="ASID_PEN",  # Default to Pending
@@ -206,17 +221,18 @@ async def submit_complete_application(
         )
         
         db.add(application)
-        db.flush()  # Get the application_id
         logger.info(f"Application created with ID: {application.application_id}")
         
         # 6. Add vehicle categories
         logger.info("Step 6: Adding vehicle categories")
         from app.models.application import ApplicationVehicleCategory
         
+        vehicle_ids = id_allocator.allocate(db, "application_vehicle", len(application_data.vehicle_categories))
         for i, category_id in enumerate(application_data.vehicle_categories):
             clutch_type = application_data.clutch_types[i] if i < len(application_data.clutch_types) else "Manual"
             logger.info(f"Adding vehicle category: {category_id} with clutch type: {clutch_type}")
             app_vehicle = ApplicationVehicleCategory(
+                app_vehicle_id=vehicle_ids[i],
                 application_id=application.application_id,
                 category_id=category_id,
                 clutch_type=clutch_type
@@ -227,6 +243,7 @@ async def submit_complete_application(
         from app.models.application import ApplicationStatusHistory
         
         history = ApplicationStatusHistory(
+            history_id=id_allocator.next_id(db, "status_history"),
             application_id=application.application_id,
             application_status_id="ASID_PEN",
             changed_by=current_applicant.applicant_id
@@ -321,7 +338,6 @@ async def submit_complete_application(
                     'employer_tel_no': emp_data.get('employer_telephone', ''),
                     'employer_address': emp_data.get('employer_address', '')
                 }
-                logger.info(f"Creating employment record with mapped data: {mapped_emp_data}")
                 emp_create = EmploymentCreate(
                     applicant_id=current_applicant.applicant_id,
                     **mapped_emp_data
@@ -335,7 +351,6 @@ async def submit_complete_application(
             from app.schemas.family import FamilyInformationCreate
             for family_data in application_data.family_info:
                 # Frontend sends correct field names, no mapping needed
-                logger.info(f"Creating family record with data: {family_data}")
                 family_create = FamilyInformationCreate(
                     applicant_id=current_applicant.applicant_id,
                     **family_data
@@ -436,22 +451,26 @@ async def submit_complete_application(
             # Validate license number format: A12-34-567890 (exactly 6 digits at the end)
             import re
             if not re.match(r'^[A-Z]{1}[0-9]{2}-[0-9]{2}-[0-9]{6}$', license_number):
-                logger.warning(f"Invalid license number format: {license_number}. Expected format: A12-34-567890")
+                logger.warning("Invalid license number format. Expected format: A12-34-567890")
                 # For now, don't set the license number if it's invalid
                 # In production, you might want to raise an error or fix the format
                 logger.info("Skipping license number update due to invalid format")
             else:
                 current_applicant.license_number = license_number
-                logger.info(f"Updated license number: {license_number}")
+                logger.info("Updated license number")
             # Don't commit yet - will commit everything at the end
         
+        events.publish(db, [events.status_event(
+            application.application_id, current_applicant.applicant_id, "ASID_PEN", new_applicant=is_new_applicant
+        )])
+        
         # Commit all changes
         logger.info("Committing all changes")
         db.commit()
         db.refresh(application)
         
         # Prepare response
-        app_count = len(crud_application.get_by_applicant(db, applicant_id=current_applicant.applicant_id, skip=0, limit=100))
+        app_count = (existing["application_count"] if existing else 0) + 1
         
         if is_new_applicant:
             message = f"Welcome! Your application has been submitted successfully. You are now a registered applicant."
@@ -495,6 +514,20 @@ async def submit_complete_application(
         logger.error("HTTP Exception occurred during application submission")
         db.rollback()
         raise
+    except IntegrityError as e:
+        db.rollback()
+        if is_active_application_conflict(e):
+            # A concurrent submission of the same type got in first
+            logger.warning(f"Active application exists for type: {application_data.application_type_id}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ACTIVE_APPLICATION_DETAIL.format(application_type_id=application_data.application_type_id)
+            )
+        logger.exception(f"Integrity error during application submission: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to submit application: {str(e)}"
+        )
     except ValueError as ve:
         logger.error(f"Validation error during application submission: {str(ve)}")
         db.rollback()
@@ -568,6 +601,7 @@ async def submit_application(
     from app.models.application import LicenseApplication
     
     application = LicenseApplication(
+        application_id=id_allocator.next_id(db, "application"),
         applicant_id=current_applicant.applicant_id,
         application_type_id=application_data.application_type_id,
         application_status_id="ASID_PEN",  # Default to Pending
@@ -575,13 +609,14 @@ async def submit_application(
     )
     
     db.add(application)
-    db.flush()  # Get the application_id
     
     # Add vehicle categories
     from app.models.application import ApplicationVehicleCategory
     
+    vehicle_ids = id_allocator.allocate(db, "application_vehicle", len(application_data.vehicle_categories))
     for i, category_id in enumerate(application_data.vehicle_categories):
         app_vehicle = ApplicationVehicleCategory(
+            app_vehicle_id=vehicle_ids[i],
             application_id=application.application_id,
             category_id=category_id,
             clutch_type=application_data.clutch_types[i]
@@ -592,13 +627,24 @@ async def submit_application(
     from app.models.application import ApplicationStatusHistory
     
     history = ApplicationStatusHistory(
+        history_id=id_allocator.next_id(db, "status_history"),
         application_id=application.application_id,
         application_status_id="ASID_PEN",
         changed_by=current_applicant.applicant_id
     )
     db.add(history)
     
-    db.commit()
+    events.publish(db, [events.status_event(application.application_id, current_applicant.applicant_id, "ASID_PEN")])
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if not is_active_application_conflict(e):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ACTIVE_APPLICATION_DETAIL.format(application_type_id=application_data.application_type_id)
+        )
     db.refresh(application)
     
     # Check if this was their first application (just became an applicant)
@@ -662,10 +708,13 @@ async def get_application_history(
 ):
     """Get application status history"""
     
-    from app.crud.application import crud_application
+    from sqlalchemy.orm import joinedload
     from app.models.application import ApplicationStatusHistory
     
-    history = db.query(ApplicationStatusHistory).filter(
+    # Load each entry's status with it; the response serializes it per row
+    history = db.query(ApplicationStatusHistory).options(
+        joinedload(ApplicationStatusHistory.status)
+    ).filter(
         ApplicationStatusHistory.application_id == application.application_id
     ).order_by(ApplicationStatusHistory.status_change_date).all()
     
@@ -685,7 +734,9 @@ async def get_required_documents_status(
     from app.crud import crud_document
     
     doc_status = crud_document.get_required_documents_status(
-        db, application_id=application.application_id
+        db,
+        application_id=application.application_id,
+        type_category=application.application_type.type_category if application.application_type else None
     )
     
     return ResponseModel(
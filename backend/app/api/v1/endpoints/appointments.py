@@ -6,11 +6,14 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import (
     get_db, 
+    get_loader,
     get_current_applicant, 
     get_appointment_owner,
     validate_pagination
 )
-from app.crud import crud_appointment, crud_location, crud_application
+from app.api.idempotency import IdempotentRoute, claim_idempotency_key
+from app.api.loaders import RequestLoader
+from app.crud import crud_appointment, crud_location
 from app.models.applicant import Applicant
 from app.models.appointment import Appointment
 from app.schemas.appointment import (
@@ -20,19 +23,20 @@ from app.schemas.appointment import (
 )
 from app.schemas.response import ResponseModel, PaginatedResponse
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 @router.post("/", response_model=ResponseModel[AppointmentResponse])
 async def schedule_appointment(
     appointment_data: AppointmentCreate,
     db: Session = Depends(get_db),
-    current_applicant: Applicant = Depends(get_current_applicant)
+    loader: RequestLoader = Depends(get_loader),
+    current_applicant: Applicant = Depends(get_current_applicant),
+    idempotency_key: Optional[str] = Depends(claim_idempotency_key)
 ):
-    """Schedule a new appointment"""
+    """Schedule a new appointment; retries with the same Idempotency-Key get the first response"""
     
     # Verify application belongs to current user
-    application = crud_application.get_by_id(db, application_id=appointment_data.application_id)
-    if not application or application.applicant_id != current_applicant.applicant_id:
+    if loader.application_owner(appointment_data.application_id) != current_applicant.applicant_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this application"
@@ -4,6 +4,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_db, get_current_applicant
 from app.core.config import settings
@@ -43,8 +44,8 @@ async def request_registration_otp(
         otp_type=OTPType.REGISTRATION
     )
     
-    # Send OTP email
-    email_sent = send_otp_email(otp_request.email, otp.otp_code, "registration")
+    # Send OTP email; queuing touches the database, so keep it off the event loop
+    email_sent = await run_in_threadpool(send_otp_email, otp_request.email, otp.otp_code, "registration")
     
     if not email_sent:
         raise HTTPException(
@@ -173,8 +174,8 @@ async def request_login_otp(
         otp_type=OTPType.LOGIN
     )
     
-    # Send OTP email
-    email_sent = send_otp_email(otp_request.email, otp.otp_code, "login")
+    # Send OTP email; queuing touches the database, so keep it off the event loop
+    email_sent = await run_in_threadpool(send_otp_email, otp_request.email, otp.otp_code, "login")
     
     if not email_sent:
         raise HTTPException(
@@ -0,0 +1,65 @@
+# app/api/v1/endpoints/bootstrap.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_optional_user_token
+from app.core.responses import orm_to_dict
+from app.crud import crud_applicant, crud_application, crud_reference_data
+from app.crud.reference_data import parse_known_versions
+from app.schemas.applicant import applicant_profile, user_status
+from app.schemas.application import LicenseApplicationResponse
+from app.schemas.bootstrap import BootstrapResponse
+from app.schemas.response import ResponseModel
+
+router = APIRouter()
+
+@router.get("/", response_model=ResponseModel[BootstrapResponse])
+async def get_bootstrap(
+    known: Optional[str] = Query(
+        None, description="Reference sections the client holds, as section:version pairs separated by commas"
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Most recent applications to include"),
+    db: Session = Depends(get_db),
+    user_data: Optional[dict] = Depends(get_optional_user_token)
+):
+    """
+    Everything the app loads on start, in one request: the /public reference
+    data and, with a valid bearer token, the caller's applicant status, profile
+    and most recent applications; an invalid token is served as anonymous. Reference sections whose version is listed in
+    `known` come back with unchanged=true and no items.
+    """
+    data = BootstrapResponse(
+        reference=crud_reference_data.get_all(db, known=parse_known_versions(known))
+    )
+
+    if user_data is not None:
+        user_email = user_data.get("email")
+        user_uuid = user_data.get("id")
+
+        if not user_email or not user_uuid:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid user data",
+            )
+
+        applicant = crud_applicant.get_by_uuid(db, user_uuid=user_uuid)
+        if not applicant:
+            applicant = crud_applicant.get_by_email(db, email=user_email)
+
+        data.user = user_status(user_data, applicant)
+        if applicant:
+            applications = crud_application.get_by_applicant(
+                db, applicant_id=applicant.applicant_id, skip=0, limit=limit
+            )
+            data.profile = applicant_profile(applicant)
+            data.applications = [orm_to_dict(row, LicenseApplicationResponse) for row in applications]
+            # A short page already holds every application
+            data.applications_total = len(applications) if len(applications) < limit else \
+                crud_application.count_by_applicant(db, applicant_id=applicant.applicant_id)
+
+    return ResponseModel(
+        success=True,
+        message="Bootstrap data retrieved successfully",
+        data=data
+    )
@@ -1,24 +1,27 @@
 # app/api/v1/endpoints/documents.py
 import os
 import uuid
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 
 from app.api.deps import (
     get_db, 
+    get_loader,
     get_current_applicant, 
     get_document_owner,
     validate_document_upload
 )
 from app.core.config import settings
-from app.crud import crud_document, crud_application
+from app.api.idempotency import IdempotentRoute, claim_idempotency_key
+from app.api.loaders import RequestLoader
+from app.crud import crud_document
 from app.models.applicant import Applicant
 from app.models.document import SubmittedDocument
 from app.schemas.document import DocumentUpload, DocumentResponse
 from app.schemas.response import ResponseModel
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 @router.post("/upload", response_model=ResponseModel[DocumentResponse])
 async def upload_document(
@@ -26,13 +29,14 @@ async def upload_document(
     document_type: str,
     file: UploadFile = Depends(validate_document_upload),
     db: Session = Depends(get_db),
-    current_applicant: Applicant = Depends(get_current_applicant)
+    loader: RequestLoader = Depends(get_loader),
+    current_applicant: Applicant = Depends(get_current_applicant),
+    idempotency_key: Optional[str] = Depends(claim_idempotency_key)
 ):
-    """Upload a document for an application"""
+    """Upload a document for an application; retries with the same Idempotency-Key get the first response"""
     
     # Verify application belongs to current user
-    application = crud_application.get_by_id(db, application_id=application_id)
-    if not application or application.applicant_id != current_applicant.applicant_id:
+    if loader.application_owner(application_id) != current_applicant.applicant_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this application"
@@ -101,13 +105,13 @@ async def upload_document(
 async def get_application_documents(
     application_id: str,
     db: Session = Depends(get_db),
+    loader: RequestLoader = Depends(get_loader),
     current_applicant: Applicant = Depends(get_current_applicant)
 ):
     """Get all documents for an application"""
     
     # Verify application belongs to current user
-    application = crud_application.get_by_id(db, application_id=application_id)
-    if not application or application.applicant_id != current_applicant.applicant_id:
+    if loader.application_owner(application_id) != current_applicant.applicant_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this application"
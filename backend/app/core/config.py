@@ -30,6 +30,15 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 10485760  # 10MB
     ALLOWED_FILE_TYPES: list = ["image/jpeg", "image/png", "application/pdf"]
     ALLOWED_FILE_EXTENSIONS: str = ".pdf,.jpg,.jpeg,.png,.doc,.docx"
+    # Documents each application type needs, by type category (app/crud/document.py)
+    REQUIRED_DOCUMENTS: dict = {
+        "New": [
+            "Birth Certificate", "Residence Certificate", "Medical Certificate",
+            "Drug Test Result", "Driving Course Certificate", "Valid ID", "Passport Photo"
+        ],
+        "Renewal": ["Medical Certificate", "Drug Test Result", "Previous License", "Valid ID", "Passport Photo"],
+        "Duplicate": ["Valid ID", "Passport Photo"],
+    }
     
     # CORS - Allow all origins for development (change for production)
     BACKEND_CORS_ORIGINS: list = ["*"]
@@ -44,6 +53,85 @@ class Settings(BaseSettings):
     EMAILS_FROM_EMAIL: Optional[str] = None
     EMAILS_FROM_NAME: str = "MadaLTO System"
     
+    # Email Outbox Worker
+    EMAIL_OUTBOX_ENABLED: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 20
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 120
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 30
+    ENABLE_EMAIL_NOTIFICATIONS: bool = True
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_REQUESTS: bool = True
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0
+    LOG_ROUTE_SAMPLE_RATES: dict = {"/health": 0.0, "/api/v1/public/health": 0.0}
+    LOG_BODY_ROUTES: list = ["/api/v1/applications/submit-complete"]
+    LOG_BODY_MAX_BYTES: int = 4096
+    LOG_QUEUE_SIZE: int = 10000
+    
+    # Request Instrumentation (can also be switched at runtime via /admin/system/instrumentation)
+    INSTRUMENTATION_ENABLED: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    EXPLAIN_SLOW_QUERIES: bool = True
+    N_PLUS_ONE_DETECTION: Optional[bool] = None  # defaults to DEBUG
+    N_PLUS_ONE_THRESHOLD: int = 5
+    
+    # Metrics (Prometheus, served on /metrics)
+    METRICS_ENABLED: bool = True
+    
+    # Admin listings serialize ORM rows straight to JSON (see app/core/responses.py)
+    FAST_JSON_RESPONSES: bool = True
+    
+    # Client-side IDs: sequence values each worker reserves at a time (app/utils/id_allocation.py)
+    ID_BLOCK_SIZE: int = 50
+    
+    # Partitioning: monthly partitions of licenseapplication/applicationstatushistory (app/utils/partitions.py)
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_CHECK_HOURS: float = 24.0
+    
+    # Archival of finalized applications (app/utils/archival.py)
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_RETENTION_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 100
+    ARCHIVE_PAUSE_SECONDS: float = 2.0
+    ARCHIVE_IDLE_SECONDS: float = 3600.0
+    ARCHIVE_LOCK_TIMEOUT_MS: int = 2000
+    
+    # Export: rows fetched per server-side cursor batch by GET /admin/applications/export
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Bulk application import (app/utils/bulk_import.py)
+    BULK_IMPORT_WORKERS: int = 4
+    BULK_IMPORT_CHUNK_SIZE: int = 5000
+    BULK_IMPORT_MAX_REPORTED_ERRORS: int = 100
+    
+    # Live application events over server-sent events (app/utils/events.py)
+    EVENTS_ENABLED: bool = True
+    EVENTS_CHANNEL: str = "application_events"
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_RECONNECT_SECONDS: float = 5.0
+    
+    # Admin review work-queue (app/crud/review_queue.py)
+    REVIEW_LEASE_SECONDS: int = 600  # extended by every heartbeat
+    REVIEW_CLAIM_MAX: int = 20
+    
+    # Idempotency-Key handling of retried writes (app/api/idempotency.py)
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_LOCK_SECONDS: int = 120  # a key still Processing after this is taken over
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # how long a concurrent duplicate waits for the first
+    IDEMPOTENCY_POLL_SECONDS: float = 0.2  # first pause between checks, doubled each time
+    IDEMPOTENCY_POLL_MAX_SECONDS: float = 1.0
+    IDEMPOTENCY_PURGE_ENABLED: bool = True
+    IDEMPOTENCY_PURGE_MINUTES: int = 60
+    
+    # Application detail cache: documents per worker (app/crud/application_detail.py); 0 disables
+    APPLICATION_DETAIL_CACHE_SIZE: int = 256
+    
     # OTP Configuration
     OTP_EXPIRE_MINUTES: int = 5
     OTP_LENGTH: int = 4
@@ -0,0 +1,260 @@
+# app/core/instrumentation.py
+"""
+Per-request timing of database statements and Supabase calls.
+
+While enabled, SQLAlchemy cursor events and the Supabase HTTP transport add to
+a `RequestStats` object bound to the current request through a context
+variable. When disabled, the engine listeners are removed, so the only
+remaining cost is one context variable lookup per Supabase call. (Supabase
+calls are always counted in the Prometheus metrics.)
+
+The switch is per process: with several uvicorn workers each one has to be
+switched on its own.
+"""
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import record_supabase_call
+from app.core.query_analysis import find_repeated_statements
+
+logger = logging.getLogger(__name__)
+
+# Slow statements kept per request for EXPLAIN
+MAX_SLOW_STATEMENTS = 5
+
+@dataclass
+class RequestStats:
+    statement_count: int = 0
+    db_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    slowest_time: float = 0.0
+    auth_calls: int = 0
+    auth_time: float = 0.0
+    auth_errors: int = 0
+    slow_statements: List[Tuple[str, Any, float]] = field(default_factory=list)
+    statement_counts: Counter = field(default_factory=Counter)
+
+    def record_statement(self, statement: str, parameters: Any, elapsed: float) -> None:
+        self.statement_count += 1
+        self.statement_counts[statement] += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        if (
+            elapsed * 1000 >= request_instrumentation.slow_query_ms
+            and len(self.slow_statements) < MAX_SLOW_STATEMENTS
+        ):
+            self.slow_statements.append((statement, parameters, elapsed))
+
+    def record_auth_call(self, elapsed: float, failed: bool) -> None:
+        self.auth_calls += 1
+        self.auth_time += elapsed
+        if failed:
+            self.auth_errors += 1
+
+    def server_timing(self, total: float) -> str:
+        """Value for the Server-Timing response header (durations in ms)"""
+        metrics = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statement_count} statements"',
+            f"db-slowest;dur={self.slowest_time * 1000:.2f}",
+        ]
+        if self.auth_calls:
+            metrics.append(f'auth;dur={self.auth_time * 1000:.2f};desc="{self.auth_calls} calls"')
+        metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def as_log_fields(self) -> Dict[str, Any]:
+        return {
+            "db_statements": self.statement_count,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "db_slowest_ms": round(self.slowest_time * 1000, 2),
+            "db_slowest_sql": self.slowest_statement[:500] if self.slowest_statement else None,
+            "auth_calls": self.auth_calls,
+            "auth_time_ms": round(self.auth_time * 1000, 2),
+            "auth_errors": self.auth_errors,
+        }
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def get_request_stats() -> Optional[RequestStats]:
+    """Stats for the request being handled, or None when instrumentation is off"""
+    return _current_stats.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    stats.record_statement(statement, parameters, time.perf_counter() - start_times.pop())
+
+class RequestInstrumentation:
+    """Runtime switch for request instrumentation"""
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = settings.SLOW_QUERY_MS
+        self.explain_slow_queries = settings.EXPLAIN_SLOW_QUERIES
+        # N+1 detection is on by default in development (DEBUG) and needs the statement hooks
+        self.detect_n_plus_one = (
+            settings.DEBUG if settings.N_PLUS_ONE_DETECTION is None else settings.N_PLUS_ONE_DETECTION
+        )
+        self.n_plus_one_threshold = settings.N_PLUS_ONE_THRESHOLD
+        self._engine: Optional[Engine] = None
+
+    def configure(self, engine: Engine) -> None:
+        """Bind to the application engine and apply the configured default"""
+        self._engine = engine
+        if settings.INSTRUMENTATION_ENABLED or self.detect_n_plus_one:
+            self.enable()
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        if self._engine is not None:
+            event.listen(self._engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(self._engine, "after_cursor_execute", _after_cursor_execute)
+        self.enabled = True
+        logger.info("Request instrumentation enabled")
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+        if self._engine is not None:
+            event.remove(self._engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(self._engine, "after_cursor_execute", _after_cursor_execute)
+        self.enabled = False
+        logger.info("Request instrumentation disabled")
+
+    def update(
+        self,
+        *,
+        enabled: Optional[bool] = None,
+        slow_query_ms: Optional[float] = None,
+        explain_slow_queries: Optional[bool] = None,
+        detect_n_plus_one: Optional[bool] = None,
+        n_plus_one_threshold: Optional[int] = None
+    ) -> Dict[str, Any]:
+        if detect_n_plus_one is not None:
+            self.detect_n_plus_one = detect_n_plus_one
+        if n_plus_one_threshold is not None:
+            self.n_plus_one_threshold = n_plus_one_threshold
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        if explain_slow_queries is not None:
+            self.explain_slow_queries = explain_slow_queries
+        if enabled is True:
+            self.enable()
+        elif enabled is False:
+            self.disable()
+        return self.get_state()
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "explain_slow_queries": self.explain_slow_queries,
+            "detect_n_plus_one": self.detect_n_plus_one,
+            "n_plus_one_threshold": self.n_plus_one_threshold
+        }
+
+    def start_request(self):
+        """Bind a fresh RequestStats to the current context; returns (stats, reset token)"""
+        stats = RequestStats()
+        return stats, _current_stats.set(stats)
+
+    def end_request(self, token) -> None:
+        _current_stats.reset(token)
+
+    def report_repeated_statements(self, stats: RequestStats, method: str, path: str) -> None:
+        """Warn about statement shapes executed n_plus_one_threshold times or more in one request"""
+        if not self.detect_n_plus_one:
+            return
+        repeated = find_repeated_statements(stats.statement_counts, self.n_plus_one_threshold)
+        if not repeated:
+            return
+        logger.warning(
+            f"Possible N+1 on {method} {path}: "
+            + "; ".join(f"{count}x {shape[:200]}" for shape, count in repeated),
+            extra={
+                "event": "n_plus_one",
+                "method": method,
+                "path": path,
+                "db_statements": stats.statement_count,
+                "repeated_statements": [{"sql": shape, "count": count} for shape, count in repeated]
+            }
+        )
+
+    def explain_slow_statements(self, stats: RequestStats, path: str) -> None:
+        """
+        Log the plans of a request's slow SELECT statements.
+        Runs on its own connection after the response has been sent.
+        """
+        if not self.explain_slow_queries or self._engine is None:
+            return
+        token = _current_stats.set(None)
+        try:
+            with self._engine.connect() as connection:
+                for statement, parameters, elapsed in stats.slow_statements:
+                    if not statement.lstrip().upper().startswith("SELECT"):
+                        continue
+                    try:
+                        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+                        plan = "\n".join(str(row[0]) for row in rows)
+                    except Exception as e:
+                        plan = f"EXPLAIN failed: {e}"
+                    logger.warning(
+                        f"Slow query ({elapsed * 1000:.1f}ms) on {path}",
+                        extra={
+                            "event": "slow_query",
+                            "path": path,
+                            "duration_ms": round(elapsed * 1000, 2),
+                            "statement": statement[:2000],
+                            "plan": plan
+                        }
+                    )
+                connection.rollback()
+        except Exception as e:
+            logger.error(f"Could not explain slow statements: {e}")
+        finally:
+            _current_stats.reset(token)
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """httpx transport that times calls to Supabase for metrics and the current request"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = _current_stats.get()
+        start = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            record_supabase_call(request.url.path, elapsed, type(e).__name__)
+            if stats is not None:
+                stats.record_auth_call(elapsed, failed=True)
+            raise
+
+        elapsed = time.perf_counter() - start
+        failed = response.status_code >= 500
+        record_supabase_call(request.url.path, elapsed, f"http_{response.status_code}" if failed else None)
+        if stats is not None:
+            stats.record_auth_call(elapsed, failed=failed)
+        return response
+
+# Global instance
+request_instrumentation = RequestInstrumentation()
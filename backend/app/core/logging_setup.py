@@ -0,0 +1,216 @@
+# app/core/logging_setup.py
+"""
+Non-blocking, structured logging.
+
+Every record is handed to a bounded in-memory queue by a `QueueHandler`; a
+`QueueListener` thread does the formatting and the actual write. Request-path
+code therefore only pays for building the record, and the expensive parts
+(JSON encoding, redaction, body parsing) happen on the listener thread.
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from app.core.config import settings
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+REDACTED = "[REDACTED]"
+
+# Headers that carry credentials
+SENSITIVE_HEADERS = {
+    "authorization",
+    "cookie",
+    "set-cookie",
+    "apikey",
+    "x-api-key",
+    "proxy-authorization",
+}
+
+# Request body fields that carry credentials or personal information. Keys are
+# compared lower-cased with "_" removed, so both the frontend's camelCase names and
+# the schema's snake_case names are caught.
+SENSITIVE_FIELD_MARKERS = (
+    "password",
+    "otp",
+    "token",
+    "secret",
+    "email",
+    "name",
+    "birth",
+    "address",
+    "contact",
+    "phone",
+    "telephone",
+    "telno",
+    "licensenumber",
+    "street",
+    "barangay",
+)
+SENSITIVE_FIELDS = {"tin", "zipcode"}
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+def redact_headers(headers: Iterable[Tuple[Union[bytes, str], Union[bytes, str]]]) -> Dict[str, str]:
+    """Decode ASGI header pairs, masking credentials"""
+    redacted = {}
+    for name, value in headers:
+        if isinstance(name, bytes):
+            name = name.decode("latin-1")
+        if isinstance(value, bytes):
+            value = value.decode("latin-1")
+        name = name.lower()
+        redacted[name] = REDACTED if name in SENSITIVE_HEADERS else value
+    return redacted
+
+def is_sensitive_field(key: str) -> bool:
+    normalized = key.lower().replace("_", "")
+    return normalized in SENSITIVE_FIELDS or any(marker in normalized for marker in SENSITIVE_FIELD_MARKERS)
+
+def redact_payload(value: Any) -> Any:
+    """Recursively mask sensitive scalar fields in a decoded JSON payload"""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if is_sensitive_field(key) and not isinstance(item, (dict, list)) else redact_payload(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_payload(item) for item in value]
+    return value
+
+def decode_body(body: bytes, truncated: bool = False) -> Any:
+    """Turn a captured request body into something safe to log"""
+    if truncated:
+        # A cut-off JSON document can't be parsed, and so can't be redacted field by field
+        return {"truncated": True, "size": len(body)}
+    try:
+        return redact_payload(json.loads(body))
+    except (ValueError, UnicodeDecodeError):
+        return {"unparsed": True, "size": len(body)}
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+
+        # Raw request data is attached by the request logging middleware and only
+        # decoded and redacted here, on the listener thread
+        if "headers" in entry:
+            entry["headers"] = redact_headers(entry["headers"])
+        if "body" in entry:
+            entry["body"] = decode_body(entry["body"], entry.pop("body_truncated", False))
+
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Plain text for local development; request data is redacted the same way"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = []
+        for key, value in record.__dict__.items():
+            if key in _RECORD_ATTRS or key.startswith("_"):
+                continue
+            if key == "headers":
+                value = redact_headers(value)
+            elif key == "body":
+                value = decode_body(value, getattr(record, "body_truncated", False))
+            elif key == "body_truncated":
+                continue
+            fields.append(f"{key}={value}")
+        return f"{line} {' '.join(fields)}" if fields else line
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks.
+    When the queue is full the record is dropped and counted instead of
+    stalling the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like QueueHandler.prepare, but the message is only merged with its args;
+        # formatting is left to the listener. Traceback text is kept for it.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.stack_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LoggingPipeline:
+    """Owns the log queue, the root queue handler and the listener thread"""
+
+    def __init__(self):
+        self.queue: Optional[queue.Queue] = None
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def configure(self, stream=None) -> None:
+        """Route all logging through the queue; safe to call more than once"""
+        if self.listener is not None:
+            return
+
+        formatter = JSONFormatter() if settings.LOG_FORMAT.lower() == "json" else TextFormatter(TEXT_FORMAT)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(formatter)
+
+        self.queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, output, respect_handler_level=True)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(self.handler)
+        root.setLevel(settings.LOG_LEVEL.upper())
+
+        self.listener.start()
+
+    def shutdown(self) -> None:
+        """Flush queued records and stop the listener thread"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        logging.getLogger().removeHandler(self.handler)
+        self.listener = None
+        self.handler = None
+        self.queue = None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped if self.handler else 0
+
+# Global instance
+logging_pipeline = LoggingPipeline()
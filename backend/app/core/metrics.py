@@ -0,0 +1,177 @@
+# app/core/metrics.py
+"""
+Prometheus metrics.
+
+With several uvicorn/gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an
+empty, writable directory before the workers start. Every worker then writes
+its samples there and `/metrics` aggregates all of them, whichever worker
+answers the scrape. Gunicorn should also call `mark_process_dead` on worker
+exit (see gunicorn.conf.py).
+"""
+import os
+import re
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Re-count the email outbox at most this often, however often we are scraped
+OUTBOX_DEPTH_TTL_SECONDS = 15
+
+# HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# Database connection pool
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use", multiprocess_mode="livesum")
+DB_POOL_CHECKED_IN = Gauge("db_pool_checked_in", "Idle connections in the pool", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections opened beyond pool_size", multiprocess_mode="livesum")
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts", "Connection checkouts")
+
+# Supabase
+SUPABASE_REQUEST_DURATION = Histogram(
+    "supabase_request_duration_seconds",
+    "Supabase API call latency",
+    ["operation"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+SUPABASE_REQUEST_ERRORS = Counter(
+    "supabase_request_errors",
+    "Supabase API calls that raised or returned a 5xx",
+    ["operation", "kind"],
+)
+
+# Email outbox
+EMAIL_OUTBOX_DEPTH = Gauge(
+    "email_outbox_depth",
+    "Emails waiting to be delivered",
+    multiprocess_mode="mostrecent",
+)
+EMAIL_OUTBOX_SENT = Counter("email_outbox_sent", "Emails delivered by the outbox worker")
+EMAIL_OUTBOX_FAILED = Counter("email_outbox_failed", "Failed email delivery attempts")
+
+# Live events (server-sent events)
+EVENT_SUBSCRIBERS = Gauge(
+    "event_subscribers",
+    "Open event streams by role (admin/applicant)",
+    ["role"],
+    multiprocess_mode="livesum",
+)
+EVENTS_DISPATCHED = Counter("events_dispatched", "Events received from Postgres and fanned out", ["type"])
+EVENTS_RESYNCS = Counter("events_resyncs", "Event streams that fell behind and were told to re-fetch")
+
+# Admin review work-queue
+REVIEW_QUEUE_ITEMS = Counter(
+    "review_queue_items",
+    "Review queue items by queue and outcome (claimed/released/completed)",
+    ["queue", "outcome"],
+)
+
+# Idempotency keys
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests",
+    "Requests with an Idempotency-Key by outcome (executed/replayed/mismatch/in_progress)",
+    ["outcome"],
+)
+
+# Caches
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+
+_ID_SEGMENT = re.compile(r"/[0-9a-fA-F-]{16,}(?=/|$)")
+
+def supabase_operation(path: str) -> str:
+    """Supabase path with user ids replaced, to keep label cardinality bounded"""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+def record_supabase_call(path: str, elapsed: float, error_kind: Optional[str] = None) -> None:
+    operation = supabase_operation(path)
+    SUPABASE_REQUEST_DURATION.labels(operation).observe(elapsed)
+    if error_kind:
+        SUPABASE_REQUEST_ERRORS.labels(operation, error_kind).inc()
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+def instrument_pool(engine: Engine) -> None:
+    """Keep the pool gauges current from pool checkout/checkin events"""
+    pool = engine.pool
+
+    def update_pool_gauges(*args) -> None:
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_CHECKED_IN.set(pool.checkedin())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    def on_checkout(*args) -> None:
+        DB_POOL_CHECKOUTS.inc()
+        update_pool_gauges()
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", update_pool_gauges)
+    update_pool_gauges()
+
+class OutboxDepthSampler:
+    """Counts pending outbox messages for the scrape, cached for a few seconds"""
+
+    def __init__(self):
+        self._sampled_at = 0.0
+
+    def sample(self) -> None:
+        if time.monotonic() - self._sampled_at < OUTBOX_DEPTH_TTL_SECONDS:
+            return
+        # Imported here so the metrics module stays free of model imports
+        from app.core.database import SessionLocal
+        from app.crud.email_outbox import crud_email_outbox
+
+        db = SessionLocal()
+        try:
+            EMAIL_OUTBOX_DEPTH.set(crud_email_outbox.get_queue_depth(db))
+            self._sampled_at = time.monotonic()
+        finally:
+            db.close()
+
+outbox_depth_sampler = OutboxDepthSampler()
+
+def generate_metrics() -> bytes:
+    """Prometheus text exposition of every metric, aggregated across workers if needed"""
+    try:
+        outbox_depth_sampler.sample()
+    except Exception:
+        # A database outage should not take the metrics endpoint down with it
+        pass
+
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,86 @@
+# app/core/query_analysis.py
+"""
+Helpers for spotting N+1 query patterns.
+
+Statements are grouped by their normalized "shape": literals and bind
+parameters become `?` and expanded IN lists collapse to a single `(?)`. Lazy
+loads fired per row during serialization therefore show up as one shape
+executed many times.
+"""
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# %(name)s (psycopg), :name (SQLAlchemy text), $1 (asyncpg), %s and ?
+_BIND_PARAM = re.compile(r"%\([^)]+\)s|%s|:\w+|\$\d+|\?")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _BIND_PARAM.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+def find_repeated_statements(
+    statement_counts: Dict[str, int],
+    threshold: int
+) -> List[Tuple[str, int]]:
+    """Shapes executed at least `threshold` times, most repeated first"""
+    shapes: Counter = Counter()
+    for statement, count in statement_counts.items():
+        shapes[normalize_sql(statement)] += count
+    return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+class QueryLog:
+    """Statements executed on an engine while `count_queries` is active"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def shapes(self) -> Counter:
+        return Counter(normalize_sql(statement) for statement in self.statements)
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        return find_repeated_statements(Counter(self.statements), threshold)
+
+    def summary(self) -> str:
+        lines = [f"{self.count} statement(s):"]
+        for shape, count in self.shapes().most_common():
+            lines.append(f"  {count:>3} x {shape[:300]}")
+        return "\n".join(lines)
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None) -> Iterator[QueryLog]:
+    """
+    Record every statement executed on `engine` (the application engine by default).
+
+        with count_queries() as queries:
+            crud_application.get_by_applicant(db, applicant_id=applicant_id)
+        print(queries.summary())
+    """
+    if engine is None:
+        from app.core.database import engine
+
+    query_log = QueryLog()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        query_log.statements.append(statement)
+
+    event.listen(engine, "after_cursor_execute", record)
+    try:
+        yield query_log
+    finally:
+        event.remove(engine, "after_cursor_execute", record)
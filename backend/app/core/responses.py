@@ -0,0 +1,237 @@
+# app/core/responses.py
+"""
+Fast JSON responses for large listings.
+
+FastAPI validates whatever an endpoint returns against its `response_model`
+and then serializes the validated model. For listings built from ORM rows
+that means every row goes through the schema (including its validators)
+once when the endpoint builds `PaginatedResponse(...)` and again when FastAPI
+checks the result.
+
+Endpoints opt in by returning one of the helpers below instead of the model.
+A `Response` returned from an endpoint is sent as-is, so `response_model`
+keeps documenting the endpoint while validation is skipped:
+
+- `orm_to_dict` copies ORM rows into plain dicts following the schema's
+  fields, with a per-schema plan computed once. No validation runs; rows
+  come from the database and were validated when written.
+- `ORJSONResponse` renders those dicts with orjson.
+
+`FAST_JSON_RESPONSES=false` makes the helpers return the regular models so
+FastAPI's default path runs.
+
+`rows_response` streams exports: batches of rows become CSV or JSON Lines
+chunks (optionally gzipped) as they arrive, so memory stays flat however
+many rows there are.
+
+`event_stream_response` sends live events as server-sent events.
+"""
+import csv
+import decimal
+import io
+import typing
+import zlib
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.schemas.response import PaginatedResponse
+
+def _default(value: Any) -> Any:
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; datetimes in UTC use "Z" like pydantic"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+
+# Scalar fields as (attribute, output key, default) and nested models as
+# (attribute, output key, schema, value is a list)
+_ScalarPlan = Tuple[Tuple[str, str, Any], ...]
+_NestedPlan = Tuple[Tuple[str, str, Type[BaseModel], bool], ...]
+
+_MISSING = object()
+
+def _nested_schema(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """Model class inside Optional[...] / List[...], and whether it is a list"""
+    is_list = False
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Union:
+            args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+            if len(args) != 1:
+                return None, False
+            annotation = args[0]
+        elif origin in (list, List, tuple, Sequence):
+            is_list = True
+            annotation = typing.get_args(annotation)[0]
+        else:
+            break
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, is_list
+    return None, False
+
+@lru_cache(maxsize=None)
+def _field_plan(schema: Type[BaseModel]) -> Tuple[_ScalarPlan, _NestedPlan]:
+    scalars, nested_fields = [], []
+    for name, field in schema.model_fields.items():
+        key = field.alias or name
+        nested, is_list = _nested_schema(field.annotation)
+        if nested is not None:
+            nested_fields.append((name, key, nested, is_list))
+        else:
+            default = None if field.is_required() else field.get_default(call_default_factory=True)
+            scalars.append((name, key, default))
+    return tuple(scalars), tuple(nested_fields)
+
+def orm_to_dict(obj: Any, schema: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    """Copy the attributes `schema` declares from an ORM object into a dict"""
+    if obj is None:
+        return None
+    scalars, nested_fields = _field_plan(schema)
+    # Loaded column values live in the instance __dict__; reading them there
+    # skips the instrumented attribute descriptor
+    loaded = getattr(obj, "__dict__", {})
+    row = {}
+    for name, key, default in scalars:
+        value = loaded.get(name, _MISSING)
+        row[key] = getattr(obj, name, default) if value is _MISSING else value
+    for name, key, nested, is_list in nested_fields:
+        value = getattr(obj, name, None)
+        if value is not None:
+            value = [orm_to_dict(item, nested) for item in value] if is_list else orm_to_dict(value, nested)
+        row[key] = value
+    return row
+
+def paginated_response(
+    schema: Type[BaseModel],
+    *,
+    message: str,
+    items: List[Any],
+    total: int,
+    page: int,
+    size: int,
+    pages: int
+):
+    """PaginatedResponse[schema] for ORM rows, through the fast path when enabled"""
+    if not settings.FAST_JSON_RESPONSES:
+        return PaginatedResponse(
+            success=True, message=message, data=items,
+            total=total, page=page, size=size, pages=pages
+        )
+    return ORJSONResponse({
+        "success": True,
+        "message": message,
+        "data": [orm_to_dict(item, schema) for item in items],
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages
+    })
+
+# Export format -> media type
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+def _csv_chunks(columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there were no rows
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def _jsonl_chunks(columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    for rows in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=_default, option=orjson.OPT_UTC_Z) + b"\n"
+            for row in rows
+        )
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def rows_response(
+    columns: Sequence[str],
+    batches: Iterable[Sequence[Sequence[Any]]],
+    *,
+    export_format: str,
+    filename: str,
+    compress: bool = False
+) -> StreamingResponse:
+    """
+    Stream `batches` (lists of rows, values in `columns` order) as CSV or JSON
+    Lines, one chunk per batch. `batches` is consumed lazily, in a worker
+    thread when it is a plain iterator.
+    """
+    chunks = _csv_chunks(columns, batches) if export_format == "csv" else _jsonl_chunks(columns, batches)
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    filename = f"{filename}.{export_format}"
+    if compress:
+        chunks = _gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+async def _sse_chunks(events: AsyncIterator[Optional[Dict[str, Any]]], on_close: Callable[[], None]) -> AsyncIterator[bytes]:
+    try:
+        # Reconnect after 5s if the connection drops
+        yield b"retry: 5000\nevent: ready\ndata: {}\n\n"
+        async for event in events:
+            if event is None:
+                yield b": keepalive\n\n"
+            else:
+                yield b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+    finally:
+        on_close()
+
+def event_stream_response(
+    events: AsyncIterator[Optional[Dict[str, Any]]],
+    on_close: Callable[[], None]
+) -> StreamingResponse:
+    """
+    Stream `events` (dicts with a "type", or None for a keepalive comment) as
+    text/event-stream. `on_close` runs when the client goes away.
+    """
+    return StreamingResponse(
+        _sse_chunks(events, on_close),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
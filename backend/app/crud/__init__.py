@@ -15,3 +15,10 @@ from .user import crud_user
 from .analytics import crud_analytics
 from .admin import crud_admin
 from .otp import crud_email_otp
+from .email_outbox import crud_email_outbox
+from .archive import crud_archive
+from .bulk_import import crud_bulk_import
+from .review_queue import crud_review_queue
+from .idempotency import crud_idempotency
+from .application_detail import crud_application_detail
+from .reference_data import crud_reference_data
@@ -1,18 +1,95 @@
 # app/crud/admin.py
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, desc, func
 from datetime import datetime, date
-import random
-import string
 from uuid import UUID
 
 from app.models.admin import Admin
 from app.models.applicant import Applicant
-from app.models.application import LicenseApplication, ApplicationStatusHistory, ApplicationType
+from app.models.application import LicenseApplication, ApplicationStatusHistory, ApplicationStatus, ApplicationType
 from app.models.document import SubmittedDocument
 from app.models.appointment import Appointment
 from app.schemas.admin import AdminCreate, AdminUpdate
+from app.crud.review_queue import crud_review_queue
+from app.utils import events
+from app.utils.id_allocation import id_allocator
+from app.utils.license_numbers import license_number_allocator
+
+# Status mapping from the friendly filter names to database IDs
+FILTER_STATUS_IDS = {
+    "verifying": ["ASID_PEN", "ASID_SFA"],  # Pending and Subject for Approval
+    "resubmission": "ASID_RSB",  # For Resubmission
+    "rejected": "ASID_REJ",  # Rejected
+    "approved": "ASID_APR",  # Approved
+}
+
+# Flat columns of an application export row, in output order
+EXPORT_COLUMNS = [
+    LicenseApplication.application_id,
+    LicenseApplication.submission_date,
+    LicenseApplication.last_updated_date,
+    LicenseApplication.application_status_id,
+    ApplicationStatus.status_description,
+    LicenseApplication.application_type_id,
+    ApplicationType.type_category,
+    LicenseApplication.rejection_reason,
+    LicenseApplication.additional_requirements,
+    Applicant.applicant_id,
+    Applicant.email,
+    Applicant.family_name,
+    Applicant.first_name,
+    Applicant.middle_name,
+    Applicant.birthdate,
+    Applicant.sex,
+    Applicant.contact_num,
+    Applicant.address,
+    Applicant.license_number,
+]
+
+def filter_applications(
+    query,
+    *,
+    type_filter: Optional[str] = None,
+    status_filter: Optional[str] = None,
+    sort_by: str = "date_desc",
+    search_query: Optional[str] = None
+):
+    """
+    Apply the admin application filters and sorting to `query`.
+    A type filter compares ApplicationType.type_category, so the query must
+    join applicationtype when one is given.
+    """
+    # Apply type filter (filter by application type category)
+    if type_filter and type_filter.lower() in ["new", "renewal", "duplicate"]:
+        query = query.filter(ApplicationType.type_category == type_filter.title())
+    
+    # Apply status filter
+    if status_filter and status_filter.lower() in FILTER_STATUS_IDS:
+        status_ids = FILTER_STATUS_IDS[status_filter.lower()]
+        if isinstance(status_ids, list):
+            query = query.filter(LicenseApplication.application_status_id.in_(status_ids))
+        else:
+            query = query.filter(LicenseApplication.application_status_id == status_ids)
+    
+    # Apply search filter
+    if search_query:
+        search_filter = or_(
+            LicenseApplication.application_id.ilike(f"%{search_query}%"),
+            LicenseApplication.applicant.has(
+                or_(
+                    Applicant.first_name.ilike(f"%{search_query}%"),
+                    Applicant.family_name.ilike(f"%{search_query}%"),
+                    Applicant.contact_num.ilike(f"%{search_query}%")
+                )
+            )
+        )
+        query = query.filter(search_filter)
+    
+    # Apply sorting
+    if sort_by == "date_asc":
+        return query.order_by(LicenseApplication.submission_date.asc())
+    return query.order_by(LicenseApplication.submission_date.desc())
 
 class CRUDAdmin:
     """Administrative operations for managing the system"""
@@ -119,53 +196,21 @@ class CRUDAdmin:
     ) -> Dict[str, Any]:
         """Get applications with advanced filtering and sorting options"""
         
-        # Status mapping from friendly names to database IDs
-        status_mapping = {
-            "verifying": ["ASID_PEN", "ASID_SFA"],  # Pending and Subject for Approval
-            "resubmission": "ASID_RSB",  # For Resubmission
-            "rejected": "ASID_REJ",  # Rejected
-            "approved": "ASID_APR",  # Approved
-        }
-        
         query = db.query(LicenseApplication).options(
             joinedload(LicenseApplication.applicant),
             joinedload(LicenseApplication.application_type),
             joinedload(LicenseApplication.status)
         )
-        
-        # Apply type filter (filter by application type category)
-        if type_filter and type_filter.lower() in ["new", "renewal", "duplicate"]:
-            query = query.join(LicenseApplication.application_type).filter(
-                ApplicationType.type_category == type_filter.title()
-            )
-        
-        # Apply status filter
-        if status_filter and status_filter.lower() in status_mapping:
-            status_ids = status_mapping[status_filter.lower()]
-            if isinstance(status_ids, list):
-                query = query.filter(LicenseApplication.application_status_id.in_(status_ids))
-            else:
-                query = query.filter(LicenseApplication.application_status_id == status_ids)
-        
-        # Apply search filter
-        if search_query:
-            search_filter = or_(
-                LicenseApplication.application_id.ilike(f"%{search_query}%"),
-                LicenseApplication.applicant.has(
-                    or_(
-                        Applicant.first_name.ilike(f"%{search_query}%"),
-                        Applicant.family_name.ilike(f"%{search_query}%"),
-                        Applicant.contact_num.ilike(f"%{search_query}%")
-                    )
-                )
-            )
-            query = query.filter(search_filter)
-        
-        # Apply sorting
-        if sort_by == "date_asc":
-            query = query.order_by(LicenseApplication.submission_date.asc())
-        else:  # Default to date_desc
-            query = query.order_by(LicenseApplication.submission_date.desc())
+        if type_filter:
+            query = query.join(LicenseApplication.application_type)
+        
+        query = filter_applications(
+            query,
+            type_filter=type_filter,
+            status_filter=status_filter,
+            sort_by=sort_by,
+            search_query=search_query
+        )
         
         # Get total count for pagination (before applying skip/limit)
         total_count = query.count()
@@ -181,6 +226,40 @@ class CRUDAdmin:
             "pages": (total_count + limit - 1) // limit if limit > 0 else 1
         }
     
+    def iter_filtered_application_rows(
+        self,
+        db: Session,
+        *,
+        type_filter: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        sort_by: str = "date_desc",
+        search_query: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Any]]:
+        """
+        Stream every application matching the filters of get_filtered_applications
+        as batches of flat rows (EXPORT_COLUMNS). Rows come from a server-side
+        cursor `batch_size` at a time, so memory use does not grow with the result.
+        """
+        query = db.query(*EXPORT_COLUMNS).select_from(LicenseApplication).outerjoin(
+            Applicant, Applicant.applicant_id == LicenseApplication.applicant_id
+        ).outerjoin(
+            ApplicationType, ApplicationType.application_type_id == LicenseApplication.application_type_id
+        ).outerjoin(
+            ApplicationStatus, ApplicationStatus.application_status_id == LicenseApplication.application_status_id
+        )
+        query = filter_applications(
+            query,
+            type_filter=type_filter,
+            status_filter=status_filter,
+            sort_by=sort_by,
+            search_query=search_query
+        )
+        
+        result = db.execute(query.statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
+    
     def approve_application(
         self, 
         db: Session, 
@@ -198,8 +277,15 @@ class CRUDAdmin:
             return None
         
         try:
+            events.publish(db, [events.status_event(
+                application_id, application.applicant_id, "ASID_APR", application.application_status_id
+            )])
+            events.publish_document_verifications(db, is_verified=True, application_ids=[application_id])
+            crud_review_queue.release_completed(db, application_ids=[application_id], with_documents=True)
+            
             # 1. Insert into ApplicationStatusHistory
             history = ApplicationStatusHistory(
+                history_id=id_allocator.next_id(db, "status_history"),
                 application_id=application_id,
                 application_status_id="ASID_APR",  # Using ASID_APR as shown in SQL
                 changed_by=approved_by
@@ -326,6 +412,11 @@ class CRUDAdmin:
         if not application:
             return None
         
+        events.publish(db, [events.status_event(
+            application_id, application.applicant_id, "ASID_REJ", application.application_status_id
+        )])
+        crud_review_queue.release_completed(db, application_ids=[application_id])
+        
         # Update application
         application.application_status_id = "ASID_REJ"
         application.rejection_reason = rejection_reason
@@ -334,6 +425,7 @@ class CRUDAdmin:
         
         # Create status history
         history = ApplicationStatusHistory(
+            history_id=id_allocator.next_id(db, "status_history"),
             application_id=application_id,
             application_status_id="ASID_REJ",
             changed_by=rejected_by
@@ -344,6 +436,36 @@ class CRUDAdmin:
         db.refresh(application)
         return application
     
+    def get_notification_recipients(self, db: Session, *, application_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get applicant contact details for status-change notifications"""
+        if not application_ids:
+            return []
+        
+        rows = db.query(
+            LicenseApplication.application_id,
+            LicenseApplication.rejection_reason,
+            LicenseApplication.additional_requirements,
+            Applicant.email,
+            Applicant.first_name,
+            Applicant.license_number
+        ).join(
+            Applicant, LicenseApplication.applicant_id == Applicant.applicant_id
+        ).filter(
+            LicenseApplication.application_id.in_(application_ids)
+        ).all()
+        
+        return [
+            {
+                "application_id": row.application_id,
+                "email": row.email,
+                "first_name": row.first_name,
+                "license_number": row.license_number,
+                "reason": row.rejection_reason,
+                "additional_requirements": row.additional_requirements
+            }
+            for row in rows
+        ]
+    
     def get_pending_verifications(self, db: Session, skip: int = 0, limit: int = 100) -> List[SubmittedDocument]:
         """Get documents pending verification"""
         return db.query(SubmittedDocument).options(
@@ -361,6 +483,8 @@ class CRUDAdmin:
         is_verified: bool = True
     ) -> int:
         """Bulk verify multiple documents"""
+        events.publish_document_verifications(db, is_verified=is_verified, document_ids=document_ids)
+        crud_review_queue.release_completed(db, document_ids=document_ids)
         count = db.query(SubmittedDocument).filter(
             SubmittedDocument.document_id.in_(document_ids)
         ).update({
@@ -410,24 +534,8 @@ class CRUDAdmin:
         }
     
     def generate_license_number(self, db: Session) -> str:
-        """Generate unique license number in format A12-34-567890"""
-        
-        while True:
-            # Generate format: Letter + 2 digits - 2 digits - 6 digits
-            letter = random.choice(string.ascii_uppercase)
-            first_two = random.randint(10, 99)
-            second_two = random.randint(10, 99)
-            last_six = random.randint(100000, 999999)
-            
-            license_number = f"{letter}{first_two}-{second_two}-{last_six}"
-            
-            # Check if this license number already exists
-            existing = db.query(Applicant).filter(
-                Applicant.license_number == license_number
-            ).first()
-            
-            if not existing:
-                return license_number
+        """Allocate a unique license number in format A12-34-567890"""
+        return license_number_allocator.allocate(db)
 
 # Create instance
 crud_admin = CRUDAdmin() 
\ No newline at end of file
@@ -1,12 +1,23 @@
 # app/crud/analytics.py
 from typing import Dict, List, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract
+from sqlalchemy import func, and_, case, extract
 from datetime import datetime, date, timedelta
 from app.models.applicant import Applicant
 from app.models.application import LicenseApplication, ApplicationType
 from app.models.appointment import Appointment
 
+# Status -> dashboard counter it is counted under (also used for live dashboard deltas)
+DASHBOARD_STATUS_COUNTERS = {
+    "ASID_PEN": "pending_applications",
+    "ASID_REV": "pending_applications",
+    "ASID_APR": "approved_applications",
+    "ASID_REJ": "rejected_applications",
+}
+
+def _status_ids(counter: str) -> List[str]:
+    return [status_id for status_id, name in DASHBOARD_STATUS_COUNTERS.items() if name == counter]
+
 class CRUDAnalytics:
     """Analytics and reporting operations"""
     
@@ -17,24 +28,27 @@ class CRUDAnalytics:
         total_applications = db.query(LicenseApplication).count()
         
         pending_applications = db.query(LicenseApplication).filter(
-            LicenseApplication.application_status_id.in_(["ASID_PEN", "ASID_REV"])
+            LicenseApplication.application_status_id.in_(_status_ids("pending_applications"))
         ).count()
         
         approved_applications = db.query(LicenseApplication).filter(
-            LicenseApplication.application_status_id == "ASID_APP"
+            LicenseApplication.application_status_id.in_(_status_ids("approved_applications"))
         ).count()
         
         rejected_applications = db.query(LicenseApplication).filter(
-            LicenseApplication.application_status_id == "ASID_REJ"
+            LicenseApplication.application_status_id.in_(_status_ids("rejected_applications"))
         ).count()
         
         # Applicant statistics
         total_applicants = db.query(Applicant).count()
         
-        # Time-based statistics
+        # Time-based statistics (plain ranges on submission_date, so only current partitions are read)
         today = date.today()
         applications_today = db.query(LicenseApplication).filter(
-            func.date(LicenseApplication.submission_date) == today
+            and_(
+                LicenseApplication.submission_date >= today,
+                LicenseApplication.submission_date < today + timedelta(days=1)
+            )
         ).count()
         
         start_of_month = today.replace(day=1)
@@ -73,8 +87,8 @@ class CRUDAnalytics:
             func.count(LicenseApplication.application_id).label('count')
         ).filter(
             and_(
-                func.date(LicenseApplication.submission_date) >= start_date,
-                func.date(LicenseApplication.submission_date) <= end_date
+                LicenseApplication.submission_date >= start_date,
+                LicenseApplication.submission_date < end_date + timedelta(days=1)
             )
         ).group_by(
             func.date(LicenseApplication.submission_date)
@@ -134,19 +148,17 @@ class CRUDAnalytics:
             extract('month', LicenseApplication.submission_date).label('month'),
             func.count(LicenseApplication.application_id).label('total'),
             func.sum(
-                func.case(
-                    [(LicenseApplication.application_status_id == "ASID_APP", 1)],
-                    else_=0
-                )
+                case((LicenseApplication.application_status_id.in_(_status_ids("approved_applications")), 1), else_=0)
             ).label('approved'),
             func.sum(
-                func.case(
-                    [(LicenseApplication.application_status_id == "ASID_REJ", 1)],
-                    else_=0
-                )
+                case((LicenseApplication.application_status_id == "ASID_REJ", 1), else_=0)
             ).label('rejected')
         ).filter(
-            extract('year', LicenseApplication.submission_date) == year
+            # A range rather than extract('year', ...) so the planner prunes to that year's partitions
+            and_(
+                LicenseApplication.submission_date >= date(year, 1, 1),
+                LicenseApplication.submission_date < date(year + 1, 1, 1)
+            )
         ).group_by(
             extract('month', LicenseApplication.submission_date)
         ).order_by('month').all()
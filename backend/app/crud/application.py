@@ -1,6 +1,7 @@
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_
+from sqlalchemy import desc, and_, text
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 from app.crud.base import CRUDBase
 from app.models.application import (
@@ -14,6 +15,42 @@ from app.schemas.application import (
     LicenseApplicationCreate, 
     LicenseApplicationUpdate
 )
+from app.utils.id_allocation import id_allocator
+
+# An applicant has at most one application of each type in these statuses,
+# enforced by licenseapplication_active (alembic revision 0008)
+ACTIVE_STATUS_IDS = ["ASID_PEN", "ASID_SFA", "ASID_RSB"]
+ACTIVE_APPLICATION_CONSTRAINT = "licenseapplication_active_pkey"
+
+# What the submission rules need about one applicant and type, in one round
+# trip: the active application (primary key lookup), whether one was ever
+# approved, the latest application with its status, and the applicant's total
+SUBMISSION_STATE_SQL = text("""
+SELECT
+    active.application_id AS active_application_id,
+    EXISTS (
+        SELECT 1 FROM licenseapplication
+        WHERE applicant_id = :applicant_id AND application_type_id = :application_type_id
+          AND application_status_id = 'ASID_APR'
+    ) AS has_approved,
+    latest.application_id AS latest_application_id,
+    latest.application_status_id AS latest_status_id,
+    (SELECT count(*) FROM licenseapplication WHERE applicant_id = :applicant_id) AS application_count
+FROM (SELECT 1) AS one
+LEFT JOIN licenseapplication_active active
+    ON active.applicant_id = :applicant_id AND active.application_type_id = :application_type_id
+LEFT JOIN LATERAL (
+    SELECT application_id, application_status_id FROM licenseapplication
+    WHERE applicant_id = :applicant_id AND application_type_id = :application_type_id
+    ORDER BY submission_date DESC
+    LIMIT 1
+) latest ON true
+""")
+
+def is_active_application_conflict(error: IntegrityError) -> bool:
+    """Whether `error` is a second active application of the same applicant and type"""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == ACTIVE_APPLICATION_CONSTRAINT
 
 class CRUDLicenseApplication(CRUDBase[LicenseApplication, LicenseApplicationCreate, LicenseApplicationUpdate]):
     def get_by_id(self, db: Session, *, application_id: str) -> Optional[LicenseApplication]:
@@ -24,6 +61,15 @@ class CRUDLicenseApplication(CRUDBase[LicenseApplication, LicenseApplicationCrea
             joinedload(LicenseApplication.vehicle_categories)
         ).filter(LicenseApplication.application_id == application_id).first()
     
+    def get_owner_ids(self, db: Session, *, application_ids: List[str]) -> Dict[str, str]:
+        """Map application_id -> applicant_id, reading only those two columns"""
+        if not application_ids:
+            return {}
+        rows = db.query(LicenseApplication.application_id, LicenseApplication.applicant_id).filter(
+            LicenseApplication.application_id.in_(application_ids)
+        ).all()
+        return {row.application_id: row.applicant_id for row in rows}
+    
     def get_by_applicant(self, db: Session, *, applicant_id: str, skip: int = 0, limit: int = 100) -> List[LicenseApplication]:
         return db.query(LicenseApplication).options(
             joinedload(LicenseApplication.application_type),
@@ -32,6 +78,21 @@ class CRUDLicenseApplication(CRUDBase[LicenseApplication, LicenseApplicationCrea
             LicenseApplication.applicant_id == applicant_id
         ).order_by(desc(LicenseApplication.submission_date)).offset(skip).limit(limit).all()
     
+    def count_by_applicant(self, db: Session, *, applicant_id: str) -> int:
+        return db.query(LicenseApplication).filter(LicenseApplication.applicant_id == applicant_id).count()
+    
+    def get_submission_state(self, db: Session, *, applicant_id: str, application_type_id: str) -> Dict[str, Any]:
+        """
+        active_application_id, has_approved, latest_application_id and
+        latest_status_id for the applicant's applications of one type, plus
+        the applicant's application_count
+        """
+        row = db.execute(SUBMISSION_STATE_SQL, {
+            "applicant_id": applicant_id,
+            "application_type_id": application_type_id,
+        }).one()
+        return dict(row._mapping)
+    
     def get_by_status(self, db: Session, *, status_id: str, skip: int = 0, limit: int = 100) -> List[LicenseApplication]:
         return db.query(LicenseApplication).options(
             joinedload(LicenseApplication.applicant),
@@ -102,6 +163,7 @@ class CRUDLicenseApplication(CRUDBase[LicenseApplication, LicenseApplicationCrea
         # Create status history record
         from app.models.application import ApplicationStatusHistory
         history = ApplicationStatusHistory(
+            history_id=id_allocator.next_id(db, "status_history"),
             application_id=application_id,
             application_status_id=new_status_id,
             changed_by=changed_by
@@ -0,0 +1,184 @@
+# app/crud/application_detail.py
+"""
+Everything an admin reviews about one application, as one document
+(GET /admin/applications/{application_id}/detail).
+
+The application graph (applicant with family, employment, emergency
+contacts and donations; documents, vehicle categories, conditions, driving
+skills, appointments and status history) is loaded with one query per
+relationship (selectinload) and flattened into JSON-ready dicts.
+
+Documents are kept in a per-process LRU cache of APPLICATION_DETAIL_CACHE_SIZE
+applications, keyed by application id and a version read in one statement:
+the application's last_updated_date plus, for the application row and every
+table in the graph, the row count and newest row version (xmin). Uploads,
+verifications, appointments and profile edits change the version without
+touching last_updated_date, so a cached document is never served stale.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.crud.archive import row_to_dict
+from app.models.applicant import Applicant
+from app.models.application import ApplicationStatusHistory, ApplicationVehicleCategory, LicenseApplication
+from app.models.appointment import Appointment
+from app.models.donation import Donation, DonationOrgan
+from app.models.license_condition import LicenseCondition
+
+# Tables of the graph besides licenseapplication and applicant, with the rows
+# that belong to application `l`
+DETAIL_TABLES = {
+    "applicationstatushistory": "application_id = l.application_id",
+    "applicationvehiclecategory": "application_id = l.application_id",
+    "submitteddocuments": "application_id = l.application_id",
+    "appointment": "application_id = l.application_id",
+    "licensecondition": "application_id = l.application_id",
+    "drivingskill": "application_id = l.application_id",
+    "familyinformation": "applicant_id = l.applicant_id",
+    "employment": "applicant_id = l.applicant_id",
+    "emergencycontact": "applicant_id = l.applicant_id",
+    "donation": "applicant_id = l.applicant_id",
+    "donationorgan": "donation_id IN (SELECT donation_id FROM donation WHERE applicant_id = l.applicant_id)",
+}
+
+DETAIL_VERSION_SQL = text(f"""
+SELECT l.last_updated_date, concat_ws(',', l.xmin, a.xmin, {", ".join(
+    f"(SELECT count(*) || '/' || coalesce(max(xmin::text::bigint), 0) FROM {table} WHERE {rows})"
+    for table, rows in DETAIL_TABLES.items()
+)}) AS rows_version
+FROM licenseapplication l
+LEFT JOIN applicant a ON a.applicant_id = l.applicant_id
+WHERE l.application_id = :application_id
+""")
+
+class LRUCache:
+    """Thread-safe mapping that drops the least recently used entry beyond `maxsize`"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+def _with(obj: Any, **related: Any) -> Dict[str, Any]:
+    """Row of `obj` with related rows nested under their relationship names"""
+    return {**row_to_dict(obj), **related}
+
+def _row(obj: Any) -> Optional[Dict[str, Any]]:
+    return row_to_dict(obj) if obj is not None else None
+
+def application_detail(application: LicenseApplication) -> Dict[str, Any]:
+    """The denormalized detail document of a fully loaded application"""
+    applicant = application.applicant
+    return _with(
+        application,
+        application_type=_row(application.application_type),
+        status=_row(application.status),
+        applicant=_with(
+            applicant,
+            family_information=[row_to_dict(row) for row in applicant.family_information],
+            employment=[row_to_dict(row) for row in applicant.employment],
+            emergency_contacts=[row_to_dict(row) for row in applicant.emergency_contacts],
+            donations=[
+                _with(donation, organs=[_row(row.organ) for row in donation.donation_organs])
+                for donation in applicant.donations
+            ],
+        ) if applicant else None,
+        submitted_documents=sorted(
+            (row_to_dict(row) for row in application.submitted_documents),
+            key=lambda row: row["uploaded_at"] or ""
+        ),
+        vehicle_categories=[
+            _with(row, vehicle_category=_row(row.vehicle_category)) for row in application.vehicle_categories
+        ],
+        license_conditions=[
+            _with(row, condition_type=_row(row.condition_type)) for row in application.license_conditions
+        ],
+        driving_skills=[row_to_dict(row) for row in application.driving_skills],
+        appointments=[
+            _with(row, location=_row(row.location))
+            for row in sorted(application.appointments, key=lambda row: (row.appointment_date, row.appointment_time))
+        ],
+        status_history=[
+            _with(row, status=_row(row.status))
+            for row in sorted(application.status_history, key=lambda row: row.status_change_date)
+        ],
+    )
+
+class CRUDApplicationDetail:
+    def __init__(self, cache_size: int):
+        self.cache = LRUCache(cache_size)
+
+    def get_version(self, db: Session, *, application_id: str) -> Optional[Tuple[Any, str]]:
+        """(last_updated_date, rows_version) of the application, None if it does not exist"""
+        row = db.execute(DETAIL_VERSION_SQL, {"application_id": application_id}).first()
+        return (row.last_updated_date, row.rows_version) if row else None
+
+    def load(self, db: Session, *, application_id: str) -> Optional[Dict[str, Any]]:
+        """Load the application graph (one query per relationship) and flatten it"""
+        application = db.query(LicenseApplication).options(
+            joinedload(LicenseApplication.application_type),
+            joinedload(LicenseApplication.status),
+            joinedload(LicenseApplication.applicant).options(
+                selectinload(Applicant.family_information),
+                selectinload(Applicant.employment),
+                selectinload(Applicant.emergency_contacts),
+                selectinload(Applicant.donations).selectinload(Donation.donation_organs).joinedload(DonationOrgan.organ)
+            ),
+            selectinload(LicenseApplication.submitted_documents),
+            selectinload(LicenseApplication.vehicle_categories).joinedload(ApplicationVehicleCategory.vehicle_category),
+            selectinload(LicenseApplication.license_conditions).joinedload(LicenseCondition.condition_type),
+            selectinload(LicenseApplication.driving_skills),
+            selectinload(LicenseApplication.appointments).joinedload(Appointment.location),
+            selectinload(LicenseApplication.status_history).joinedload(ApplicationStatusHistory.status)
+        ).filter(LicenseApplication.application_id == application_id).first()
+        return application_detail(application) if application else None
+
+    def get(self, db: Session, *, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The application's detail document: from the cache when its version is
+        unchanged (one statement), otherwise loaded and cached
+        """
+        version = self.get_version(db, application_id=application_id)
+        if version is None:
+            return None
+
+        cached = self.cache.get(application_id)
+        hit = cached is not None and cached[0] == version
+        record_cache_lookup("application_detail", hit)
+        if hit:
+            return cached[1]
+
+        detail = self.load(db, application_id=application_id)
+        if detail is not None:
+            # Read before loading, so a concurrent change only makes the next request reload
+            self.cache.put(application_id, (version, detail))
+        return detail
+
+# Global instance
+crud_application_detail = CRUDApplicationDetail(settings.APPLICATION_DETAIL_CACHE_SIZE)
@@ -1,11 +1,13 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, desc
 from datetime import date, datetime, timedelta, time
 from fastapi.encoders import jsonable_encoder
 from app.crud.base import CRUDBase
 from app.models.appointment import Appointment
+from app.models.application import LicenseApplication
 from app.schemas.appointment import AppointmentCreate, AppointmentUpdate
+from app.utils.id_allocation import id_allocator
 
 class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate]):
     def create(self, db: Session, *, obj_in: AppointmentCreate) -> Appointment:
@@ -13,6 +15,7 @@ class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate
         obj_in_data = jsonable_encoder(obj_in)
         # Set default status for new appointments
         obj_in_data['status'] = 'Scheduled'
+        obj_in_data['appointment_id'] = id_allocator.next_id(db, "appointment")
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         db.commit()
@@ -25,6 +28,15 @@ class CRUDAppointment(CRUDBase[Appointment, AppointmentCreate, AppointmentUpdate
             joinedload(Appointment.location)
         ).filter(Appointment.appointment_id == appointment_id).first()
     
+    def get_with_owner(self, db: Session, *, appointment_id: str) -> Optional[Tuple[Appointment, str]]:
+        """Appointment (with its location) plus the applicant_id of its application"""
+        row = db.query(Appointment, LicenseApplication.applicant_id).options(
+            joinedload(Appointment.location)
+        ).join(
+            LicenseApplication, LicenseApplication.application_id == Appointment.application_id
+        ).filter(Appointment.appointment_id == appointment_id).first()
+        return (row[0], row[1]) if row else None
+    
     def get_by_application(self, db: Session, *, application_id: str) -> List[Appointment]:
         return db.query(Appointment).options(
             joinedload(Appointment.location)
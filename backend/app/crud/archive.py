@@ -0,0 +1,123 @@
+# app/crud/archive.py
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import desc, insert, inspect, text
+from sqlalchemy.orm import Session, selectinload, undefer
+from app.crud.base import CRUDBase
+from app.models.application import LicenseApplication
+from app.models.archived import ArchivedApplication
+
+# Applications in these statuses never change again and may be archived
+FINALIZED_STATUS_IDS = ["ASID_APR", "ASID_REJ"]
+
+# Child rows archived with each application (LicenseApplication relationships)
+ARCHIVED_RELATIONSHIPS = [
+    "status_history",
+    "vehicle_categories",
+    "submitted_documents",
+    "appointments",
+    "license_conditions",
+    "driving_skills",
+]
+
+# Stub columns copied from the application into archivedapplications
+STUB_COLUMNS = [
+    "application_id",
+    "applicant_id",
+    "application_type_id",
+    "application_status_id",
+    "submission_date",
+    "last_updated_date",
+    "rejection_reason",
+    "additional_requirements",
+]
+
+GRAPH_VERSION = 1
+
+def row_to_dict(obj: Any) -> Dict[str, Any]:
+    """Column values of an ORM row, JSON-ready"""
+    return jsonable_encoder({attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs})
+
+def application_graph(application: LicenseApplication) -> Dict[str, Any]:
+    graph = {"version": GRAPH_VERSION, "application": row_to_dict(application)}
+    for name in ARCHIVED_RELATIONSHIPS:
+        graph[name] = [row_to_dict(child) for child in getattr(application, name)]
+    return graph
+
+class CRUDArchive(CRUDBase[ArchivedApplication, None, None]):
+    def archive_batch(
+        self,
+        db: Session,
+        *,
+        finalized_before: datetime,
+        batch_size: int,
+        lock_timeout_ms: int = 2000
+    ) -> List[str]:
+        """
+        Move up to `batch_size` applications finalized before `finalized_before`
+        into archivedapplications, child rows included, in one transaction.
+        Rows locked by users or another archiver are skipped, and waiting on any
+        other lock gives up after `lock_timeout_ms`. Returns the archived ids.
+        """
+        db.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+
+        application_ids = [row.application_id for row in db.query(LicenseApplication.application_id).filter(
+            LicenseApplication.application_status_id.in_(FINALIZED_STATUS_IDS),
+            LicenseApplication.last_updated_date < finalized_before
+        ).order_by(LicenseApplication.submission_date).limit(batch_size).with_for_update(skip_locked=True).all()]
+        if not application_ids:
+            db.rollback()
+            return []
+
+        applications = db.query(LicenseApplication).options(
+            *[selectinload(getattr(LicenseApplication, name)) for name in ARCHIVED_RELATIONSHIPS]
+        ).filter(LicenseApplication.application_id.in_(application_ids)).all()
+
+        db.execute(insert(ArchivedApplication), [
+            {
+                **{column: getattr(application, column) for column in STUB_COLUMNS},
+                "application_graph": application_graph(application)
+            }
+            for application in applications
+        ])
+
+        # Children first, the applications last (foreign keys)
+        mapper = inspect(LicenseApplication)
+        for name in ARCHIVED_RELATIONSHIPS:
+            child = mapper.relationships[name].mapper.class_
+            db.query(child).filter(child.application_id.in_(application_ids)).delete(synchronize_session=False)
+        db.query(LicenseApplication).filter(
+            LicenseApplication.application_id.in_(application_ids)
+        ).delete(synchronize_session=False)
+
+        db.commit()
+        return application_ids
+
+    def get_by_application_id(self, db: Session, *, application_id: str) -> Optional[ArchivedApplication]:
+        """Archived stub with its full application graph"""
+        return db.query(ArchivedApplication).options(
+            undefer(ArchivedApplication.application_graph)
+        ).filter(ArchivedApplication.application_id == application_id).first()
+
+    def get_multi_filtered(
+        self,
+        db: Session,
+        *,
+        applicant_id: Optional[str] = None,
+        status_filter: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[ArchivedApplication], int]:
+        """Archived stubs, newest submission first, with the total count"""
+        query = db.query(ArchivedApplication)
+        if applicant_id:
+            query = query.filter(ArchivedApplication.applicant_id == applicant_id)
+        if status_filter:
+            query = query.filter(ArchivedApplication.application_status_id == status_filter)
+
+        total = query.count()
+        items = query.order_by(desc(ArchivedApplication.submission_date)).offset(skip).limit(limit).all()
+        return items, total
+
+crud_archive = CRUDArchive(ArchivedApplication)
@@ -0,0 +1,265 @@
+# app/crud/bulk_import.py
+import io
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud.application import ACTIVE_STATUS_IDS
+from app.models.application import ApplicationStatus, ApplicationType
+from app.models.vehicle import VehicleCategory
+from app.schemas.application import PersonalInfo
+from app.utils.id_allocation import id_allocator
+
+# Applicant columns set from PersonalInfo
+PERSONAL_FIELDS = list(PersonalInfo.model_fields)
+
+# Staging tables live until the chunk's transaction ends. Their column order
+# matches the row tuples built in CRUDBulkImport._stage.
+STAGING_TABLES_SQL = f"""
+CREATE TEMP TABLE import_applicant ON COMMIT DROP AS
+    SELECT NULL::integer AS line, applicant_id, uuid, email, {", ".join(PERSONAL_FIELDS)} FROM applicant WITH NO DATA;
+CREATE TEMP TABLE import_application ON COMMIT DROP AS
+    SELECT NULL::integer AS line, NULL::text AS email, application_id, application_type_id,
+           application_status_id, additional_requirements, submission_date,
+           NULL::text AS history_id, NULL::text AS acquisition_type
+    FROM licenseapplication WITH NO DATA;
+CREATE TEMP TABLE import_vehicle ON COMMIT DROP AS
+    SELECT app_vehicle_id, application_id, category_id, clutch_type FROM applicationvehiclecategory WITH NO DATA;
+CREATE TEMP TABLE import_emergency ON COMMIT DROP AS
+    SELECT NULL::integer AS line, NULL::text AS email, ec_name, ec_address, ec_contact_no
+    FROM emergencycontact WITH NO DATA;
+CREATE TEMP TABLE import_employment ON COMMIT DROP AS
+    SELECT NULL::integer AS line, NULL::text AS email, employer_name, employer_tel_no, employer_address
+    FROM employment WITH NO DATA;
+CREATE TEMP TABLE import_family ON COMMIT DROP AS
+    SELECT NULL::integer AS line, NULL::text AS email, relation_type, family_name, first_name, middle_name, is_deceased
+    FROM familyinformation WITH NO DATA;
+"""
+
+# Active records that would give an applicant a second active application of
+# a type (licenseapplication_active allows one): against the database, or an
+# earlier line of the chunk. Runs before the merge, so nothing of them is kept.
+REJECT_ACTIVE_DUPLICATES_SQL = text("""
+DELETE FROM import_application s
+WHERE s.application_status_id = ANY(:active_status_ids) AND (
+    EXISTS (
+        SELECT 1 FROM licenseapplication_active x JOIN applicant a ON a.applicant_id = x.applicant_id
+        WHERE a.email = s.email AND x.application_type_id = s.application_type_id
+    )
+    OR EXISTS (
+        SELECT 1 FROM import_application o
+        WHERE o.email = s.email AND o.application_type_id = s.application_type_id
+          AND o.application_status_id = ANY(:active_status_ids) AND o.line < s.line
+    )
+)
+RETURNING s.line
+""")
+
+DROP_STAGED_LINES_SQL = [
+    text(f"DELETE FROM {table} WHERE line = ANY(:lines)")
+    for table in ("import_applicant", "import_emergency", "import_employment", "import_family")
+]
+
+# New applicants need an auth user: applicant.uuid references auth.users(id).
+# Records without a uuid take the auth user with their email.
+RESOLVE_AUTH_USERS_SQL = text("""
+UPDATE import_applicant s SET uuid = u.id
+FROM auth.users u
+WHERE s.uuid IS NULL AND lower(u.email) = lower(s.email)
+""")
+
+def _reject_without_auth_user_sql(with_auth_users: bool):
+    """Records of new applicants without an auth user (without auth.users: without a uuid)"""
+    auth_join = "JOIN auth.users u ON u.id = i.uuid" if with_auth_users else ""
+    return text(f"""
+    DELETE FROM import_application s
+    WHERE NOT EXISTS (SELECT 1 FROM applicant a WHERE a.email = s.email)
+      AND NOT EXISTS (SELECT 1 FROM import_applicant i {auth_join} WHERE i.line = s.line AND i.uuid IS NOT NULL)
+    RETURNING s.line
+    """)
+
+REJECT_WITHOUT_AUTH_USER_SQL = {
+    with_auth_users: _reject_without_auth_user_sql(with_auth_users) for with_auth_users in (True, False)
+}
+
+# Last record wins when an email appears more than once in a chunk
+_LATEST_APPLICANTS = "(SELECT DISTINCT ON (email) * FROM import_applicant ORDER BY email, line DESC)"
+
+# Existing applicants (matched by email like submit-complete) get the imported
+# personal details; fields missing from the record keep their current value
+UPDATE_APPLICANTS_SQL = text(f"""
+UPDATE applicant a SET
+    {", ".join(f"{field} = COALESCE(s.{field}, a.{field})" for field in PERSONAL_FIELDS)},
+    last_updated_date = now()
+FROM {_LATEST_APPLICANTS} s
+WHERE a.email = s.email
+""")
+
+# applicant_id comes from id_allocator: the column default's lpad(..., 3)
+# truncates values above 999 into ids that already exist
+INSERT_APPLICANTS_SQL = text(f"""
+INSERT INTO applicant (applicant_id, uuid, email, {", ".join(PERSONAL_FIELDS)})
+SELECT applicant_id, uuid, email, {", ".join(PERSONAL_FIELDS)} FROM {_LATEST_APPLICANTS} s
+ON CONFLICT DO NOTHING
+""")
+
+# Records whose applicant could not be inserted (the uuid belongs to another email)
+REJECT_ORPHANS_SQL = text("""
+DELETE FROM import_application s
+WHERE NOT EXISTS (SELECT 1 FROM applicant a WHERE a.email = s.email)
+RETURNING s.line
+""")
+
+INSERT_APPLICATIONS_SQL = text("""
+INSERT INTO licenseapplication (
+    application_id, applicant_id, application_type_id, application_status_id,
+    additional_requirements, submission_date, last_updated_date
+)
+SELECT s.application_id, a.applicant_id, s.application_type_id, s.application_status_id,
+       s.additional_requirements, COALESCE(s.submission_date, now()), COALESCE(s.submission_date, now())
+FROM import_application s JOIN applicant a ON a.email = s.email
+""")
+
+INSERT_CHILD_ROWS_SQL = [
+    text("""
+    INSERT INTO applicationstatushistory (history_id, application_id, application_status_id, changed_by, status_change_date)
+    SELECT s.history_id, s.application_id, s.application_status_id, a.applicant_id, COALESCE(s.submission_date, now())
+    FROM import_application s JOIN applicant a ON a.email = s.email
+    """),
+    text("""
+    INSERT INTO applicationvehiclecategory (app_vehicle_id, application_id, category_id, clutch_type)
+    SELECT v.app_vehicle_id, v.application_id, v.category_id, v.clutch_type
+    FROM import_vehicle v JOIN import_application s ON s.application_id = v.application_id
+    """),
+    text("""
+    INSERT INTO drivingskill (application_id, acquisition_type)
+    SELECT application_id, acquisition_type FROM import_application
+    """),
+    text("""
+    INSERT INTO emergencycontact (applicant_id, ec_name, ec_address, ec_contact_no)
+    SELECT a.applicant_id, s.ec_name, s.ec_address, s.ec_contact_no
+    FROM import_emergency s JOIN applicant a ON a.email = s.email ORDER BY s.line
+    """),
+    text("""
+    INSERT INTO employment (applicant_id, employer_name, employer_tel_no, employer_address)
+    SELECT a.applicant_id, s.employer_name, s.employer_tel_no, s.employer_address
+    FROM import_employment s JOIN applicant a ON a.email = s.email ORDER BY s.line
+    """),
+    text("""
+    INSERT INTO familyinformation (applicant_id, relation_type, family_name, first_name, middle_name, is_deceased)
+    SELECT a.applicant_id, s.relation_type, s.family_name, s.first_name, s.middle_name, s.is_deceased
+    FROM import_family s JOIN applicant a ON a.email = s.email ORDER BY s.line
+    """),
+]
+
+def _copy_value(value: Any) -> str:
+    """One field in COPY text format"""
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def copy_rows(
+    db: Session,
+    table: str,
+    rows: Iterable[Sequence[Any]],
+    columns: Optional[Sequence[str]] = None
+) -> None:
+    """COPY `rows` (values in `columns` order, or the table's) into `table` on the session's connection"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    if not buffer.tell():
+        return
+    buffer.seek(0)
+    # COPY FROM STDIN needs the driver's cursor (psycopg2)
+    cursor = db.connection().connection.cursor()
+    try:
+        column_list = f" ({', '.join(columns)})" if columns else ""
+        cursor.copy_expert(f"COPY {table}{column_list} FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+class CRUDBulkImport:
+    def get_reference_ids(self, db: Session) -> Dict[str, Set[str]]:
+        """Ids that imported records may refer to"""
+        return {
+            "application_types": {row[0] for row in db.query(ApplicationType.application_type_id)},
+            "application_statuses": {row[0] for row in db.query(ApplicationStatus.application_status_id)},
+            "vehicle_categories": {row[0] for row in db.query(VehicleCategory.category_id)},
+        }
+
+    def has_auth_users(self, db: Session) -> bool:
+        """Whether the database has Supabase's auth.users (and applicant.uuid its foreign key)"""
+        return bool(db.execute(text("SELECT to_regclass('auth.users')")).scalar())
+
+    def _stage(self, db: Session, records: List[Dict[str, Any]]) -> None:
+        # Records of existing applicants leave their applicant id unused
+        applicant_ids = id_allocator.allocate(db, "applicant", len(records))
+        application_ids = id_allocator.allocate(db, "application", len(records))
+        history_ids = id_allocator.allocate(db, "status_history", len(records))
+        vehicle_ids = iter(id_allocator.allocate(
+            db, "application_vehicle", sum(len(record["vehicles"]) for record in records)
+        ))
+
+        applicants, applications, vehicles, emergency, employment, family = [], [], [], [], [], []
+        for record, applicant_id, application_id, history_id in zip(records, applicant_ids, application_ids, history_ids):
+            line, email = record["line"], record["email"]
+            applicants.append((line, applicant_id, record["uuid"], email, *record["personal_info"]))
+            applications.append((line, email, application_id, *record["application"], history_id, record["acquisition_type"]))
+            vehicles.extend((next(vehicle_ids), application_id, *vehicle) for vehicle in record["vehicles"])
+            emergency.extend((line, email, *row) for row in record["emergency_contacts"])
+            employment.extend((line, email, *row) for row in record["employment"])
+            family.extend((line, email, *row) for row in record["family"])
+
+        db.execute(text(STAGING_TABLES_SQL))
+        copy_rows(db, "import_applicant", applicants)
+        copy_rows(db, "import_application", applications)
+        copy_rows(db, "import_vehicle", vehicles)
+        copy_rows(db, "import_emergency", emergency)
+        copy_rows(db, "import_employment", employment)
+        copy_rows(db, "import_family", family)
+
+    def load_chunk(
+        self, db: Session, *, records: List[Dict[str, Any]], with_auth_users: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load validated records (see app/utils/bulk_import.py) in one transaction:
+        COPY into staging tables, then merge them into the real tables with one
+        statement per table. Returns the number of applications imported and
+        the lines rejected because the applicant already has an active
+        application of that type (active_conflict_lines), because a new
+        applicant has no auth user (no_auth_user_lines) or because their
+        applicant could not be created (rejected_lines).
+        """
+        if not records:
+            return {"imported": 0, "rejected_lines": [], "active_conflict_lines": [], "no_auth_user_lines": []}
+
+        self._stage(db, records)
+        active_conflict_lines = sorted(
+            row[0] for row in db.execute(REJECT_ACTIVE_DUPLICATES_SQL, {"active_status_ids": ACTIVE_STATUS_IDS})
+        )
+        if with_auth_users:
+            db.execute(RESOLVE_AUTH_USERS_SQL)
+        no_auth_user_lines = sorted(row[0] for row in db.execute(REJECT_WITHOUT_AUTH_USER_SQL[with_auth_users]))
+        dropped_lines = active_conflict_lines + no_auth_user_lines
+        if dropped_lines:
+            for statement in DROP_STAGED_LINES_SQL:
+                db.execute(statement, {"lines": dropped_lines})
+        db.execute(UPDATE_APPLICANTS_SQL)
+        db.execute(INSERT_APPLICANTS_SQL)
+        rejected_lines = sorted(row[0] for row in db.execute(REJECT_ORPHANS_SQL))
+        imported = db.execute(INSERT_APPLICATIONS_SQL).rowcount
+        for statement in INSERT_CHILD_ROWS_SQL:
+            db.execute(statement)
+        db.commit()
+        return {
+            "imported": imported,
+            "rejected_lines": rejected_lines,
+            "active_conflict_lines": active_conflict_lines,
+            "no_auth_user_lines": no_auth_user_lines,
+        }
+
+# Global instance
+crud_bulk_import = CRUDBulkImport()
@@ -1,10 +1,18 @@
 # app/crud/document.py
-from typing import Optional, List
+from typing import Dict, Optional, List, Sequence, Tuple
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, func
+from app.core.config import settings
 from app.crud.base import CRUDBase
 from app.models.document import SubmittedDocument
-from app.schemas.document import DocumentUpload, DocumentCreate
+from app.models.application import LicenseApplication
+from app.schemas.document import DocumentUpload, DocumentCreate, DocumentCompleteness, RequiredDocumentCount
+from app.crud.review_queue import crud_review_queue
+from app.utils import events
+
+def required_documents(type_category: Optional[str]) -> List[str]:
+    """Document types an application of `type_category` needs (those of New when unknown)"""
+    return settings.REQUIRED_DOCUMENTS.get(type_category) or settings.REQUIRED_DOCUMENTS.get("New", [])
 
 class CRUDDocument(CRUDBase[SubmittedDocument, DocumentCreate, None]):
     def get_by_id(self, db: Session, *, document_id: str) -> Optional[SubmittedDocument]:
@@ -12,6 +20,13 @@ class CRUDDocument(CRUDBase[SubmittedDocument, DocumentCreate, None]):
             joinedload(SubmittedDocument.application)
         ).filter(SubmittedDocument.document_id == document_id).first()
     
+    def get_with_owner(self, db: Session, *, document_id: str) -> Optional[Tuple[SubmittedDocument, str]]:
+        """Document plus the applicant_id of its application, without loading the application"""
+        row = db.query(SubmittedDocument, LicenseApplication.applicant_id).join(
+            LicenseApplication, LicenseApplication.application_id == SubmittedDocument.application_id
+        ).filter(SubmittedDocument.document_id == document_id).first()
+        return (row[0], row[1]) if row else None
+    
     def get_by_application(self, db: Session, *, application_id: str) -> List[SubmittedDocument]:
         return db.query(SubmittedDocument).filter(
             SubmittedDocument.application_id == application_id
@@ -45,6 +60,8 @@ class CRUDDocument(CRUDBase[SubmittedDocument, DocumentCreate, None]):
         if not document:
             return None
         
+        events.publish_document_verifications(db, is_verified=is_verified, document_ids=[document_id])
+        crud_review_queue.release_completed(db, document_ids=[document_id])
         document.is_verified = is_verified
         document.verified_by = verified_by
         
@@ -52,12 +69,15 @@ class CRUDDocument(CRUDBase[SubmittedDocument, DocumentCreate, None]):
         db.refresh(document)
         return document
     
-    def get_required_documents_status(self, db: Session, *, application_id: str) -> dict:
+    def get_required_documents_status(
+        self,
+        db: Session,
+        *,
+        application_id: str,
+        type_category: Optional[str] = None
+    ) -> dict:
         """Get status of all required documents for an application"""
-        required_docs = [
-            "Birth Certificate", "Residence Certificate", "Medical Certificate",
-            "Drug Test Result", "Driving Course Certificate", "Valid ID", "Passport Photo"
-        ]
+        required_docs = required_documents(type_category)
         
         submitted_docs = self.get_by_application(db, application_id=application_id)
         doc_status = {}
@@ -71,5 +91,61 @@ class CRUDDocument(CRUDBase[SubmittedDocument, DocumentCreate, None]):
             }
         
         return doc_status
+    
+    def get_completeness(
+        self,
+        db: Session,
+        *,
+        type_categories: Dict[str, Optional[str]]
+    ) -> Dict[str, DocumentCompleteness]:
+        """
+        Required-document completeness of many applications (application_id ->
+        type category) from one grouped query over their documents
+        """
+        if not type_categories:
+            return {}
+        required = {
+            application_id: required_documents(type_category)
+            for application_id, type_category in type_categories.items()
+        }
+        counts: Dict[Tuple[str, str], RequiredDocumentCount] = {}
+        rows = db.query(
+            SubmittedDocument.application_id,
+            SubmittedDocument.document_type,
+            func.count().label("submitted"),
+            func.count().filter(SubmittedDocument.is_verified.is_(True)).label("verified")
+        ).filter(
+            SubmittedDocument.application_id.in_(list(required)),
+            SubmittedDocument.document_type.in_(sorted({doc_type for doc_types in required.values() for doc_type in doc_types}))
+        ).group_by(SubmittedDocument.application_id, SubmittedDocument.document_type).all()
+        for row in rows:
+            counts[(row.application_id, row.document_type)] = RequiredDocumentCount(
+                submitted=row.submitted, verified=row.verified
+            )
+        
+        completeness = {}
+        for application_id, doc_types in required.items():
+            documents = {
+                doc_type: counts.get((application_id, doc_type)) or RequiredDocumentCount()
+                for doc_type in doc_types
+            }
+            verified = sum(1 for count in documents.values() if count.verified)
+            completeness[application_id] = DocumentCompleteness(
+                required=len(doc_types),
+                submitted=sum(1 for count in documents.values() if count.submitted),
+                verified=verified,
+                is_complete=verified == len(doc_types),
+                documents=documents
+            )
+        return completeness
+    
+    def attach_document_completeness(self, db: Session, *, applications: Sequence[LicenseApplication]) -> None:
+        """Set `document_completeness` on listed applications (application_type loaded)"""
+        completeness = self.get_completeness(db, type_categories={
+            application.application_id: application.application_type.type_category if application.application_type else None
+            for application in applications
+        })
+        for application in applications:
+            application.document_completeness = completeness[application.application_id]
 
 crud_document = CRUDDocument(SubmittedDocument)
@@ -0,0 +1,126 @@
+# app/crud/email_outbox.py
+from typing import Optional, List, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import and_
+from datetime import datetime, timedelta, timezone
+from app.crud.base import CRUDBase
+from app.models.email_outbox import EmailOutbox
+
+class CRUDEmailOutbox(CRUDBase[EmailOutbox, None, None]):
+    def enqueue(
+        self,
+        db: Session,
+        *,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> EmailOutbox:
+        """Queue an email for delivery by the outbox worker"""
+        message = EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            status="Pending"
+        )
+        db.add(message)
+        db.commit()
+        return message
+
+    def enqueue_many(self, db: Session, *, messages: List[Dict[str, Any]]) -> int:
+        """Queue many emails in one transaction"""
+        db.add_all([
+            EmailOutbox(
+                to_email=message["to_email"],
+                subject=message["subject"],
+                html_content=message["html_content"],
+                text_content=message.get("text_content"),
+                status="Pending"
+            )
+            for message in messages
+        ])
+        db.commit()
+        return len(messages)
+
+    def claim_batch(self, db: Session, *, limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+        """
+        Claim up to `limit` due messages for sending.
+        Rows locked by another worker are skipped. Claimed rows are leased until
+        `lease_seconds` from now, so a crashed worker's messages are picked up again.
+        Returns plain snapshots so the sender does not hold the session open.
+        """
+        now = datetime.now(timezone.utc)
+        messages = db.query(EmailOutbox).filter(
+            and_(
+                EmailOutbox.status.in_(["Pending", "Sending"]),
+                EmailOutbox.next_attempt_at <= now
+            )
+        ).order_by(EmailOutbox.next_attempt_at).limit(limit).with_for_update(skip_locked=True).all()
+
+        batch = []
+        for message in messages:
+            message.status = "Sending"
+            message.attempts = (message.attempts or 0) + 1
+            message.next_attempt_at = now + timedelta(seconds=lease_seconds)
+            batch.append({
+                "id": message.id,
+                "to_email": message.to_email,
+                "subject": message.subject,
+                "html_content": message.html_content,
+                "text_content": message.text_content,
+                "attempts": message.attempts
+            })
+
+        db.commit()
+        return batch
+
+    def mark_sent(self, db: Session, *, message_ids: List[str]) -> int:
+        """Mark delivered messages as sent"""
+        if not message_ids:
+            return 0
+        count = db.query(EmailOutbox).filter(
+            EmailOutbox.id.in_(message_ids)
+        ).update({
+            "status": "Sent",
+            "sent_at": datetime.now(timezone.utc),
+            "last_error": None
+        }, synchronize_session=False)
+        db.commit()
+        return count
+
+    def mark_failed(
+        self,
+        db: Session,
+        *,
+        message_id: str,
+        error: str,
+        max_attempts: int,
+        backoff_seconds: int
+    ) -> Optional[EmailOutbox]:
+        """Record a failed attempt and schedule a retry with exponential backoff"""
+        message = db.query(EmailOutbox).filter(EmailOutbox.id == message_id).first()
+        if not message:
+            return None
+
+        message.last_error = error[:1000]
+        if message.attempts >= max_attempts:
+            message.status = "Failed"
+        else:
+            delay = backoff_seconds * (2 ** max(message.attempts - 1, 0))
+            message.status = "Pending"
+            message.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+        db.commit()
+        return message
+
+    def get_queue_depth(self, db: Session) -> int:
+        """Count messages still waiting to be delivered"""
+        return db.query(EmailOutbox).filter(
+            EmailOutbox.status.in_(["Pending", "Sending"])
+        ).count()
+
+    def get_by_id(self, db: Session, *, message_id: str) -> Optional[EmailOutbox]:
+        return db.query(EmailOutbox).filter(EmailOutbox.id == message_id).first()
+
+crud_email_outbox = CRUDEmailOutbox(EmailOutbox)
@@ -0,0 +1,116 @@
+# app/crud/idempotency.py
+from typing import Any, Optional, Tuple
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+from app.crud.base import CRUDBase
+from app.models.idempotency import IdempotencyKey
+
+# Take the key unless a live request or response holds it: new keys, expired
+# ones and keys whose first request stopped without finishing (lock expired)
+CLAIM_SQL = text("""
+    INSERT INTO idempotencykey (owner, key, endpoint, fingerprint, status, locked_until, created_at, expires_at)
+    VALUES (
+        :owner, :key, :endpoint, :fingerprint, 'Processing',
+        now() + make_interval(secs => :lock_seconds), now(), now() + make_interval(hours => :ttl_hours)
+    )
+    ON CONFLICT (owner, key) DO UPDATE SET
+        endpoint = EXCLUDED.endpoint,
+        fingerprint = EXCLUDED.fingerprint,
+        status = 'Processing',
+        locked_until = EXCLUDED.locked_until,
+        response_status = NULL,
+        response_content_type = NULL,
+        response_body = NULL,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE idempotencykey.expires_at <= now()
+       OR (idempotencykey.status = 'Processing' AND idempotencykey.locked_until <= now())
+    RETURNING key
+""")
+
+class CRUDIdempotency(CRUDBase[IdempotencyKey, None, None]):
+    def claim(
+        self,
+        db: Session,
+        *,
+        owner: str,
+        key: str,
+        endpoint: str,
+        fingerprint: str,
+        lock_seconds: int,
+        ttl_hours: int
+    ) -> Tuple[bool, Optional[Any]]:
+        """
+        Start processing `key` for `owner`. Returns (True, None) when the
+        caller now holds the key, otherwise (False, row) with the request
+        that holds it; row is None if that request let go meanwhile.
+        """
+        claimed = db.execute(CLAIM_SQL, {
+            "owner": owner,
+            "key": key,
+            "endpoint": endpoint,
+            "fingerprint": fingerprint,
+            "lock_seconds": lock_seconds,
+            "ttl_hours": ttl_hours,
+        }).first()
+        if claimed:
+            db.commit()
+            return True, None
+
+        row = db.execute(
+            select(
+                IdempotencyKey.fingerprint,
+                IdempotencyKey.status,
+                IdempotencyKey.response_status,
+                IdempotencyKey.response_content_type,
+                IdempotencyKey.response_body
+            ).where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+        ).first()
+        db.commit()
+        return False, row
+
+    def complete(
+        self,
+        db: Session,
+        *,
+        owner: str,
+        key: str,
+        fingerprint: str,
+        status_code: int,
+        content_type: Optional[str],
+        body: bytes
+    ) -> None:
+        """Store the response of the request holding `key`, for its retries"""
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.owner == owner,
+            IdempotencyKey.key == key,
+            IdempotencyKey.fingerprint == fingerprint,
+            IdempotencyKey.status == "Processing"
+        ).update({
+            "status": "Completed",
+            "locked_until": None,
+            "response_status": status_code,
+            "response_content_type": content_type,
+            "response_body": body
+        }, synchronize_session=False)
+        db.commit()
+
+    def release(self, db: Session, *, owner: str, key: str, fingerprint: str) -> None:
+        """Drop a key whose request failed, so a retry runs it again"""
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.owner == owner,
+            IdempotencyKey.key == key,
+            IdempotencyKey.fingerprint == fingerprint,
+            IdempotencyKey.status == "Processing"
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def purge_expired(self, db: Session) -> int:
+        """Delete expired keys; returns how many"""
+        count = db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now())
+        ).rowcount
+        db.commit()
+        return count
+
+crud_idempotency = CRUDIdempotency(IdempotencyKey)
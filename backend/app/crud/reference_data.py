@@ -0,0 +1,108 @@
+# app/crud/reference_data.py
+"""
+Reference data sections of GET /bootstrap: statuses, application types,
+vehicle categories, locations and organ types, serialized like the matching
+/public endpoints.
+
+Each section has a version: a short hash of the table's row count and newest
+row version (xmin), read for all sections in one statement. Serialized
+sections are kept per process and reloaded only when their version changes,
+so a warm bootstrap reads no reference rows, and a client that sends the
+versions it holds gets unchanged sections back without their items.
+"""
+import hashlib
+from threading import Lock
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.metrics import record_cache_lookup
+from app.core.responses import orm_to_dict
+from app.crud.application import crud_application_status, crud_application_type
+from app.crud.donation import crud_organ
+from app.crud.location import crud_location
+from app.crud.vehicle import crud_vehicle_category
+from app.schemas.appointment import LocationResponse
+from app.schemas.application import ApplicationStatusResponse, ApplicationTypeResponse
+from app.schemas.base import BaseSchema
+from app.schemas.donation import OrganResponse
+from app.schemas.vehicle import VehicleCategoryResponse
+
+class ReferenceSection(NamedTuple):
+    table: str
+    load: Callable[[Session], List[Any]]
+    schema: Type[BaseSchema]
+
+REFERENCE_SECTIONS: Dict[str, ReferenceSection] = {
+    "application_statuses": ReferenceSection("applicationstatus", crud_application_status.get_all, ApplicationStatusResponse),
+    "application_types": ReferenceSection("applicationtype", crud_application_type.get_all, ApplicationTypeResponse),
+    "vehicle_categories": ReferenceSection("vehiclecategory", crud_vehicle_category.get_all, VehicleCategoryResponse),
+    "locations": ReferenceSection("location", crud_location.get_all, LocationResponse),
+    "organ_types": ReferenceSection("organ", crud_organ.get_all, OrganResponse),
+}
+
+REFERENCE_VERSION_SQL = text("SELECT " + ", ".join(
+    f"(SELECT count(*) || '/' || coalesce(max(xmin::text::bigint), 0) FROM {section.table}) AS {name}"
+    for name, section in REFERENCE_SECTIONS.items()
+))
+
+def parse_known_versions(known: Optional[str]) -> Dict[str, str]:
+    """`section:version,section:version` as sent by clients; malformed pairs are ignored"""
+    versions = {}
+    for pair in (known or "").split(","):
+        name, _, version = pair.strip().partition(":")
+        if name in REFERENCE_SECTIONS and version:
+            versions[name] = version
+    return versions
+
+class CRUDReferenceData:
+    def __init__(self):
+        # section -> (version, serialized items)
+        self._sections: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+        self._lock = Lock()
+
+    def get_versions(self, db: Session) -> Dict[str, str]:
+        """Current version of every section, in one statement"""
+        row = db.execute(REFERENCE_VERSION_SQL).one()
+        return {
+            name: hashlib.sha1(f"{name}:{fingerprint}".encode()).hexdigest()[:12]
+            for name, fingerprint in row._mapping.items()
+        }
+
+    def get_section(self, db: Session, *, name: str, version: str) -> List[Dict[str, Any]]:
+        """Serialized items of a section at `version`; loaded (one query) unless cached"""
+        cached = self._sections.get(name)
+        hit = cached is not None and cached[0] == version
+        record_cache_lookup("reference_data", hit)
+        if hit:
+            return cached[1]
+
+        section = REFERENCE_SECTIONS[name]
+        items = [orm_to_dict(row, section.schema) for row in section.load(db)]
+        with self._lock:
+            self._sections[name] = (version, items)
+        return items
+
+    def get_all(self, db: Session, *, known: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Every section as {"version", "unchanged", "items"}. Sections whose
+        version is in `known` come back unchanged, with items None.
+        """
+        known = known or {}
+        sections = {}
+        for name, version in self.get_versions(db).items():
+            unchanged = known.get(name) == version
+            sections[name] = {
+                "version": version,
+                "unchanged": unchanged,
+                "items": None if unchanged else self.get_section(db, name=name, version=version),
+            }
+        return sections
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sections.clear()
+
+# Global instance
+crud_reference_data = CRUDReferenceData()
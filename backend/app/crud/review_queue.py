@@ -0,0 +1,244 @@
+# app/crud/review_queue.py
+"""
+Review work-queue for concurrent admin reviewers.
+
+A reviewer claims the next items of a queue and holds them under a lease
+(reviewlease) until the review is completed, the lease is released, or it
+expires without a heartbeat. Claims lock candidate rows with
+FOR NO KEY UPDATE SKIP LOCKED, so concurrent reviewers get disjoint items
+instead of waiting on each other; the upsert only replaces expired leases,
+so an item is never held by two reviewers.
+
+Queues:
+
+  applications  applications awaiting a decision, oldest submission first
+  documents     documents nobody has verified or rejected yet, oldest upload first
+"""
+from typing import Any, Dict, List, Sequence
+from collections import Counter
+from uuid import UUID
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session, joinedload
+from app.crud.base import CRUDBase
+from app.core.metrics import REVIEW_QUEUE_ITEMS
+from app.models.application import LicenseApplication
+from app.models.document import SubmittedDocument
+from app.models.review_lease import ReviewLease
+
+# Applications in these statuses can be approved or rejected
+REVIEW_STATUS_IDS = ["ASID_PEN", "ASID_REV", "ASID_SFA"]
+
+# Queued items that are not under a valid lease, oldest first. Locks only the
+# queued row (NO KEY UPDATE does not block child inserts referencing it).
+QUEUE_CANDIDATES = {
+    "applications": """
+        SELECT l.application_id AS item_id
+        FROM licenseapplication l
+        LEFT JOIN reviewlease r ON r.queue = 'applications' AND r.item_id = l.application_id
+        WHERE l.application_status_id = ANY(:status_ids)
+          AND (r.item_id IS NULL OR r.expires_at <= now())
+        ORDER BY l.submission_date
+        LIMIT :limit
+        FOR NO KEY UPDATE OF l SKIP LOCKED
+    """,
+    "documents": """
+        SELECT CAST(d.document_id AS text) AS item_id
+        FROM submitteddocuments d
+        LEFT JOIN reviewlease r ON r.queue = 'documents' AND r.item_id = CAST(d.document_id AS text)
+        WHERE d.is_verified = false AND d.verified_by IS NULL
+          AND (r.item_id IS NULL OR r.expires_at <= now())
+        ORDER BY d.uploaded_at
+        LIMIT :limit
+        FOR NO KEY UPDATE OF d SKIP LOCKED
+    """,
+}
+
+REVIEW_QUEUES = list(QUEUE_CANDIDATES)
+
+# A candidate whose expired lease was renewed, or that another reviewer
+# claimed after this statement's snapshot, fails the WHERE and is left out
+CLAIM_SQL = {
+    queue: text(f"""
+        WITH candidates AS ({candidates})
+        INSERT INTO reviewlease (queue, item_id, lease_id, reviewer, claimed_at, expires_at)
+        SELECT '{queue}', item_id, gen_random_uuid(), :reviewer, now(), now() + make_interval(secs => :lease_seconds)
+        FROM candidates
+        ON CONFLICT (queue, item_id) DO UPDATE SET
+            lease_id = EXCLUDED.lease_id,
+            reviewer = EXCLUDED.reviewer,
+            claimed_at = EXCLUDED.claimed_at,
+            expires_at = EXCLUDED.expires_at
+        WHERE reviewlease.expires_at <= now()
+        RETURNING item_id, lease_id, expires_at
+    """)
+    for queue, candidates in QUEUE_CANDIDATES.items()
+}
+
+HEARTBEAT_SQL = text("""
+    UPDATE reviewlease SET expires_at = now() + make_interval(secs => :lease_seconds)
+    WHERE lease_id = ANY(CAST(:lease_ids AS uuid[])) AND reviewer = :reviewer
+    RETURNING lease_id, expires_at
+""")
+
+RELEASE_SQL = text("""
+    DELETE FROM reviewlease
+    WHERE lease_id = ANY(CAST(:lease_ids AS uuid[])) AND reviewer = :reviewer
+    RETURNING lease_id, queue
+""")
+
+RELEASE_COMPLETED_SQL = text("""
+    DELETE FROM reviewlease
+    WHERE (queue = 'applications' AND item_id = ANY(CAST(:application_ids AS text[])))
+       OR (queue = 'documents' AND item_id = ANY(CAST(:document_ids AS text[])))
+       OR (queue = 'documents' AND CAST(:with_documents AS boolean) AND item_id IN (
+            SELECT CAST(document_id AS text) FROM submitteddocuments
+            WHERE application_id = ANY(CAST(:application_ids AS text[]))
+       ))
+    RETURNING queue
+""")
+
+QUEUE_DEPTH_SQL = text("""
+    SELECT 'applications' AS queue,
+           count(*) FILTER (WHERE r.item_id IS NULL OR r.expires_at <= now()) AS waiting,
+           count(*) FILTER (WHERE r.expires_at > now()) AS leased
+    FROM licenseapplication l
+    LEFT JOIN reviewlease r ON r.queue = 'applications' AND r.item_id = l.application_id
+    WHERE l.application_status_id = ANY(:status_ids)
+    UNION ALL
+    SELECT 'documents',
+           count(*) FILTER (WHERE r.item_id IS NULL OR r.expires_at <= now()),
+           count(*) FILTER (WHERE r.expires_at > now())
+    FROM submitteddocuments d
+    LEFT JOIN reviewlease r ON r.queue = 'documents' AND r.item_id = CAST(d.document_id AS text)
+    WHERE d.is_verified = false AND d.verified_by IS NULL
+""")
+
+class CRUDReviewQueue(CRUDBase[ReviewLease, None, None]):
+    def claim(
+        self,
+        db: Session,
+        *,
+        queue: str,
+        reviewer: str,
+        limit: int,
+        lease_seconds: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Lease up to `limit` items of `queue` to `reviewer` for `lease_seconds`.
+        Returns the leases in queue order, each with its application or document.
+        """
+        rows = db.execute(CLAIM_SQL[queue], {
+            "status_ids": REVIEW_STATUS_IDS,
+            "limit": limit,
+            "reviewer": reviewer,
+            "lease_seconds": lease_seconds,
+        }).all()
+        # Release the row locks before loading the items
+        db.commit()
+        if not rows:
+            return []
+        REVIEW_QUEUE_ITEMS.labels(queue, "claimed").inc(len(rows))
+
+        leases = {row.item_id: row for row in rows}
+        if queue == "applications":
+            items = db.query(LicenseApplication).options(
+                joinedload(LicenseApplication.applicant),
+                joinedload(LicenseApplication.application_type),
+                joinedload(LicenseApplication.status)
+            ).filter(
+                LicenseApplication.application_id.in_(list(leases))
+            ).order_by(LicenseApplication.submission_date).all()
+            item_ids = [item.application_id for item in items]
+        else:
+            items = db.query(SubmittedDocument).filter(
+                SubmittedDocument.document_id.in_([UUID(item_id) for item_id in leases])
+            ).order_by(SubmittedDocument.uploaded_at).all()
+            item_ids = [str(item.document_id) for item in items]
+
+        item_key = "application" if queue == "applications" else "document"
+        return [
+            {
+                "lease_id": leases[item_id].lease_id,
+                "queue": queue,
+                "item_id": item_id,
+                "expires_at": leases[item_id].expires_at,
+                item_key: item
+            }
+            for item_id, item in zip(item_ids, items)
+        ]
+
+    def heartbeat(
+        self,
+        db: Session,
+        *,
+        reviewer: str,
+        lease_ids: Sequence[UUID],
+        lease_seconds: int
+    ) -> Dict[str, Any]:
+        """
+        Extend the reviewer's leases by `lease_seconds` from now. An expired
+        lease nobody has claimed since is renewed too; `lost` lists the leases
+        that were completed, released or claimed by someone else.
+        """
+        rows = db.execute(HEARTBEAT_SQL, {
+            "lease_ids": [str(lease_id) for lease_id in lease_ids],
+            "reviewer": reviewer,
+            "lease_seconds": lease_seconds,
+        }).all()
+        db.commit()
+
+        renewed = {str(row.lease_id) for row in rows}
+        return {
+            "renewed": [{"lease_id": row.lease_id, "expires_at": row.expires_at} for row in rows],
+            "lost": [lease_id for lease_id in lease_ids if str(lease_id) not in renewed]
+        }
+
+    def release(self, db: Session, *, reviewer: str, lease_ids: Sequence[UUID]) -> List[UUID]:
+        """Give up the reviewer's leases without completing them; the items go back to the queue"""
+        rows = db.execute(RELEASE_SQL, {
+            "lease_ids": [str(lease_id) for lease_id in lease_ids],
+            "reviewer": reviewer,
+        }).all()
+        db.commit()
+
+        for queue, count in Counter(row.queue for row in rows).items():
+            REVIEW_QUEUE_ITEMS.labels(queue, "released").inc(count)
+        return [row.lease_id for row in rows]
+
+    def release_completed(
+        self,
+        db: Session,
+        *,
+        application_ids: Sequence[str] = (),
+        document_ids: Sequence[str] = (),
+        with_documents: bool = False
+    ) -> None:
+        """
+        Drop the leases of reviewed items, whoever holds them, in the caller's
+        transaction. `with_documents` also drops the leases of the documents
+        of `application_ids` (approval verifies them all).
+        """
+        if not (application_ids or document_ids):
+            return
+        rows = db.execute(RELEASE_COMPLETED_SQL, {
+            "application_ids": list(application_ids),
+            "document_ids": [str(document_id) for document_id in document_ids],
+            "with_documents": with_documents,
+        }).all()
+
+        for queue, count in Counter(row.queue for row in rows).items():
+            REVIEW_QUEUE_ITEMS.labels(queue, "completed").inc(count)
+
+    def get_queue_depths(self, db: Session) -> Dict[str, Dict[str, int]]:
+        """Items waiting and items under a valid lease, per queue"""
+        rows = db.execute(QUEUE_DEPTH_SQL, {"status_ids": REVIEW_STATUS_IDS}).all()
+        return {row.queue: {"waiting": row.waiting, "leased": row.leased} for row in rows}
+
+    def get_reviewer_leases(self, db: Session, *, reviewer: str) -> List[ReviewLease]:
+        """The reviewer's valid leases, oldest claim first"""
+        return db.query(ReviewLease).filter(
+            ReviewLease.reviewer == reviewer,
+            ReviewLease.expires_at > func.now()
+        ).order_by(ReviewLease.claimed_at).all()
+
+crud_review_queue = CRUDReviewQueue(ReviewLease)
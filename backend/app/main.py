@@ -1,22 +1,29 @@
 # app/main.py
-import logging
-import json
-from fastapi import Request
-from fastapi.responses import JSONResponse
+from app.core.logging_setup import logging_pipeline
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+logging_pipeline.configure()
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.database import engine
+from app.core.instrumentation import request_instrumentation
+from app.core.metrics import generate_metrics, instrument_pool, METRICS_CONTENT_TYPE
 from app.api.v1.api import api_router
+from app.utils.email_outbox import email_outbox_worker
+from app.utils.email_templates import email_templates
+from app.utils.partitions import partition_maintenance_worker
+from app.utils.archival import archival_worker
+from app.utils.events import event_broker
+from app.utils.idempotency import idempotency_purge_worker
+from app.middleware.request_logging import RequestLoggingMiddleware
+from app.middleware.instrumentation import InstrumentationMiddleware
+from app.middleware.metrics import PrometheusMiddleware
 
 # Create FastAPI app
 app = FastAPI(
@@ -34,6 +41,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Structured, sampled request logging
+app.add_middleware(RequestLoggingMiddleware)
+
+# Per-request DB/auth timings; added last so it wraps the request logger
+request_instrumentation.configure(engine)
+app.add_middleware(InstrumentationMiddleware)
+
+# Prometheus request metrics; outermost so latency covers the whole stack
+if settings.METRICS_ENABLED:
+    instrument_pool(engine)
+    app.add_middleware(PrometheusMiddleware)
+
 # Create upload directory if it doesn't exist
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
@@ -43,49 +62,23 @@ app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads"
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    # Log request details for debugging
-    if request.url.path.endswith("/submit-complete"):
-        logger = logging.getLogger("request_logger")
-        logger.info(f"=== REQUEST TO {request.url.path} ===")
-        logger.info(f"Method: {request.method}")
-        logger.info(f"Headers: {dict(request.headers)}")
-        
-        # Read and log request body
-        body = await request.body()
-        if body:
-            try:
-                body_str = body.decode('utf-8')
-                logger.info(f"Raw body: {body_str}")
-                # Try to parse as JSON for better formatting
-                try:
-                    body_json = json.loads(body_str)
-                    logger.info(f"Parsed JSON: {json.dumps(body_json, indent=2)}")
-                except:
-                    pass
-            except Exception as e:
-                logger.error(f"Could not decode body: {e}")
-        
-        # Create a new request with the body
-        from fastapi import Request
-        from starlette.datastructures import Headers
-        
-        async def receive():
-            return {
-                "type": "http.request",
-                "body": body,
-                "more_body": False
-            }
-        
-        new_request = Request(request.scope, receive)
-        response = await call_next(new_request)
-        
-        logger.info(f"Response status: {response.status_code}")
-        return response
-    else:
-        response = await call_next(request)
-        return response
+@app.on_event("startup")
+async def start_background_workers():
+    email_templates.load()
+    email_outbox_worker.start()
+    partition_maintenance_worker.start()
+    archival_worker.start()
+    event_broker.start()
+    idempotency_purge_worker.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await email_outbox_worker.stop()
+    await partition_maintenance_worker.stop()
+    await archival_worker.stop()
+    await event_broker.stop()
+    await idempotency_purge_worker.stop()
+    logging_pipeline.shutdown()
 
 @app.get("/")
 async def root():
@@ -93,4 +86,12 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": settings.PROJECT_VERSION}
\ No newline at end of file
+    return {"status": "healthy", "version": settings.PROJECT_VERSION}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    # Counting the outbox queries the database, so keep it off the event loop
+    content = await run_in_threadpool(generate_metrics)
+    return Response(content=content, media_type=METRICS_CONTENT_TYPE)
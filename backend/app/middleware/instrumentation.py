@@ -0,0 +1,43 @@
+# app/middleware/instrumentation.py
+"""
+Adds a Server-Timing header with per-request database and Supabase timings.
+
+Must be the outermost middleware so the request log written by
+RequestLoggingMiddleware can pick up the same stats (see
+app/core/instrumentation.py).
+"""
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.instrumentation import request_instrumentation
+
+class InstrumentationMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not request_instrumentation.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats, token = request_instrumentation.start_request()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing(time.perf_counter() - start).encode("latin-1")))
+                headers.append((b"timing-allow-origin", b"*"))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_instrumentation.end_request(token)
+
+        request_instrumentation.report_repeated_statements(stats, scope["method"], scope["path"])
+
+        if stats.slow_statements:
+            await run_in_threadpool(request_instrumentation.explain_slow_statements, stats, scope["path"])
@@ -0,0 +1,61 @@
+# app/middleware/metrics.py
+"""
+Request latency and in-flight metrics.
+
+Latency is labelled with the matched route template (e.g.
+/api/v1/applications/{application_id}) rather than the raw path, so label
+cardinality stays bounded. Requests that match no API route are labelled
+"unmatched".
+"""
+import time
+
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+# Not worth a latency series of their own
+EXCLUDED_PATHS = {"/metrics"}
+
+def route_template(scope) -> str:
+    """Path template of the matched route, from scope["route"].path"""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path
+    path = scope["path"]
+    if route.path_regex.match(path):
+        return template
+    # FastAPI releases that keep included routes relative to their router:
+    # the route matches the tail of the path, and the literal router
+    # prefixes in front of it are kept as they are
+    for index, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+class PrometheusMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        response_status = 500
+
+        async def send_with_status(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(method, route_template(scope), str(response_status)).observe(
+                time.perf_counter() - start
+            )
+            in_progress.dec()
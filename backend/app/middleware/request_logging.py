@@ -0,0 +1,102 @@
+# app/middleware/request_logging.py
+"""
+Sampled request logging.
+
+Written as a plain ASGI middleware so the request body is never buffered or
+replayed: when a body route is sampled, chunks are copied as the application
+reads them, up to `LOG_BODY_MAX_BYTES`. The captured bytes and the raw header
+list are attached to the log record untouched; decoding and redaction happen
+in the logging pipeline's listener thread (see app/core/logging_setup.py).
+"""
+import logging
+import random
+import time
+import uuid
+from typing import Optional
+
+from app.core.config import settings
+from app.core.instrumentation import get_request_stats
+
+logger = logging.getLogger("request_logger")
+
+def get_sample_rate(path: str) -> float:
+    """Sample rate for a path; the longest matching prefix in LOG_ROUTE_SAMPLE_RATES wins"""
+    best_match: Optional[str] = None
+    for prefix in settings.LOG_ROUTE_SAMPLE_RATES:
+        if path.startswith(prefix) and (best_match is None or len(prefix) > len(best_match)):
+            best_match = prefix
+    if best_match is None:
+        return settings.LOG_REQUEST_SAMPLE_RATE
+    return settings.LOG_ROUTE_SAMPLE_RATES[best_match]
+
+def should_log_body(path: str) -> bool:
+    return any(path.endswith(route) or path == route for route in settings.LOG_BODY_ROUTES)
+
+class RequestLoggingMiddleware:
+    """Logs one structured record per sampled HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.LOG_REQUESTS:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        rate = get_sample_rate(path)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        response_status = 500
+        body = bytearray()
+        truncated = False
+        capture_body = should_log_body(path)
+        max_bytes = settings.LOG_BODY_MAX_BYTES
+
+        async def receive_with_capture():
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request" and not truncated:
+                chunk = message.get("body", b"")
+                remaining = max_bytes - len(body)
+                if len(chunk) > remaining:
+                    truncated = True
+                body.extend(chunk[:remaining])
+            return message
+
+        async def send_with_status(message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_with_capture if capture_body else receive, send_with_status)
+        finally:
+            extra = {
+                "event": "http_request",
+                "request_id": _get_request_id(scope),
+                "method": scope["method"],
+                "path": path,
+                "status": response_status,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "client": scope["client"][0] if scope.get("client") else None,
+                "sample_rate": rate,
+            }
+            stats = get_request_stats()
+            if stats is not None:
+                extra.update(stats.as_log_fields())
+            if capture_body:
+                extra["headers"] = list(scope["headers"])
+                extra["body"] = bytes(body)
+                extra["body_truncated"] = truncated
+            logger.info(f"{scope['method']} {path} {response_status}", extra=extra)
+
+def _get_request_id(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            return value.decode("latin-1")
+    return uuid.uuid4().hex
@@ -5,6 +5,7 @@ from .application import (
     ApplicationStatus, 
     ApplicationType, 
     LicenseApplication, 
+    LicenseApplicationIds,
     ApplicationStatusHistory,
     ApplicationVehicleCategory
 )
@@ -20,6 +21,9 @@ from .license_condition import LicenseCondition, LicenseConditionType
 from .driving_skill import DrivingSkill
 from .archived import ArchivedApplication
 from .otp import EmailOTP, OTPType
+from .email_outbox import EmailOutbox
+from .review_lease import ReviewLease
+from .idempotency import IdempotencyKey
 
 __all__ = [
     "Applicant",
@@ -27,6 +31,7 @@ __all__ = [
     "ApplicationStatus",
     "ApplicationType", 
     "LicenseApplication",
+    "LicenseApplicationIds",
     "ApplicationStatusHistory",
     "ApplicationVehicleCategory",
     "Appointment",
@@ -44,5 +49,8 @@ __all__ = [
     "DrivingSkill",
     "ArchivedApplication",
     "EmailOTP",
-    "OTPType"
+    "OTPType",
+    "EmailOutbox",
+    "ReviewLease",
+    "IdempotencyKey"
 ]
\ No newline at end of file
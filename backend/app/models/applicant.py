@@ -1,12 +1,22 @@
 # app/models/applicant.py
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Text, Date, Numeric, Boolean, CheckConstraint, ForeignKey
+from sqlalchemy import Column, String, Text, Date, Numeric, Boolean, CheckConstraint, ForeignKey, Index, Sequence
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func, text
 from .base import Base, TimestampMixin
 import uuid
 
+# License numbers are handed out in blocks of LICENSE_NUMBER_BLOCK_SIZE: every
+# nextval() reserves the next block for one worker (see app/utils/license_numbers.py)
+LICENSE_NUMBER_BLOCK_SIZE = 100
+license_number_seq = Sequence(
+    "license_number_seq",
+    start=1,
+    increment=LICENSE_NUMBER_BLOCK_SIZE,
+    metadata=Base.metadata
+)
+
 if TYPE_CHECKING:
     from .application import LicenseApplication
     from .family import FamilyInformation
@@ -86,6 +96,7 @@ class Applicant(Base, TimestampMixin):
             "license_number IS NULL OR license_number ~ '^[A-Z]{1}[0-9]{2}-[0-9]{2}-[0-9]{6}$'",
             name="check_license_number_format"
         ),
+        Index("ux_applicant_license_number", "license_number", unique=True),
         CheckConstraint(
             "height IS NULL OR (height >= 0 AND height <= 300)",
             name="check_height_range"
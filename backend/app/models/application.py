@@ -1,6 +1,6 @@
 # app/models/application.py
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 from sqlalchemy.sql import func, text
@@ -65,22 +65,63 @@ class LicenseApplication(Base):
     application_type_id = Column(String, ForeignKey("applicationtype.application_type_id"), nullable=False)
     application_status_id = Column(String, ForeignKey("applicationstatus.application_status_id"), nullable=False)
     
-    # Application details
-    submission_date = Column(DateTime(timezone=True), server_default=func.now())
+    # Application details; submission_date is the monthly partition key (alembic revision 0004)
+    submission_date = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     last_updated_date = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     rejection_reason = Column(Text)
     additional_requirements = Column(String)
     
+    # The table's primary key includes the partition key; rows are still identified by
+    # application_id, which licenseapplication_ids keeps unique and child foreign keys reference
+    __table_args__ = {"postgresql_partition_by": "RANGE (submission_date)"}
+    __mapper_args__ = {"primary_key": [application_id]}
+    
     # Relationships
     applicant = relationship("Applicant", back_populates="license_applications")
     application_type = relationship("ApplicationType", back_populates="applications")
     status = relationship("ApplicationStatus", back_populates="applications")
-    status_history = relationship("ApplicationStatusHistory", back_populates="application")
-    appointments = relationship("Appointment", back_populates="application")
-    submitted_documents = relationship("SubmittedDocument", back_populates="application")
-    vehicle_categories = relationship("ApplicationVehicleCategory", back_populates="application")
-    license_conditions = relationship("LicenseCondition", back_populates="application")
-    driving_skills = relationship("DrivingSkill", back_populates="application")
+    # Child rows reference licenseapplication_ids, so these joins are spelled out
+    status_history = relationship(
+        "ApplicationStatusHistory",
+        primaryjoin="LicenseApplication.application_id == foreign(ApplicationStatusHistory.application_id)",
+        back_populates="application"
+    )
+    appointments = relationship(
+        "Appointment",
+        primaryjoin="LicenseApplication.application_id == foreign(Appointment.application_id)",
+        back_populates="application"
+    )
+    submitted_documents = relationship(
+        "SubmittedDocument",
+        primaryjoin="LicenseApplication.application_id == foreign(SubmittedDocument.application_id)",
+        back_populates="application"
+    )
+    vehicle_categories = relationship(
+        "ApplicationVehicleCategory",
+        primaryjoin="LicenseApplication.application_id == foreign(ApplicationVehicleCategory.application_id)",
+        back_populates="application"
+    )
+    license_conditions = relationship(
+        "LicenseCondition",
+        primaryjoin="LicenseApplication.application_id == foreign(LicenseCondition.application_id)",
+        back_populates="application"
+    )
+    driving_skills = relationship(
+        "DrivingSkill",
+        primaryjoin="LicenseApplication.application_id == foreign(DrivingSkill.application_id)",
+        back_populates="application"
+    )
+    
+    # Not a column: set on listed rows by crud_document.attach_document_completeness
+    document_completeness = None
+
+class LicenseApplicationIds(Base):
+    __tablename__ = "licenseapplication_ids"
+    
+    # Every application id, kept in sync by triggers on licenseapplication
+    # (alembic revision 0004). The partitioned table's primary key includes
+    # submission_date, so child foreign keys reference this table instead.
+    application_id = Column(String, primary_key=True)
 
 class ApplicationStatusHistory(Base):
     __tablename__ = "applicationstatushistory"
@@ -93,15 +134,22 @@ class ApplicationStatusHistory(Base):
     )
     
     # Foreign Keys
-    application_id = Column(String, ForeignKey("licenseapplication.application_id"), nullable=False)
+    application_id = Column(String, ForeignKey("licenseapplication_ids.application_id"), nullable=False)
     application_status_id = Column(String, ForeignKey("applicationstatus.application_status_id"), nullable=False)
     
-    # Status change details
-    status_change_date = Column(DateTime(timezone=True), server_default=func.now())
+    # Status change details; status_change_date is the monthly partition key (alembic revision 0004)
+    status_change_date = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     changed_by = Column(String, nullable=False)
     
+    __table_args__ = {"postgresql_partition_by": "RANGE (status_change_date)"}
+    __mapper_args__ = {"primary_key": [history_id]}
+    
     # Relationships
-    application = relationship("LicenseApplication", back_populates="status_history")
+    application = relationship(
+        "LicenseApplication",
+        primaryjoin="foreign(ApplicationStatusHistory.application_id) == LicenseApplication.application_id",
+        back_populates="status_history"
+    )
     status = relationship("ApplicationStatus", back_populates="status_history")
 
 class ApplicationVehicleCategory(Base):
@@ -115,7 +163,7 @@ class ApplicationVehicleCategory(Base):
     )
     
     # Foreign Keys
-    application_id = Column(String, ForeignKey("licenseapplication.application_id"), nullable=False)
+    application_id = Column(String, ForeignKey("licenseapplication_ids.application_id"), nullable=False)
     category_id = Column(String, ForeignKey("vehiclecategory.category_id"), nullable=False)
     
     # Clutch type
@@ -129,6 +177,25 @@ class ApplicationVehicleCategory(Base):
     )
     
     # Relationships
-    application = relationship("LicenseApplication", back_populates="vehicle_categories")
+    application = relationship(
+        "LicenseApplication",
+        primaryjoin="foreign(ApplicationVehicleCategory.application_id) == LicenseApplication.application_id",
+        back_populates="vehicle_categories"
+    )
     vehicle_category = relationship("VehicleCategory", back_populates="application_categories")
 
+# Indexes for the lookups in app/crud (alembic revision 0003_hot_path_indexes)
+Index(
+    "ix_licenseapplication_applicant_submitted",
+    LicenseApplication.applicant_id, LicenseApplication.submission_date.desc()
+)
+Index(
+    "ix_licenseapplication_status_submitted",
+    LicenseApplication.application_status_id, LicenseApplication.submission_date.desc()
+)
+Index("ix_licenseapplication_submitted", LicenseApplication.submission_date.desc())
+Index(
+    "ix_applicationstatushistory_application_changed",
+    ApplicationStatusHistory.application_id, ApplicationStatusHistory.status_change_date
+)
+Index("ix_applicationvehiclecategory_application", ApplicationVehicleCategory.application_id)
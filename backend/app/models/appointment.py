@@ -1,6 +1,6 @@
 # app/models/appointment.py
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Date, Time, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Date, Time, Text, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from sqlalchemy.sql import text
@@ -20,7 +20,7 @@ class Appointment(Base):
     )
     
     # Foreign Keys
-    application_id = Column(String, ForeignKey("licenseapplication.application_id"), nullable=False)
+    application_id = Column(String, ForeignKey("licenseapplication_ids.application_id"), nullable=False)
     location_id = Column(String, ForeignKey("location.location_id"), nullable=False)
     
     # Appointment details
@@ -36,5 +36,16 @@ class Appointment(Base):
     )
     
     # Relationships
-    application = relationship("LicenseApplication", back_populates="appointments")
+    application = relationship(
+        "LicenseApplication",
+        primaryjoin="foreign(Appointment.application_id) == LicenseApplication.application_id",
+        back_populates="appointments"
+    )
     location = relationship("Location", back_populates="appointments")
+
+# Indexes for the lookups in app/crud (alembic revision 0003_hot_path_indexes)
+Index(
+    "ix_appointment_location_date_time",
+    Appointment.location_id, Appointment.appointment_date, Appointment.appointment_time
+)
+Index("ix_appointment_application_date", Appointment.application_id, Appointment.appointment_date.desc())
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, String, Text, DateTime
-from sqlalchemy.sql import text
+from sqlalchemy import Column, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func, text
 from .base import Base
 
 class ArchivedApplication(Base):
@@ -19,4 +21,15 @@ class ArchivedApplication(Base):
     submission_date = Column(DateTime(timezone=True))
     last_updated_date = Column(DateTime(timezone=True))
     rejection_reason = Column(Text)
-    additional_requirements = Column(String) 
\ No newline at end of file
+    additional_requirements = Column(String)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # The application and all of its child rows as moved out of the hot tables
+    # (app/crud/archive.py); only loaded when a single archive is read
+    application_graph = deferred(Column(JSONB))
+    
+    __table_args__ = (
+        Index("ux_archivedapplications_application", "application_id", unique=True),
+        Index("ix_archivedapplications_applicant_submitted", "applicant_id", text("submission_date DESC")),
+        Index("ix_archivedapplications_submitted", text("submission_date DESC")),
+    )
@@ -1,6 +1,6 @@
 # app/models/document.py
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, ForeignKey, Index, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -14,7 +14,7 @@ class SubmittedDocument(Base):
     __tablename__ = "submitteddocuments"
     
     document_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String, ForeignKey("licenseapplication.application_id"), nullable=False)
+    application_id = Column(String, ForeignKey("licenseapplication_ids.application_id"), nullable=False)
     document_type = Column(Text, nullable=False)
     file_url = Column(Text, nullable=False)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -22,4 +22,20 @@ class SubmittedDocument(Base):
     verified_by = Column(String)
     
     # Relationships
-    application = relationship("LicenseApplication", back_populates="submitted_documents")
+    application = relationship(
+        "LicenseApplication",
+        primaryjoin="foreign(SubmittedDocument.application_id) == LicenseApplication.application_id",
+        back_populates="submitted_documents"
+    )
+
+# Indexes for the lookups in app/crud (alembic revision 0003_hot_path_indexes)
+Index(
+    "ix_submitteddocuments_application_type",
+    SubmittedDocument.application_id, SubmittedDocument.document_type
+)
+# Admin verification queue: only unverified rows, oldest first
+Index(
+    "ix_submitteddocuments_unverified_uploaded",
+    SubmittedDocument.uploaded_at,
+    postgresql_where=SubmittedDocument.is_verified == false()
+)
@@ -18,7 +18,7 @@ class DrivingSkill(Base):
     )
     
     # Foreign Key
-    application_id = Column(String, ForeignKey("licenseapplication.application_id"), nullable=False)
+    application_id = Column(String, ForeignKey("licenseapplication_ids.application_id"), nullable=False)
     
     # Driving skill details
     acquisition_type = Column(Text, nullable=False)
@@ -32,4 +32,8 @@ class DrivingSkill(Base):
     )
     
     # Relationships
-    application = relationship("LicenseApplication", back_populates="driving_skills") 
\ No newline at end of file
+    application = relationship(
+        "LicenseApplication",
+        primaryjoin="foreign(DrivingSkill.application_id) == LicenseApplication.application_id",
+        back_populates="driving_skills"
+    ) 
\ No newline at end of file
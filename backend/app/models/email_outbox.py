@@ -0,0 +1,43 @@
+# app/models/email_outbox.py
+from sqlalchemy import Column, String, Text, Integer, DateTime, CheckConstraint, Index
+from sqlalchemy.sql import func, text
+from app.models.base import Base
+import uuid
+
+class EmailOutbox(Base):
+    __tablename__ = "emailoutbox"
+
+    # Generated message ID with format MAIL_XXXXXXXXXXXX
+    id = Column(String, primary_key=True)
+
+    # Message content
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_content = Column(Text, nullable=False)
+    text_content = Column(Text)
+
+    # Delivery state
+    status = Column(Text, nullable=False, default="Pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('Pending', 'Sending', 'Sent', 'Failed')",
+            name="check_email_outbox_status"
+        ),
+        # Claim query in CRUDEmailOutbox.claim_batch; sent and failed rows stay out of the index
+        Index(
+            "ix_emailoutbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('Pending', 'Sending')")
+        ),
+    )
+
+    def __init__(self, **kwargs):
+        if 'id' not in kwargs:
+            kwargs['id'] = f"MAIL_{uuid.uuid4().hex[:12].upper()}"
+        super().__init__(**kwargs)
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Text, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Text, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from sqlalchemy.sql import text
@@ -33,4 +33,7 @@ class EmergencyContact(Base):
     )
     
     # Relationships
-    applicant = relationship("Applicant", back_populates="emergency_contacts") 
\ No newline at end of file
+    applicant = relationship("Applicant", back_populates="emergency_contacts")
+
+# alembic revision 0003_hot_path_indexes
+Index("ix_emergencycontact_applicant", EmergencyContact.applicant_id)
@@ -1,6 +1,6 @@
 # app/models/employment.py
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from sqlalchemy.sql import text
@@ -29,3 +29,5 @@ class Employment(Base):
     # Relationships
     applicant = relationship("Applicant", back_populates="employment")
 
+# alembic revision 0003_hot_path_indexes
+Index("ix_employment_applicant", Employment.applicant_id)
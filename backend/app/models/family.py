@@ -1,6 +1,6 @@
 # app/models/family.py
 from typing import TYPE_CHECKING
-from sqlalchemy import Column, String, Text, Boolean, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Text, Boolean, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 from sqlalchemy.sql import text
@@ -38,3 +38,5 @@ class FamilyInformation(Base):
     # Relationships
     applicant = relationship("Applicant", back_populates="family_information")
 
+# alembic revision 0003_hot_path_indexes
+Index("ix_familyinformation_applicant", FamilyInformation.applicant_id)
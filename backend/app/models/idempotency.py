@@ -0,0 +1,34 @@
+# app/models/idempotency.py
+from sqlalchemy import Column, String, Text, Integer, DateTime, LargeBinary, CheckConstraint, Index
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotencykey"
+
+    # Idempotency-Key header value, scoped to the Supabase user who sent it
+    owner = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+
+    # "METHOD /path" and a hash of the query and body (app/api/idempotency.py)
+    endpoint = Column(Text, nullable=False)
+    fingerprint = Column(String, nullable=False)
+
+    # Processing while the first request runs; Completed once its response is stored
+    status = Column(Text, nullable=False, default="Processing")
+    locked_until = Column(DateTime(timezone=True))
+    response_status = Column(Integer)
+    response_content_type = Column(Text)
+    response_body = Column(LargeBinary)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('Processing', 'Completed')",
+            name="check_idempotency_key_status"
+        ),
+        # Purge of expired keys (IdempotencyPurgeWorker)
+        Index("ix_idempotencykey_expires", "expires_at"),
+    )
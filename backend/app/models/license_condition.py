@@ -33,9 +33,13 @@ class LicenseCondition(Base):
     )
     
     # Foreign Keys
-    application_id = Column(String, ForeignKey("licenseapplication.application_id"), nullable=False)
+    application_id = Column(String, ForeignKey("licenseapplication_ids.application_id"), nullable=False)
     condition_type_id = Column(String, ForeignKey("licenseconditiontype.condition_type_id"), nullable=False)
     
     # Relationships
-    application = relationship("LicenseApplication", back_populates="license_conditions")
+    application = relationship(
+        "LicenseApplication",
+        primaryjoin="foreign(LicenseCondition.application_id) == LicenseApplication.application_id",
+        back_populates="license_conditions"
+    )
     condition_type = relationship("LicenseConditionType", back_populates="license_conditions") 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Enum
+from sqlalchemy import Column, String, DateTime, Boolean, Enum, Index, false
 from sqlalchemy.sql import func
 from app.models.base import Base
 import enum
@@ -24,4 +24,12 @@ class EmailOTP(Base):
         if 'id' not in kwargs:
             import uuid
             kwargs['id'] = f"OTP_{uuid.uuid4().hex[:8].upper()}"
-        super().__init__(**kwargs) 
\ No newline at end of file
+        super().__init__(**kwargs)
+
+# Lookup in CRUDEmailOTP.verify_otp / get_by_email_and_type: only unused codes
+# (alembic revision 0003_hot_path_indexes)
+Index(
+    "ix_email_otps_active_lookup",
+    EmailOTP.email, EmailOTP.otp_type, EmailOTP.expires_at,
+    postgresql_where=EmailOTP.is_used == false()
+)
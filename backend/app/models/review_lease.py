@@ -0,0 +1,29 @@
+# app/models/review_lease.py
+from sqlalchemy import Column, String, Text, DateTime, CheckConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.models.base import Base
+import uuid
+
+class ReviewLease(Base):
+    __tablename__ = "reviewlease"
+
+    # Leased item: an application_id, or a document_id as text
+    queue = Column(Text, primary_key=True)
+    item_id = Column(String, primary_key=True)
+
+    # New on every claim, so a reviewer whose lease expired and was re-claimed
+    # can no longer renew or release it
+    lease_id = Column(UUID(as_uuid=True), nullable=False, unique=True, default=uuid.uuid4)
+    reviewer = Column(String, nullable=False)  # admin uuid
+    claimed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint(
+            "queue IN ('applications', 'documents')",
+            name="check_review_lease_queue"
+        ),
+        # A reviewer's leases (GET /admin/review-queue, heartbeats)
+        Index("ix_reviewlease_reviewer", "reviewer", "expires_at"),
+    )
@@ -1,9 +1,11 @@
 # app/schemas/admin.py
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from uuid import UUID
 from .application import LicenseApplicationResponse
 from .applicant import ApplicantResponse
+from .document import DocumentCompleteness, DocumentResponse
 
 class AdminBase(BaseModel):
     email: EmailStr
@@ -47,6 +49,39 @@ class DashboardStats(BaseModel):
 
 class AdminApplicationResponse(LicenseApplicationResponse):
     applicant: Optional[ApplicantResponse] = None
+    # Filled in by the application listings
+    document_completeness: Optional[DocumentCompleteness] = None
+
+class ReviewLeaseIds(BaseModel):
+    lease_ids: List[UUID]
+
+class ReviewLeaseResponse(BaseModel):
+    lease_id: UUID
+    queue: str
+    item_id: str
+    expires_at: datetime
+    # The claimed item, by queue
+    application: Optional[AdminApplicationResponse] = None
+    document: Optional[DocumentResponse] = None
+
+class ArchivedApplicationResponse(BaseModel):
+    archive_id: str
+    application_id: str
+    applicant_id: Optional[str] = None
+    application_type_id: Optional[str] = None
+    application_status_id: Optional[str] = None
+    submission_date: Optional[datetime] = None
+    last_updated_date: Optional[datetime] = None
+    rejection_reason: Optional[str] = None
+    additional_requirements: Optional[str] = None
+    archived_at: Optional[datetime] = None
+    
+    class Config:
+        orm_mode = True
+
+class ArchivedApplicationDetail(ArchivedApplicationResponse):
+    # Application row and child rows as archived (see app/crud/archive.py)
+    application_graph: Optional[Dict[str, Any]] = None
 
 class ApplicationApproval(BaseModel):
     license_number: str
@@ -61,4 +96,11 @@ class ApplicationRejection(BaseModel):
 class DocumentVerification(BaseModel):
     is_verified: bool
     verified_by: str
-    verification_notes: Optional[str] = None 
\ No newline at end of file
+    verification_notes: Optional[str] = None 
+
+class InstrumentationUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    slow_query_ms: Optional[float] = None
+    explain_slow_queries: Optional[bool] = None
+    detect_n_plus_one: Optional[bool] = None
+    n_plus_one_threshold: Optional[int] = None
@@ -1,7 +1,7 @@
 # app/schemas/applicant.py
 from pydantic import BaseModel, validator, EmailStr
 from datetime import date
-from typing import Optional
+from typing import Any, Dict, Optional
 from enum import Enum
 import re
 from .base import BaseSchema, TimestampMixin
@@ -215,3 +215,26 @@ class ApplicantProfile(ApplicantResponse):
     
     class Config:
         orm_mode = True
+
+def applicant_profile(applicant: Any) -> ApplicantProfile:
+    """Profile of an applicant row, with age and full_name filled in"""
+    profile = ApplicantProfile.model_validate(applicant, from_attributes=True)
+    if applicant.birthdate:
+        today = date.today()
+        profile.age = today.year - applicant.birthdate.year - (
+            (today.month, today.day) < (applicant.birthdate.month, applicant.birthdate.day)
+        )
+    profile.full_name = f"{applicant.first_name} {applicant.family_name}"
+    return profile
+
+def user_status(user_data: Dict[str, Any], applicant: Optional[Any]) -> Dict[str, Any]:
+    """Whether the authenticated user is an applicant yet (GET /applicants/status)"""
+    is_applicant = applicant is not None
+    return {
+        "user_id": user_data.get("id"),
+        "email": user_data.get("email"),
+        "is_applicant": is_applicant,
+        "applicant_id": applicant.applicant_id if is_applicant else None,
+        "message": "You can submit applications and manage your profile" if is_applicant
+                  else "Submit your first application to become an applicant"
+    }
@@ -1,9 +1,10 @@
 # app/schemas/application.py
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, EmailStr, validator
 from datetime import datetime, date
 from typing import Optional, List
+from uuid import UUID
 from enum import Enum
-from .base import BaseSchema, TimestampMixin
+from .base import BaseSchema, TimestampMixin, get_type_adapter
 from .applicant import CivilStatus, EducationalAttainment, BloodType, Sex
 
 class ApplicationCategory(str, Enum):
@@ -144,6 +145,18 @@ class CompleteApplicationCreate(BaseModel):
         #     raise ValueError('At least one document must be provided')
         return v
 
+def parse_complete_application(body: bytes) -> CompleteApplicationCreate:
+    """Parse and validate a submission straight from the raw JSON body in one pass"""
+    return get_type_adapter(CompleteApplicationCreate).validate_json(body)
+
+class BulkApplicationRecord(CompleteApplicationCreate):
+    """One line of a bulk import file (app/utils/bulk_import.py)"""
+    email: EmailStr
+    # Auth user (auth.users id) of a new applicant; found by email when missing
+    uuid: Optional[UUID] = None
+    application_status_id: str = "ASID_PEN"
+    submission_date: Optional[datetime] = None
+
 class CompleteApplicationResponse(BaseModel):
     """Response after successful complete application submission"""
     application_id: str
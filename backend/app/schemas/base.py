@@ -1,7 +1,8 @@
 # app/schemas/base.py
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 class BaseSchema(BaseModel):
     class Config:
@@ -10,4 +11,9 @@ class BaseSchema(BaseModel):
 
 class TimestampMixin(BaseModel):
     created_date: Optional[datetime] = None
-    last_updated_date: Optional[datetime] = None 
\ No newline at end of file
+    last_updated_date: Optional[datetime] = None
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter per type, built (and its validator compiled) once per process"""
+    return TypeAdapter(tp)
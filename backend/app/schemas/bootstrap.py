@@ -0,0 +1,18 @@
+# app/schemas/bootstrap.py
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from .applicant import ApplicantProfile
+from .application import LicenseApplicationResponse
+
+class ReferenceSectionResponse(BaseModel):
+    version: str
+    unchanged: bool = False
+    items: Optional[List[Dict[str, Any]]] = None  # None when unchanged
+
+class BootstrapResponse(BaseModel):
+    reference: Dict[str, ReferenceSectionResponse]
+    # Only for authenticated requests
+    user: Optional[Dict[str, Any]] = None
+    profile: Optional[ApplicantProfile] = None
+    applications: Optional[List[LicenseApplicationResponse]] = None
+    applications_total: Optional[int] = None
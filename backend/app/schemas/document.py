@@ -1,7 +1,8 @@
 # app/schemas/document.py
 from pydantic import BaseModel, validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+from uuid import UUID
 from .base import BaseSchema
 
 class DocumentUpload(BaseModel):
@@ -33,10 +34,23 @@ class DocumentCreate(BaseModel):
     verified_by: Optional[str] = None
 
 class DocumentResponse(BaseSchema):
-    document_id: str
+    document_id: UUID
     application_id: str
     document_type: str
     file_url: str
     uploaded_at: datetime
     is_verified: bool = False
     verified_by: Optional[str] = None
+
+class RequiredDocumentCount(BaseModel):
+    submitted: int = 0
+    verified: int = 0
+
+class DocumentCompleteness(BaseModel):
+    """Required documents of an application: how many are submitted and verified"""
+    required: int
+    submitted: int
+    verified: int
+    is_complete: bool  # every required document submitted and verified
+    # Per required document type
+    documents: Dict[str, RequiredDocumentCount]
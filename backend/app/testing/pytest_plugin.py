@@ -0,0 +1,46 @@
+# app/testing/pytest_plugin.py
+"""
+Pytest plugin enforcing the per-endpoint query budgets.
+
+Enable it in a conftest.py:
+
+    pytest_plugins = ["app.testing.pytest_plugin"]
+
+and wrap the request under test:
+
+    def test_admin_listing(client, admin_headers, query_budget):
+        with query_budget("GET", "/api/v1/admin/applications"):
+            client.get("/api/v1/admin/applications?limit=20", headers=admin_headers)
+
+The block fails when more statements run than QUERY_BUDGETS allows, listing
+every statement shape with its count. Tests that use their own engine
+override the `query_budget_engine` fixture. tests/test_query_budgets.py
+checks the reference scenario of each budget.
+"""
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import pytest
+
+from app.core.query_analysis import QueryLog, count_queries
+from app.testing.query_budgets import get_query_budget
+
+@pytest.fixture
+def query_budget_engine():
+    from app.core.database import engine
+    return engine
+
+@pytest.fixture
+def query_budget(query_budget_engine):
+    @contextmanager
+    def check(method: str, route: str, budget: Optional[int] = None) -> Iterator[QueryLog]:
+        limit = get_query_budget(method, route) if budget is None else budget
+        with count_queries(query_budget_engine) as queries:
+            yield queries
+        if queries.count > limit:
+            pytest.fail(
+                f"{method} {route} ran {queries.count} statements, budget is {limit}\n{queries.summary()}",
+                pytrace=False
+            )
+
+    return check
@@ -0,0 +1,161 @@
+# app/testing/query_budgets.py
+"""
+Maximum number of SQL statements per endpoint.
+
+Keys are "METHOD /route/template" for every route in app/api/v1/endpoints.
+Budgets are for the reference scenario used by endpoint tests:
+
+- an authenticated applicant who already exists (found by UUID)
+- list endpoints returning up to 20 rows; a list budget must not grow with
+  the number of rows, so rows serialized with lazy relationships fail it
+- submit-complete with two vehicle categories and one emergency contact
+- bulk admin actions with 5 application or document ids
+- writes that start with empty id pools, so a block of ids is reserved
+  (app/utils/id_allocation.py)
+
+Statements run by dependencies (applicant lookup) and by email queuing count
+towards the budget. Requests carry no Idempotency-Key; a key adds two
+statements (claiming it and storing the response, app/api/idempotency.py). Lower a budget whenever an endpoint gets cheaper;
+raising one needs a reason in the commit message.
+
+Budgets covered by tests/test_query_budgets.py (and the bootstrap and admin
+detail tests) are the counts measured against the synthetic dataset; the rest
+are upper estimates until a test measures them.
+
+Check that every route has a budget with `python -m app.testing.query_budgets`.
+"""
+from typing import Dict, List
+
+API = "/api/v1"
+
+QUERY_BUDGETS: Dict[str, int] = {
+    # public
+    f"GET {API}/public/": 0,
+    f"GET {API}/public/health": 0,
+    f"GET {API}/public/application-statuses": 1,
+    f"GET {API}/public/application-types": 1,
+    f"GET {API}/public/vehicle-categories": 1,
+    f"GET {API}/public/locations": 1,
+    f"GET {API}/public/organ-types": 1,
+
+    # bootstrap
+    # 8 measured; a full page of applications adds the count
+    f"GET {API}/bootstrap/": 9,
+
+    # auth-supabase
+    f"POST {API}/auth-supabase/sign-up-request": 3,
+    f"POST {API}/auth-supabase/login-request": 3,
+    f"POST {API}/auth-supabase/verify-otp": 6,
+    f"POST {API}/auth-supabase/refresh-token": 2,
+    f"GET {API}/auth-supabase/user-profile": 3,
+    f"GET {API}/auth-supabase/verify-token": 2,
+
+    # applicants
+    f"GET {API}/applicants/status": 1,
+    f"GET {API}/applicants/me": 1,
+    f"GET {API}/applicants/events": 2,
+    f"PUT {API}/applicants/me": 4,
+    f"POST {API}/applicants/family": 5,
+    f"GET {API}/applicants/family": 3,
+    f"POST {API}/applicants/employment": 4,
+    f"GET {API}/applicants/employment": 3,
+    f"POST {API}/applicants/emergency-contact": 4,
+    f"GET {API}/applicants/emergency-contacts": 3,
+    f"POST {API}/applicants/organ-donation": 10,
+    f"GET {API}/applicants/organ-donation": 4,
+
+    # applications
+    f"POST {API}/applications/submit-complete": 19,
+    f"POST {API}/applications/": 13,
+    f"GET {API}/applications/": 3,
+    f"GET {API}/applications/{{application_id}}": 2,
+    f"GET {API}/applications/{{application_id}}/history": 3,
+    f"GET {API}/applications/{{application_id}}/required-documents": 3,
+
+    # appointments
+    f"POST {API}/appointments/": 7,
+    f"GET {API}/appointments/": 2,
+    f"GET {API}/appointments/{{appointment_id}}": 2,
+    f"PUT {API}/appointments/{{appointment_id}}": 5,
+    f"DELETE {API}/appointments/{{appointment_id}}": 4,
+    f"GET {API}/appointments/locations/{{location_id}}/available-slots": 3,
+
+    # documents
+    f"POST {API}/documents/upload": 5,
+    f"GET {API}/documents/application/{{application_id}}": 3,
+    f"GET {API}/documents/{{document_id}}": 2,
+    f"DELETE {API}/documents/{{document_id}}": 4,
+
+    # admin
+    f"GET {API}/admin/dashboard": 8,
+    f"GET {API}/admin/applications": 3,
+    f"GET {API}/admin/applications/filtered": 3,
+    f"GET {API}/admin/applications/export": 1,
+    f"POST {API}/admin/applications/import": 23,
+    f"GET {API}/admin/applications/filter-options": 0,
+    f"GET {API}/admin/applications/{{application_id}}": 2,
+    f"GET {API}/admin/applications/{{application_id}}/detail": 12,
+    f"POST {API}/admin/applications/{{application_id}}/approve": 12,
+    f"POST {API}/admin/applications/bulk-approve": 43,
+    f"POST {API}/admin/applications/{{application_id}}/reject": 10,
+    f"POST {API}/admin/applications/bulk-reject": 33,
+    f"POST {API}/admin/applications/bulk-actions": 43,
+    f"GET {API}/admin/events": 0,
+    f"GET {API}/admin/documents/pending-verification": 3,
+    f"POST {API}/admin/documents/{{document_id}}/verify": 6,
+    f"POST {API}/admin/documents/bulk-verify": 4,
+    f"GET {API}/admin/review-queue": 2,
+    f"POST {API}/admin/review-queue/{{queue}}/claim": 2,
+    f"POST {API}/admin/review-queue/heartbeat": 1,
+    f"POST {API}/admin/review-queue/release": 1,
+    f"GET {API}/admin/analytics/trends": 2,
+    f"GET {API}/admin/analytics/demographics": 8,
+    f"GET {API}/admin/analytics/monthly/{{year}}": 2,
+    f"GET {API}/admin/system/health": 4,
+    f"GET {API}/admin/system/instrumentation": 0,
+    f"PUT {API}/admin/system/instrumentation": 0,
+    f"POST {API}/admin/generate-license-number": 2,
+    f"GET {API}/admin/archive/applications": 2,
+    f"GET {API}/admin/archive/applications/{{application_id}}": 1,
+}
+
+def budget_key(method: str, route: str) -> str:
+    return f"{method.upper()} {route}"
+
+def get_query_budget(method: str, route: str) -> int:
+    key = budget_key(method, route)
+    if key not in QUERY_BUDGETS:
+        raise KeyError(f"No query budget for {key}; add one to app/testing/query_budgets.py")
+    return QUERY_BUDGETS[key]
+
+def iter_api_routes():
+    """(method, full route template) for every v1 API route, taken from the OpenAPI schema"""
+    from app.main import app
+
+    for path, operations in app.openapi()["paths"].items():
+        if not path.startswith(API):
+            continue
+        for method in operations:
+            yield method.upper(), path
+
+def find_unbudgeted_routes() -> List[str]:
+    return [
+        budget_key(method, route)
+        for method, route in iter_api_routes()
+        if budget_key(method, route) not in QUERY_BUDGETS
+    ]
+
+def find_stale_budgets() -> List[str]:
+    routes = {budget_key(method, route) for method, route in iter_api_routes()}
+    return [key for key in QUERY_BUDGETS if key not in routes]
+
+if __name__ == "__main__":
+    import sys
+
+    missing = find_unbudgeted_routes()
+    stale = find_stale_budgets()
+    for key in missing:
+        print(f"missing query budget: {key}")
+    for key in stale:
+        print(f"budget for unknown route: {key}")
+    sys.exit(1 if missing or stale else 0)
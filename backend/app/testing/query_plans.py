@@ -0,0 +1,317 @@
+# app/testing/query_plans.py
+"""
+Check that the hot CRUD queries are served by an index.
+
+Seeds a skewed dataset into the database (most documents verified, most OTPs
+used, most outbox mail sent, as in production), runs ANALYZE, then calls the
+real CRUD functions and runs EXPLAIN on every SELECT they send. A check fails
+when any of those plans has a Seq Scan on a seeded table. Everything runs
+in one transaction and is rolled back at the end, so nothing persists.
+
+Run it against a scratch or staging database after `alembic upgrade head`,
+as a role allowed to set session_replication_role. Otherwise the applicant
+rows are rejected by the foreign key to auth.users, and every check that
+depends on them is skipped:
+
+    python -m app.testing.query_plans --applicants 20000
+
+Reference tables (applicationtype, applicationstatus, location) are read as
+they are and must have at least one row.
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, joinedload
+
+from app.crud import (
+    crud_admin,
+    crud_applicant,
+    crud_application,
+    crud_appointment,
+    crud_document,
+    crud_email_outbox,
+    crud_email_otp,
+    crud_emergency,
+    crud_employment,
+    crud_family,
+)
+from app.models.application import ApplicationStatusHistory
+from app.models.otp import OTPType
+
+# (table, rows per applicant, INSERT ... SELECT over generate_series(1, :rows)); parents first.
+# :n is the number of applicants.
+SEED_SQL: List[Tuple[str, int, str]] = [
+    ("applicant", 1, """
+        INSERT INTO applicant (uuid, applicant_id, email, family_name, first_name, contact_num)
+        SELECT gen_random_uuid(), 'APP_PLAN_' || g, 'plan' || g || '@example.com',
+               'Plan', 'Applicant ' || g, '+639' || lpad(g::text, 9, '0')
+        FROM generate_series(1, :rows) AS g
+    """),
+    ("licenseapplication", 2, """
+        WITH ref AS (
+            SELECT (SELECT array_agg(application_type_id) FROM applicationtype) AS types,
+                   (SELECT array_agg(application_status_id) FROM applicationstatus) AS statuses
+        )
+        INSERT INTO licenseapplication
+            (application_id, applicant_id, application_type_id, application_status_id, submission_date)
+        SELECT 'APPID_PLAN_' || g, 'APP_PLAN_' || (1 + g % :n),
+               types[1 + g % array_length(types, 1)],
+               statuses[1 + g % array_length(statuses, 1)],
+               now() - g * interval '5 minutes'
+        FROM ref, generate_series(1, :rows) AS g
+    """),
+    ("applicationstatushistory", 6, """
+        WITH ref AS (SELECT array_agg(application_status_id) AS statuses FROM applicationstatus)
+        INSERT INTO applicationstatushistory
+            (history_id, application_id, application_status_id, status_change_date, changed_by)
+        SELECT 'SHID_PLAN_' || g, 'APPID_PLAN_' || (1 + g % (:n * 2)),
+               statuses[1 + g % array_length(statuses, 1)],
+               now() - g * interval '1 minute', 'query_plans'
+        FROM ref, generate_series(1, :rows) AS g
+    """),
+    ("applicationvehiclecategory", 2, """
+        WITH ref AS (SELECT array_agg(category_id) AS categories FROM vehiclecategory)
+        INSERT INTO applicationvehiclecategory (app_vehicle_id, application_id, category_id, clutch_type)
+        SELECT 'AVID_PLAN_' || g, 'APPID_PLAN_' || g,
+               categories[1 + g % array_length(categories, 1)], 'Manual'
+        FROM ref, generate_series(1, :rows) AS g
+    """),
+    ("submitteddocuments", 8, """
+        INSERT INTO submitteddocuments (document_id, application_id, document_type, file_url, uploaded_at, is_verified)
+        SELECT gen_random_uuid(), 'APPID_PLAN_' || (1 + g % (:n * 2)),
+               (ARRAY['valid_id', 'medical_certificate', 'birth_certificate', 'photo'])[1 + g % 4],
+               'uploads/plan/' || g, now() - g * interval '1 minute',
+               g % 50 <> 0
+        FROM generate_series(1, :rows) AS g
+    """),
+    ("appointment", 2, """
+        WITH ref AS (SELECT array_agg(location_id) AS locations FROM location)
+        INSERT INTO appointment (appointment_id, application_id, location_id, appointment_date, appointment_time, status)
+        SELECT 'APNID_PLAN_' || g, 'APPID_PLAN_' || g,
+               locations[1 + g % array_length(locations, 1)],
+               current_date - 365 + g % 500, time '09:00' + (g % 14) * interval '30 minutes',
+               CASE WHEN g % 10 = 0 THEN 'Scheduled' ELSE 'Completed' END
+        FROM ref, generate_series(1, :rows) AS g
+    """),
+    ("familyinformation", 2, """
+        INSERT INTO familyinformation (family_info_id, applicant_id, relation_type, family_name, first_name)
+        SELECT 'FID_PLAN_' || g, 'APP_PLAN_' || (1 + g % :n),
+               CASE WHEN g % 2 = 0 THEN 'Mother' ELSE 'Father' END, 'Plan', 'Parent ' || g
+        FROM generate_series(1, :rows) AS g
+    """),
+    ("emergencycontact", 1, """
+        INSERT INTO emergencycontact (contact_id, applicant_id, ec_name, ec_contact_no)
+        SELECT 'ECID_PLAN_' || g, 'APP_PLAN_' || g, 'Contact ' || g, '+639' || lpad(g::text, 9, '0')
+        FROM generate_series(1, :rows) AS g
+    """),
+    ("employment", 1, """
+        INSERT INTO employment (employment_id, applicant_id, employer_name)
+        SELECT 'EMP_PLAN_' || g, 'APP_PLAN_' || g, 'Employer ' || g
+        FROM generate_series(1, :rows) AS g
+    """),
+    ("email_otps", 5, """
+        INSERT INTO email_otps (id, email, otp_code, otp_type, is_used, expires_at)
+        SELECT 'OTP_PLAN_' || g, 'plan' || (1 + g % :n) || '@example.com', lpad((g % 10000)::text, 4, '0'),
+               ((ARRAY['REGISTRATION', 'LOGIN', 'PASSWORD_RESET'])[1 + g % 3])::otptype,
+               g % 20 <> 0, now() - interval '1 day' + (g % 2) * interval '2 days'
+        FROM generate_series(1, :rows) AS g
+    """),
+    ("emailoutbox", 5, """
+        INSERT INTO emailoutbox (id, to_email, subject, html_content, status, attempts, next_attempt_at, sent_at)
+        SELECT 'MAIL_PLAN_' || g, 'plan' || (1 + g % :n) || '@example.com', 'Plan', '<p>plan</p>',
+               CASE WHEN g % 100 = 0 THEN 'Pending' ELSE 'Sent' END, 1,
+               now() - g * interval '1 minute', now() - g * interval '1 minute'
+        FROM generate_series(1, :rows) AS g
+    """),
+]
+
+SEEDED_TABLES = [table for table, _, _ in SEED_SQL]
+
+# the seeded row every lookup asks for
+APPLICANT_ID = "APP_PLAN_7"
+APPLICATION_ID = "APPID_PLAN_7"
+EMAIL = "plan7@example.com"
+
+@dataclass
+class PlanCheck:
+    name: str
+    tables: List[str]
+    run: Callable[[Session, Dict[str, Any]], Any]
+
+def _status_history(db: Session, application_id: str):
+    """The query behind GET /applications/{application_id}/history"""
+    return db.query(ApplicationStatusHistory).options(
+        joinedload(ApplicationStatusHistory.status)
+    ).filter(
+        ApplicationStatusHistory.application_id == application_id
+    ).order_by(ApplicationStatusHistory.status_change_date).all()
+
+PLAN_CHECKS: List[PlanCheck] = [
+    PlanCheck("application.get_by_applicant", ["licenseapplication"],
+              lambda db, ref: crud_application.get_by_applicant(db, applicant_id=APPLICANT_ID)),
+    PlanCheck("application.get_submission_state", ["licenseapplication"],
+              lambda db, ref: crud_application.get_submission_state(
+                  db, applicant_id=APPLICANT_ID, application_type_id=ref["application_type_id"])),
+    PlanCheck("application.get_by_status", ["licenseapplication"],
+              lambda db, ref: crud_application.get_by_status(db, status_id=ref["status_id"], limit=20)),
+    PlanCheck("admin.get_all_applications_admin", ["licenseapplication", "applicant"],
+              lambda db, ref: crud_admin.get_all_applications_admin(db, limit=20)),
+    PlanCheck("application status history", ["applicationstatushistory"],
+              lambda db, ref: _status_history(db, APPLICATION_ID)),
+    PlanCheck("document.get_by_application", ["submitteddocuments"],
+              lambda db, ref: crud_document.get_by_application(db, application_id=APPLICATION_ID)),
+    PlanCheck("document.get_completeness", ["submitteddocuments"],
+              lambda db, ref: crud_document.get_completeness(db, type_categories={APPLICATION_ID: None})),
+    PlanCheck("document.get_by_type", ["submitteddocuments"],
+              lambda db, ref: crud_document.get_by_type(db, application_id=APPLICATION_ID, document_type="photo")),
+    PlanCheck("admin.get_pending_verifications", ["submitteddocuments", "licenseapplication"],
+              lambda db, ref: crud_admin.get_pending_verifications(db, limit=20)),
+    PlanCheck("appointment.get_by_date", ["appointment"],
+              lambda db, ref: crud_appointment.get_by_date(
+                  db, appointment_date=ref["appointment_date"], location_id=ref["location_id"])),
+    PlanCheck("appointment.get_available_slots", ["appointment"],
+              lambda db, ref: crud_appointment.get_available_slots(
+                  db, location_id=ref["location_id"], appointment_date=ref["appointment_date"])),
+    PlanCheck("appointment.get_by_application", ["appointment"],
+              lambda db, ref: crud_appointment.get_by_application(db, application_id=APPLICATION_ID)),
+    PlanCheck("applicant.get_by_email", ["applicant"],
+              lambda db, ref: crud_applicant.get_by_email(db, email=EMAIL)),
+    PlanCheck("email_otp.get_by_email_and_type", ["email_otps"],
+              lambda db, ref: crud_email_otp.get_by_email_and_type(db, email=EMAIL, otp_type=OTPType.LOGIN)),
+    PlanCheck("email_otp.verify_otp", ["email_otps"],
+              lambda db, ref: crud_email_otp.verify_otp(db, email=EMAIL, otp_code="0007", otp_type=OTPType.LOGIN)),
+    PlanCheck("email_outbox.claim_batch", ["emailoutbox"],
+              lambda db, ref: crud_email_outbox.claim_batch(db, limit=50, lease_seconds=60)),
+    PlanCheck("family.get_by_applicant", ["familyinformation"],
+              lambda db, ref: crud_family.get_by_applicant(db, applicant_id=APPLICANT_ID)),
+    PlanCheck("emergency.get_by_applicant", ["emergencycontact"],
+              lambda db, ref: crud_emergency.get_by_applicant(db, applicant_id=APPLICANT_ID)),
+    PlanCheck("employment.get_by_applicant", ["employment"],
+              lambda db, ref: crud_employment.get_by_applicant(db, applicant_id=APPLICANT_ID)),
+]
+
+def _savepoint(connection: Connection, sql: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Run `sql` in a savepoint; returns the error message instead of raising"""
+    savepoint = connection.begin_nested()
+    try:
+        connection.execute(text(sql), params or {})
+    except Exception as exc:
+        savepoint.rollback()
+        return str(getattr(exc, "orig", exc)).strip().splitlines()[0]
+    savepoint.commit()
+    return None
+
+def seed(connection: Connection, applicants: int) -> Dict[str, str]:
+    """Insert the dataset; returns {table: error} for tables that could not be seeded"""
+    failed: Dict[str, str] = {}
+    replica_error = _savepoint(connection, "SET LOCAL session_replication_role = replica")
+    if replica_error:
+        print(f"foreign keys stay enforced: {replica_error}")
+
+    for table, per_applicant, sql in SEED_SQL:
+        count = applicants * per_applicant
+        error = _savepoint(connection, sql, {"rows": count, "n": applicants})
+        if error:
+            failed[table] = error
+            print(f"seed  {table}: {error}")
+        else:
+            print(f"seed  {table}: {count} rows")
+
+    connection.execute(text("ANALYZE " + ", ".join(table for table in SEEDED_TABLES if table not in failed)))
+    return failed
+
+def reference_values(connection: Connection) -> Dict[str, Any]:
+    """Lookup values that hit seeded rows"""
+    status_id = connection.execute(text("SELECT min(application_status_id) FROM applicationstatus")).scalar()
+    row = connection.execute(text(
+        "SELECT location_id, appointment_date FROM appointment WHERE appointment_id = 'APNID_PLAN_7'"
+    )).first()
+    location_id, appointment_date = row if row else (None, date.today() + timedelta(days=7))
+    application_type_id = connection.execute(text(
+        "SELECT application_type_id FROM licenseapplication WHERE application_id = :application_id"
+    ), {"application_id": APPLICATION_ID}).scalar()
+    return {
+        "status_id": status_id,
+        "location_id": location_id,
+        "appointment_date": appointment_date,
+        "application_type_id": application_type_id,
+    }
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+def _seeded_table(relation: Optional[str]) -> Optional[str]:
+    """The seeded table `relation` is, or is a partition of (app/utils/partitions.py naming)"""
+    for table in SEEDED_TABLES:
+        if relation == table or (relation or "").startswith((f"{table}_p", f"{table}_default")):
+            return table
+    return None
+
+def explain(connection: Connection, statement: str, parameters: Any) -> Dict[str, Any]:
+    result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    return result[0]["Plan"]
+
+def run_check(connection: Connection, check: PlanCheck, ref: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Run one check; returns (seq scans on seeded tables, indexes used)"""
+    captured: List[Tuple[str, Any]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            check.run(db, ref)
+        finally:
+            db.close()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    seq_scans, indexes = [], []
+    for statement, parameters in captured:
+        for node in _plan_nodes(explain(connection, statement, parameters)):
+            table = _seeded_table(node.get("Relation Name"))
+            if node["Node Type"] == "Seq Scan" and table:
+                seq_scans.append(table)
+            if node.get("Index Name"):
+                indexes.append(node["Index Name"])
+    return seq_scans, indexes
+
+def main(applicants: int) -> int:
+    from app.core.database import engine
+
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            failed_seeds = seed(connection, applicants)
+            ref = reference_values(connection)
+            for check in PLAN_CHECKS:
+                missing = [table for table in check.tables if table in failed_seeds]
+                if missing:
+                    print(f"skip  {check.name} (not seeded: {', '.join(missing)})")
+                    continue
+                seq_scans, indexes = run_check(connection, check, ref)
+                if seq_scans:
+                    failures += 1
+                    print(f"FAIL  {check.name}: Seq Scan on {', '.join(sorted(set(seq_scans)))}")
+                else:
+                    print(f"ok    {check.name}: {', '.join(dict.fromkeys(indexes)) or 'no scan'}")
+        finally:
+            transaction.rollback()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that CRUD queries use indexes on a seeded dataset")
+    parser.add_argument("--applicants", type=int, default=20000, help="seeded applicants; other tables scale from it")
+    args = parser.parse_args()
+    sys.exit(main(args.applicants))
@@ -0,0 +1,130 @@
+# app/utils/archival.py
+"""
+Moves finalized applications out of the hot tables.
+
+Approved and rejected applications whose last update is older than
+ARCHIVE_RETENTION_DAYS are copied into archivedapplications (stub columns
+plus the whole application graph) and deleted from licenseapplication and
+its child tables, ARCHIVE_BATCH_SIZE applications per transaction
+(crud_archive.archive_batch).
+
+- Resumable: each batch commits on its own and candidates are picked by
+  status and age, so an interrupted run simply continues with the next batch.
+- Throttled: ARCHIVE_PAUSE_SECONDS between batches, rows in use are skipped
+  (SKIP LOCKED) and lock waits give up after ARCHIVE_LOCK_TIMEOUT_MS, so it can
+  run during business hours.
+
+Admins read archived applications through GET /admin/archive/applications.
+
+Run a backlog by hand from the backend directory:
+
+    python -m app.utils.archival --retention-days 365 --batch-size 200 --pause 1
+
+or set ARCHIVE_ENABLED=true to let each app worker archive in the background.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.archive import crud_archive
+
+logger = logging.getLogger(__name__)
+
+def archive_once(retention_days: Optional[int] = None, batch_size: Optional[int] = None) -> int:
+    """Archive one batch; returns the number of applications archived"""
+    retention_days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+    finalized_before = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    db = SessionLocal()
+    try:
+        archived = crud_archive.archive_batch(
+            db,
+            finalized_before=finalized_before,
+            batch_size=batch_size or settings.ARCHIVE_BATCH_SIZE,
+            lock_timeout_ms=settings.ARCHIVE_LOCK_TIMEOUT_MS
+        )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return len(archived)
+
+class ArchivalWorker:
+    """Background task archiving finalized applications one throttled batch at a time"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop"""
+        if self.is_running:
+            return
+        if not settings.ARCHIVE_ENABLED:
+            logger.info("Application archival disabled")
+            return
+
+        self._stop = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Application archival started")
+
+    async def stop(self) -> None:
+        """Finish the current batch, then stop"""
+        if not self._task:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                archived = await run_in_threadpool(archive_once)
+            except Exception as e:
+                logger.warning(f"Archival batch failed: {str(e)}")
+                archived = 0
+
+            if archived:
+                logger.info(f"Archived {archived} application(s)")
+            # Nothing left to archive: check again much later
+            delay = settings.ARCHIVE_PAUSE_SECONDS if archived else settings.ARCHIVE_IDLE_SECONDS
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+# Global instance
+archival_worker = ArchivalWorker()
+
+def run(retention_days: int, batch_size: int, pause: float, max_batches: Optional[int]) -> int:
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        archived = archive_once(retention_days, batch_size)
+        if not archived:
+            break
+        total += archived
+        batches += 1
+        print(f"batch {batches}: {archived} archived ({total} total)")
+        time.sleep(pause)
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive finalized applications")
+    parser.add_argument("--retention-days", type=int, default=settings.ARCHIVE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=settings.ARCHIVE_PAUSE_SECONDS, help="seconds between batches")
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+    archived = run(args.retention_days, args.batch_size, args.pause, args.max_batches)
+    print(f"{archived} application(s) archived")
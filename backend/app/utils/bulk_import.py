@@ -0,0 +1,309 @@
+# app/utils/bulk_import.py
+"""
+Bulk import of application records.
+
+Input is JSON Lines, one BulkApplicationRecord per line: the
+CompleteApplicationCreate payload of POST /applications/submit-complete plus
+the applicant's `email` (and optionally `uuid`, `application_status_id` and
+`submission_date` for legacy records).
+
+- Validation runs in BULK_IMPORT_WORKERS worker processes, one chunk of
+  BULK_IMPORT_CHUNK_SIZE lines at a time, while the main process loads the
+  previous chunk.
+- Loading (crud_bulk_import.load_chunk) COPYs each chunk into staging tables
+  and merges them into applicant, licenseapplication, status history, vehicle
+  categories, driving skill, emergency contacts, employment and family
+  information with one statement per table, one transaction per chunk.
+- Rejected lines (invalid records, unknown type/status/category ids, new
+  applicants without an auth user, applicants that could not be created,
+  second active applications of a type, chunks whose transaction failed)
+  are reported with their line number, errors and the line as read, so the
+  error file can be fixed and imported again; the rest is imported.
+
+Existing applicants are matched by email and their personal details updated,
+as submit-complete does. A new applicant needs a Supabase auth user, since
+applicant.uuid references auth.users(id): the record's `uuid`, or else the
+auth user with the record's email. Records of new applicants with neither
+are rejected; create their users in Supabase first. Of the submission rules
+of submit-complete only the one the database enforces applies (one active
+application per applicant and type); the others, such as the renewal window,
+are not applied: imported records describe applications that already exist
+on paper. Documents, license conditions and organ donation records are not
+imported.
+
+From the backend directory:
+
+    python -m app.utils.bulk_import records.jsonl --errors rejected.jsonl --workers 8
+
+or POST the file to /admin/applications/import.
+"""
+import argparse
+import logging
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import orjson
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.bulk_import import PERSONAL_FIELDS, crud_bulk_import
+from app.schemas.application import BulkApplicationRecord
+from app.schemas.base import get_type_adapter
+from app.schemas.emergency import EmergencyContactBase
+from app.schemas.employment import EmploymentBase
+from app.schemas.family import FamilyInformationBase
+
+logger = logging.getLogger(__name__)
+
+# additional_data.drivingSkill -> drivingskill.acquisition_type (as in submit-complete)
+ACQUISITION_TYPES = {
+    "driving_school": "LTO-Accredited Driving School",
+    "tesda": "TESDA",
+    "private": "Private Licensed Person",
+}
+DEFAULT_ACQUISITION_TYPE = "LTO-Accredited Driving School"
+
+Chunk = List[Tuple[int, bytes]]
+
+# Reference ids, set in each worker process by _init_worker
+_reference_ids: Dict[str, Set[str]] = {}
+
+class RecordError(Exception):
+    """A record that failed validation, with its errors as {"loc", "msg"} dicts"""
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__(errors)
+        self.errors = errors
+
+def _init_worker(reference_ids: Dict[str, Set[str]]) -> None:
+    global _reference_ids
+    _reference_ids = reference_ids
+
+def _errors(error: ValidationError, loc: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    return [{"loc": [*loc, *err["loc"]], "msg": err["msg"]} for err in error.errors()]
+
+def _reference_errors(record: BulkApplicationRecord) -> List[Dict[str, Any]]:
+    errors = []
+    if record.application_type_id not in _reference_ids["application_types"]:
+        errors.append({"loc": ["application_type_id"], "msg": f"Application type {record.application_type_id} not found"})
+    if record.application_status_id not in _reference_ids["application_statuses"]:
+        errors.append({"loc": ["application_status_id"], "msg": f"Application status {record.application_status_id} not found"})
+    for i, category_id in enumerate(record.vehicle_categories):
+        if category_id not in _reference_ids["vehicle_categories"]:
+            errors.append({"loc": ["vehicle_categories", i], "msg": f"Vehicle category {category_id} not found"})
+    return errors
+
+def _to_row(record: BulkApplicationRecord) -> Dict[str, Any]:
+    """Plain values for crud_bulk_import.load_chunk; nested contacts are validated here"""
+    emergency_contacts, employment, family = [], [], []
+    for i, contact in enumerate(record.emergency_contacts or []):
+        try:
+            contact = EmergencyContactBase(**contact)
+        except ValidationError as e:
+            raise RecordError(_errors(e, ("emergency_contacts", i)))
+        emergency_contacts.append((contact.ec_name, contact.ec_address, contact.ec_contact_no))
+    for i, job in enumerate(record.employment_info or []):
+        try:
+            job = EmploymentBase(
+                employer_name=job.get("employer_business_name", ""),
+                employer_tel_no=job.get("employer_telephone", ""),
+                employer_address=job.get("employer_address", "")
+            )
+        except ValidationError as e:
+            raise RecordError(_errors(e, ("employment_info", i)))
+        employment.append((job.employer_name, job.employer_tel_no, job.employer_address))
+    for i, member in enumerate(record.family_info or []):
+        try:
+            member = FamilyInformationBase(**member)
+        except ValidationError as e:
+            raise RecordError(_errors(e, ("family_info", i)))
+        family.append((member.relation_type.value, member.family_name, member.first_name, member.middle_name, member.is_deceased))
+
+    personal_info = record.personal_info.model_dump(mode="json")
+    skill = (record.additional_data or {}).get("drivingSkill")
+    return {
+        "email": record.email,
+        "uuid": str(record.uuid) if record.uuid else None,
+        "personal_info": tuple(personal_info[field] for field in PERSONAL_FIELDS),
+        "application": (
+            record.application_type_id,
+            record.application_status_id,
+            record.additional_requirements,
+            record.submission_date.isoformat() if record.submission_date else None,
+        ),
+        "acquisition_type": ACQUISITION_TYPES.get(skill, DEFAULT_ACQUISITION_TYPE),
+        "vehicles": [
+            (category_id, clutch_type.value)
+            for category_id, clutch_type in zip(record.vehicle_categories, record.clutch_types)
+        ],
+        "emergency_contacts": emergency_contacts,
+        "employment": employment,
+        "family": family,
+    }
+
+def validate_chunk(chunk: Chunk) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Validate raw lines; returns (rows to load, rejected lines with their
+    errors). Rows keep their line as read in "record", for rejects of the load.
+    """
+    adapter = get_type_adapter(BulkApplicationRecord)
+    rows, rejected = [], []
+    for line, raw in chunk:
+        record_text = raw.decode("utf-8", errors="replace")
+        try:
+            record = adapter.validate_json(raw)
+            errors = _reference_errors(record)
+            if not errors:
+                rows.append({"line": line, "record": record_text, **_to_row(record)})
+                continue
+        except ValidationError as e:
+            errors = _errors(e)
+        except RecordError as e:
+            errors = e.errors
+        rejected.append({"line": line, "errors": errors, "record": record_text})
+    return rows, rejected
+
+def _chunks(lines: Iterable[bytes], chunk_size: int) -> Iterator[Chunk]:
+    chunk: Chunk = []
+    for line_number, raw in enumerate(lines, start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        chunk.append((line_number, raw))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class _InlineExecutor:
+    """Validation in the calling process (workers <= 1)"""
+
+    def __init__(self, reference_ids: Dict[str, Set[str]]):
+        _init_worker(reference_ids)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future: Future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        pass
+
+def import_applications(
+    lines: Iterable[bytes],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    on_rejected: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Import JSONL records from `lines`. Every rejected line is passed to
+    `on_rejected` as {"line", "errors", "record"}. Returns the totals and the
+    import rate.
+    """
+    workers = workers or settings.BULK_IMPORT_WORKERS
+    chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK_SIZE
+    totals = {"received": 0, "imported": 0, "rejected": 0}
+
+    def reject(entries: List[Dict[str, Any]]) -> None:
+        totals["rejected"] += len(entries)
+        if on_rejected:
+            for entry in entries:
+                on_rejected(entry)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        reference_ids = crud_bulk_import.get_reference_ids(db)
+        with_auth_users = crud_bulk_import.has_auth_users(db)
+        db.rollback()
+        if workers > 1:
+            # spawn: the caller may be a threaded server process
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(reference_ids,)
+            )
+        else:
+            executor = _InlineExecutor(reference_ids)
+
+        def load(future: Future) -> None:
+            rows, rejected = future.result()
+            reject(rejected)
+            records = {row["line"]: row["record"] for row in rows}
+
+            def load_errors(lines: Iterable[int], loc: List[Any], msg: str) -> List[Dict[str, Any]]:
+                return [{"line": line, "errors": [{"loc": loc, "msg": msg}], "record": records[line]} for line in lines]
+
+            try:
+                result = crud_bulk_import.load_chunk(db, records=rows, with_auth_users=with_auth_users)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Bulk import chunk failed: {str(e)}")
+                reject(load_errors(records, [], f"Chunk failed to load: {str(e)}"))
+                return
+            totals["imported"] += result["imported"]
+            reject(
+                load_errors(result["rejected_lines"], ["uuid"], "UUID already belongs to another applicant")
+                + load_errors(
+                    result["active_conflict_lines"], ["application_type_id"],
+                    "Applicant already has an active application of this type"
+                )
+                + load_errors(
+                    result["no_auth_user_lines"], ["email"],
+                    "No auth user for this email; create the Supabase user first or pass its uuid"
+                )
+            )
+            logger.info(f"Bulk import: {totals['imported']} imported, {totals['rejected']} rejected")
+
+        # Keep a few chunks validating while the oldest one loads
+        pending: deque = deque()
+        try:
+            for chunk in _chunks(lines, chunk_size):
+                totals["received"] += len(chunk)
+                pending.append(executor.submit(validate_chunk, chunk))
+                if len(pending) > workers:
+                    load(pending.popleft())
+            while pending:
+                load(pending.popleft())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        db.close()
+
+    seconds = time.perf_counter() - started
+    return {
+        **totals,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(totals["imported"] / seconds, 1) if seconds else 0.0,
+    }
+
+def run(path: str, errors_path: str, workers: int, chunk_size: int) -> Dict[str, Any]:
+    with open(path, "rb") as source, open(errors_path, "wb") as errors_file:
+        return import_applications(
+            source,
+            workers=workers,
+            chunk_size=chunk_size,
+            on_rejected=lambda entry: errors_file.write(orjson.dumps(entry) + b"\n")
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import application records (JSON Lines)")
+    parser.add_argument("path", help="JSONL file, one BulkApplicationRecord per line")
+    parser.add_argument("--errors", default="rejected.jsonl", help="file for rejected lines (JSONL)")
+    parser.add_argument("--workers", type=int, default=settings.BULK_IMPORT_WORKERS, help="validation processes")
+    parser.add_argument("--chunk-size", type=int, default=settings.BULK_IMPORT_CHUNK_SIZE, help="lines per transaction")
+    args = parser.parse_args()
+    summary = run(args.path, args.errors, args.workers, args.chunk_size)
+    print(
+        f"{summary['imported']} imported, {summary['rejected']} rejected of {summary['received']} "
+        f"in {summary['seconds']}s ({summary['rows_per_second']} rows/s); rejected lines in {args.errors}"
+    )
+    sys.exit(1 if summary["rejected"] else 0)
@@ -0,0 +1,79 @@
+# app/utils/debug_smtp.py
+"""
+Local debugging SMTP server.
+
+Accepts every message and keeps it in memory instead of delivering it, so the
+email outbox can be exercised without a real mail provider. Point the backend
+at it with:
+
+    SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_TLS=false
+
+Run standalone with `python -m app.utils.debug_smtp --port 1025`.
+"""
+import argparse
+import logging
+import time
+from email import message_from_bytes
+from email.policy import default as default_policy
+from typing import List, Dict, Any
+
+from aiosmtpd.controller import Controller
+
+logger = logging.getLogger(__name__)
+
+class DebugSMTPHandler:
+    """Collects received messages"""
+
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []
+
+    async def handle_DATA(self, server, session, envelope):
+        message = message_from_bytes(envelope.content, policy=default_policy)
+        self.messages.append({
+            "mail_from": envelope.mail_from,
+            "rcpt_tos": list(envelope.rcpt_tos),
+            "subject": message["Subject"],
+            "message": message,
+            "received_at": time.time()
+        })
+        logger.info(f"Debug SMTP received '{message['Subject']}' for {', '.join(envelope.rcpt_tos)}")
+        return "250 Message accepted for delivery"
+
+class DebugSMTPServer:
+    """In-process SMTP server for development and tests"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025):
+        self.handler = DebugSMTPHandler()
+        self.controller = Controller(self.handler, hostname=host, port=port)
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        return self.handler.messages
+
+    def start(self) -> "DebugSMTPServer":
+        self.controller.start()
+        return self
+
+    def stop(self) -> None:
+        self.controller.stop()
+
+    def __enter__(self) -> "DebugSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the MadaLTO debugging SMTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = DebugSMTPServer(args.host, args.port).start()
+    logger.info(f"Debug SMTP server listening on {args.host}:{args.port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
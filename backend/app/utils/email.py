@@ -1,143 +1,174 @@
 # app/utils/email.py
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Optional, Iterable, Dict, Any
 import logging
 from app.core.config import settings
+from app.utils.email_templates import email_templates, RenderedEmail, STATUS_LABELS
 
 logger = logging.getLogger(__name__)
 
+def is_smtp_configured() -> bool:
+    """
+    Check whether an SMTP server has been configured. Only SMTP_HOST is
+    required: SMTP_USER and SMTP_PASSWORD are sent when set, so relays that
+    take no login (like app/utils/debug_smtp.py) work too.
+    """
+    return bool(settings.SMTP_HOST)
+
+def build_message(
+    to_email: str,
+    subject: str,
+    html_content: str,
+    text_content: Optional[str] = None
+) -> MIMEMultipart:
+    """Build a multipart email message"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL or settings.SMTP_USER}>"
+    msg['To'] = to_email
+    
+    # Add text content
+    if text_content:
+        text_part = MIMEText(text_content, 'plain')
+        msg.attach(text_part)
+    
+    # Add HTML content
+    html_part = MIMEText(html_content, 'html')
+    msg.attach(html_part)
+    
+    return msg
+
 def send_email(
     to_email: str,
     subject: str,
     html_content: str,
     text_content: Optional[str] = None
 ) -> bool:
-    """Send email using SMTP"""
+    """
+    Queue email for delivery.
+    The message is written to the email outbox and sent by the background
+    outbox worker, so callers never wait on the SMTP server.
+    """
     
-    if not settings.SMTP_HOST or not settings.SMTP_USER or not settings.SMTP_PASSWORD:
+    if not is_smtp_configured():
         logger.warning("Email settings not configured. Email not sent.")
         # For development, just log the email content
         logger.info(f"Would send email to {to_email}: {subject}")
         logger.info(f"Content: {html_content}")
         return True
     
+    from app.core.database import SessionLocal
+    from app.crud.email_outbox import crud_email_outbox
+    from app.utils.email_outbox import email_outbox_worker
+    
+    db = SessionLocal()
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"{settings.EMAILS_FROM_NAME} <{settings.EMAILS_FROM_EMAIL or settings.SMTP_USER}>"
-        msg['To'] = to_email
-        
-        # Add text content
-        if text_content:
-            text_part = MIMEText(text_content, 'plain')
-            msg.attach(text_part)
-        
-        # Add HTML content
-        html_part = MIMEText(html_content, 'html')
-        msg.attach(html_part)
-        
-        # Send email
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            if settings.SMTP_TLS:
-                server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-        
-        logger.info(f"Email sent successfully to {to_email}")
-        return True
-        
+        message = crud_email_outbox.enqueue(
+            db,
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content
+        )
+        logger.info(f"Email {message.id} queued for {to_email}")
     except Exception as e:
-        logger.error(f"Failed to send email to {to_email}: {str(e)}")
+        db.rollback()
+        logger.error(f"Failed to queue email to {to_email}: {str(e)}")
         return False
+    finally:
+        db.close()
+    
+    email_outbox_worker.notify()
+    return True
 
-def send_otp_email(email: str, otp_code: str, otp_type: str) -> bool:
-    """Send OTP verification email"""
+def send_bulk_emails(messages: Iterable[RenderedEmail]) -> int:
+    """Queue many rendered emails in a single transaction. Returns the number queued."""
     
-    subject_map = {
-        "registration": "Complete Your MadaLTO Registration",
-        "login": "MadaLTO Login Verification",
-        "password_reset": "Reset Your MadaLTO Password"
-    }
+    messages = list(messages)
+    if not messages:
+        return 0
     
-    subject = subject_map.get(otp_type, "MadaLTO Verification Code")
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>{subject}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background-color: #1e40af; color: white; padding: 20px; text-align: center; }}
-            .content {{ padding: 20px; background-color: #f9fafb; }}
-            .otp-code {{ 
-                background-color: #1e40af; 
-                color: white; 
-                padding: 15px 30px; 
-                font-size: 24px; 
-                font-weight: bold; 
-                text-align: center; 
-                margin: 20px 0; 
-                border-radius: 8px;
-                letter-spacing: 3px;
-            }}
-            .footer {{ padding: 20px; text-align: center; font-size: 12px; color: #666; }}
-            .warning {{ color: #dc2626; font-weight: bold; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>MadaLTO System</h1>
-            </div>
-            <div class="content">
-                <h2>Verification Code</h2>
-                <p>Hello,</p>
-                <p>You have requested a verification code for your MadaLTO account. Please use the following code to complete your {otp_type}:</p>
-                
-                <div class="otp-code">{otp_code}</div>
-                
-                <p><strong>This code will expire in {settings.OTP_EXPIRE_MINUTES} minutes.</strong></p>
-                
-                <p class="warning">⚠️ Do not share this code with anyone. MadaLTO staff will never ask for your verification code.</p>
-                
-                <p>If you did not request this code, please ignore this email or contact our support team.</p>
-                
-                <p>Thank you,<br>
-                The MadaLTO Team</p>
-            </div>
-            <div class="footer">
-                <p>This is an automated message. Please do not reply to this email.</p>
-                <p>&copy; 2024 MadaLTO System. All rights reserved.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    if not is_smtp_configured():
+        logger.warning("Email settings not configured. Emails not sent.")
+        for message in messages:
+            logger.info(f"Would send email to {message.to_email}: {message.subject}")
+        return len(messages)
     
-    text_content = f"""
-    MadaLTO System - Verification Code
+    from app.core.database import SessionLocal
+    from app.crud.email_outbox import crud_email_outbox
+    from app.utils.email_outbox import email_outbox_worker
     
-    Hello,
+    db = SessionLocal()
+    try:
+        count = crud_email_outbox.enqueue_many(
+            db,
+            messages=[
+                {
+                    "to_email": message.to_email,
+                    "subject": message.subject,
+                    "html_content": message.html_content,
+                    "text_content": message.text_content
+                }
+                for message in messages
+            ]
+        )
+        logger.info(f"{count} emails queued")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to queue {len(messages)} emails: {str(e)}")
+        return 0
+    finally:
+        db.close()
     
-    You have requested a verification code for your MadaLTO account.
-    Please use the following code to complete your {otp_type}:
+    email_outbox_worker.notify()
+    return count
+
+def send_otp_email(email: str, otp_code: str, otp_type: str) -> bool:
+    """Send OTP verification email"""
     
-    {otp_code}
+    message = email_templates.render(
+        "otp",
+        otp_type,
+        email,
+        otp_code=otp_code,
+        otp_type=otp_type
+    )
     
-    This code will expire in {settings.OTP_EXPIRE_MINUTES} minutes.
+    return send_email(email, message.subject, message.html_content, message.text_content)
+
+def send_status_notifications(
+    recipients: Iterable[Dict[str, Any]],
+    status: str,
+    reason: Optional[str] = None,
+    additional_requirements: Optional[str] = None
+) -> int:
+    """
+    Notify applicants that their application status changed.
+    `status` is one of "approved", "rejected" or "resubmission". Each recipient dict
+    needs `email` and `application_id` and may carry `first_name`, `license_number`,
+    `reason` and `additional_requirements` to override the shared values.
+    """
     
-    Do not share this code with anyone. MadaLTO staff will never ask for your verification code.
+    if not settings.ENABLE_EMAIL_NOTIFICATIONS:
+        return 0
     
-    If you did not request this code, please ignore this email or contact our support team.
+    shared_context = {
+        "status": status,
+        "status_label": STATUS_LABELS.get(status, status.title()),
+        "reason": reason,
+        "additional_requirements": additional_requirements
+    }
     
-    Thank you,
-    The MadaLTO Team
-    """
+    messages = email_templates.render_bulk(
+        "status",
+        status,
+        (
+            dict({k: v for k, v in recipient.items() if v is not None}, to_email=recipient["email"])
+            for recipient in recipients
+            if recipient.get("email")
+        ),
+        shared_context=shared_context
+    )
     
-    return send_email(email, subject, html_content, text_content) 
\ No newline at end of file
+    return send_bulk_emails(messages)
@@ -0,0 +1,186 @@
+# app/utils/email_outbox.py
+import asyncio
+import logging
+import time
+from typing import Optional, List, Dict, Any, Tuple
+
+import aiosmtplib
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import EMAIL_OUTBOX_SENT, EMAIL_OUTBOX_FAILED
+from app.crud.email_outbox import crud_email_outbox
+from app.utils.email import build_message, is_smtp_configured
+
+logger = logging.getLogger(__name__)
+
+# Reuse an idle SMTP session only after checking it with NOOP
+SMTP_IDLE_CHECK_SECONDS = 60
+
+class EmailOutboxWorker:
+    """
+    Background worker that drains the email outbox.
+    Keeps one authenticated SMTP session open between batches, sends claimed
+    messages over it and records the delivery status of each message.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+        self._stopping = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop"""
+        if self.is_running:
+            return
+        if not settings.EMAIL_OUTBOX_ENABLED or not is_smtp_configured():
+            logger.info("Email outbox worker disabled")
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run())
+        logger.info("Email outbox worker started")
+
+    async def stop(self) -> None:
+        """Finish the current batch, then stop the worker and close the SMTP session"""
+        if not self._task:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        await self._close_smtp()
+        logger.info("Email outbox worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker after a message was queued (safe to call from any thread)"""
+        if self._loop and self._wakeup and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        batch_size = settings.EMAIL_OUTBOX_BATCH_SIZE
+
+        while not self._stopping:
+            self._wakeup.clear()
+
+            try:
+                claimed = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Email outbox batch failed: {str(e)}")
+                claimed = 0
+
+            # A full batch usually means more messages are waiting
+            if claimed >= batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_once(self) -> int:
+        """Claim one batch of due messages and send it. Returns the number claimed."""
+        batch = await run_in_threadpool(self._claim_batch)
+        if not batch:
+            return 0
+
+        sent_ids: List[str] = []
+        failures: List[Tuple[str, str]] = []
+
+        for message in batch:
+            try:
+                smtp = await self._get_smtp()
+                await smtp.send_message(build_message(
+                    message["to_email"],
+                    message["subject"],
+                    message["html_content"],
+                    message["text_content"]
+                ))
+                self._last_used = time.monotonic()
+                sent_ids.append(message["id"])
+            except Exception as e:
+                logger.warning(f"Email {message['id']} to {message['to_email']} failed (attempt {message['attempts']}): {str(e)}")
+                failures.append((message["id"], str(e)))
+                # Drop the session; the next message reconnects
+                await self._close_smtp()
+
+        await run_in_threadpool(self._record_results, sent_ids, failures)
+        EMAIL_OUTBOX_SENT.inc(len(sent_ids))
+        EMAIL_OUTBOX_FAILED.inc(len(failures))
+
+        if sent_ids:
+            logger.info(f"Email outbox sent {len(sent_ids)} message(s), {len(failures)} failed")
+        return len(batch)
+
+    def _claim_batch(self) -> List[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            return crud_email_outbox.claim_batch(
+                db,
+                limit=settings.EMAIL_OUTBOX_BATCH_SIZE,
+                lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS
+            )
+        finally:
+            db.close()
+
+    def _record_results(self, sent_ids: List[str], failures: List[Tuple[str, str]]) -> None:
+        db = SessionLocal()
+        try:
+            crud_email_outbox.mark_sent(db, message_ids=sent_ids)
+            for message_id, error in failures:
+                crud_email_outbox.mark_failed(
+                    db,
+                    message_id=message_id,
+                    error=error,
+                    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+                    backoff_seconds=settings.EMAIL_OUTBOX_BACKOFF_SECONDS
+                )
+        finally:
+            db.close()
+
+    async def _get_smtp(self) -> aiosmtplib.SMTP:
+        """Return the pooled SMTP session, reconnecting if it was dropped"""
+        if self._smtp is not None and self._smtp.is_connected:
+            if time.monotonic() - self._last_used < SMTP_IDLE_CHECK_SECONDS:
+                return self._smtp
+            try:
+                await self._smtp.noop()
+                return self._smtp
+            except aiosmtplib.SMTPException:
+                await self._close_smtp()
+
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=settings.SMTP_TLS,
+            username=settings.SMTP_USER or None,
+            password=settings.SMTP_PASSWORD or None,
+            timeout=30
+        )
+        await smtp.connect()
+        self._smtp = smtp
+        self._last_used = time.monotonic()
+        return smtp
+
+    async def _close_smtp(self) -> None:
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+# Global instance
+email_outbox_worker = EmailOutboxWorker()
@@ -0,0 +1,115 @@
+# app/utils/email_templates.py
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Any, Optional
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "email")
+
+# Subject lines per template and message type
+SUBJECT_MAPS: Dict[str, Dict[str, str]] = {
+    "otp": {
+        "registration": "Complete Your MadaLTO Registration",
+        "login": "MadaLTO Login Verification",
+        "password_reset": "Reset Your MadaLTO Password",
+        "default": "MadaLTO Verification Code"
+    },
+    "status": {
+        "approved": "Your MadaLTO Application Has Been Approved",
+        "rejected": "Update on Your MadaLTO Application",
+        "resubmission": "Action Required: Resubmit Your MadaLTO Requirements",
+        "default": "Update on Your MadaLTO Application"
+    }
+}
+
+STATUS_LABELS = {
+    "approved": "Approved",
+    "rejected": "Rejected",
+    "resubmission": "For Resubmission"
+}
+
+@dataclass
+class RenderedEmail:
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: str
+
+class EmailTemplateRenderer:
+    """
+    Email templates compiled once per process.
+    Values that are the same for every message (branding, OTP expiry) are bound
+    into the environment when the templates are compiled, so rendering only fills
+    in the per-recipient fields.
+    """
+
+    def __init__(self, template_dir: str = TEMPLATE_DIR):
+        self.environment = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+            cache_size=-1,
+            keep_trailing_newline=True
+        )
+        self._templates: Dict[str, Dict[str, Template]] = {}
+
+    def load(self) -> None:
+        """Compile every template; called once at startup"""
+        self.environment.globals.update({
+            "brand_name": "MadaLTO System",
+            "otp_expire_minutes": settings.OTP_EXPIRE_MINUTES
+        })
+        for name in SUBJECT_MAPS:
+            self._templates[name] = {
+                "html": self.environment.get_template(f"{name}.html"),
+                "text": self.environment.get_template(f"{name}.txt")
+            }
+        logger.info(f"Compiled {len(self._templates)} email templates")
+
+    def _get(self, name: str) -> Dict[str, Template]:
+        if name not in self._templates:
+            self.load()
+        return self._templates[name]
+
+    def subject_for(self, name: str, message_type: str) -> str:
+        subjects = SUBJECT_MAPS[name]
+        return subjects.get(message_type, subjects["default"])
+
+    def render(self, name: str, message_type: str, to_email: str, **context: Any) -> RenderedEmail:
+        """Render one message"""
+        return next(self.render_bulk(name, message_type, [dict(context, to_email=to_email)]))
+
+    def render_bulk(
+        self,
+        name: str,
+        message_type: str,
+        recipients: Iterable[Dict[str, Any]],
+        shared_context: Optional[Dict[str, Any]] = None
+    ) -> Iterator[RenderedEmail]:
+        """
+        Render the same message type for many recipients.
+        Each recipient dict needs `to_email` plus its template fields; `shared_context`
+        is merged under every recipient.
+        """
+        templates = self._get(name)
+        html_template = templates["html"]
+        text_template = templates["text"]
+        subject = self.subject_for(name, message_type)
+        base_context = dict(shared_context or {}, subject=subject)
+
+        for recipient in recipients:
+            context = dict(base_context)
+            context.update(recipient)
+            yield RenderedEmail(
+                to_email=recipient["to_email"],
+                subject=subject,
+                html_content=html_template.render(context),
+                text_content=text_template.render(context)
+            )
+
+# Global instance
+email_templates = EmailTemplateRenderer()
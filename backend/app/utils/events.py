@@ -0,0 +1,286 @@
+# app/utils/events.py
+"""
+Live application events, pushed to clients over server-sent events
+(GET /applicants/events and GET /admin/events).
+
+- Writers publish inside their own transaction with pg_notify on
+  EVENTS_CHANNEL (`publish`, `publish_document_verifications`), so an event
+  goes out only if the change commits, and reaches every worker process.
+- Each worker keeps one LISTEN connection (`event_broker`, started from
+  main.py) and hands incoming events to its in-process subscribers.
+- Applicants receive the events of their own applications. Admins receive
+  every event with `dashboard` deltas (the counters of /admin/dashboard)
+  and `queue` deltas (the status filters of /admin/applications/filtered,
+  plus pending document verifications).
+- A subscriber that falls EVENTS_QUEUE_SIZE events behind, and every
+  subscriber after the LISTEN connection was re-established, gets a
+  `resync` event instead of the missed ones and should re-fetch.
+
+Events:
+
+  application.submitted  application_id, applicant_id, status_id, new_applicant
+  application.status     application_id, applicant_id, previous_status_id, status_id
+  document.verification  document_id, application_id, applicant_id, is_verified
+  resync                 (no data)
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import EVENTS_DISPATCHED, EVENTS_RESYNCS, EVENT_SUBSCRIBERS
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_SQL = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+# One event per document whose verification changes, built in SQL so the
+# applicant comes along without another query. Must run before the update.
+PUBLISH_DOCUMENTS_SQL = text("""
+SELECT pg_notify(:channel, json_build_object(
+    'type', 'document.verification',
+    'document_id', d.document_id,
+    'application_id', d.application_id,
+    'applicant_id', l.applicant_id,
+    'is_verified', CAST(:is_verified AS boolean),
+    'at', to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24\\:MI\\:SS"Z"')
+)::text)
+FROM submitteddocuments d JOIN licenseapplication l ON l.application_id = d.application_id
+WHERE (d.document_id = ANY(:document_ids) OR d.application_id = ANY(:application_ids))
+  AND COALESCE(d.is_verified, false) <> CAST(:is_verified AS boolean)
+""")
+
+def status_event(
+    application_id: str,
+    applicant_id: str,
+    status_id: str,
+    previous_status_id: Optional[str] = None,
+    **extra: Any
+) -> Dict[str, Any]:
+    """application.status event, or application.submitted when there is no previous status"""
+    return {
+        "type": "application.status" if previous_status_id else "application.submitted",
+        "application_id": application_id,
+        "applicant_id": applicant_id,
+        "previous_status_id": previous_status_id,
+        "status_id": status_id,
+        "at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        **extra,
+    }
+
+def publish(db: Session, events: List[Dict[str, Any]]) -> None:
+    """Queue `events` in the session's transaction; they are delivered when it commits"""
+    if not settings.EVENTS_ENABLED or not events:
+        return
+    db.execute(PUBLISH_SQL, {
+        "channel": settings.EVENTS_CHANNEL,
+        "payloads": [orjson.dumps(event).decode() for event in events],
+    })
+
+def publish_document_verifications(
+    db: Session,
+    *,
+    is_verified: bool,
+    document_ids: Sequence[str] = (),
+    application_ids: Sequence[str] = ()
+) -> None:
+    """
+    Queue document.verification events for the given documents, or all
+    documents of the given applications; call before updating them
+    """
+    if not settings.EVENTS_ENABLED or not (document_ids or application_ids):
+        return
+    db.execute(PUBLISH_DOCUMENTS_SQL, {
+        "channel": settings.EVENTS_CHANNEL,
+        "document_ids": list(document_ids),
+        "application_ids": list(application_ids),
+        "is_verified": is_verified,
+    })
+
+def _counter_deltas(counters: Dict[str, str], previous_status_id: Optional[str], status_id: Optional[str]) -> Counter:
+    deltas: Counter = Counter()
+    if previous_status_id in counters:
+        deltas[counters[previous_status_id]] -= 1
+    if status_id in counters:
+        deltas[counters[status_id]] += 1
+    return deltas
+
+def admin_deltas(event: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Changes to the admin dashboard counters and review queues caused by `event`"""
+    from app.crud.admin import FILTER_STATUS_IDS
+    from app.crud.analytics import DASHBOARD_STATUS_COUNTERS
+
+    queue_counters = {
+        status_id: name
+        for name, status_ids in FILTER_STATUS_IDS.items()
+        for status_id in ([status_ids] if isinstance(status_ids, str) else status_ids)
+    }
+    dashboard: Counter = Counter()
+    queue: Counter = Counter()
+    if event["type"] in ("application.submitted", "application.status"):
+        dashboard.update(_counter_deltas(DASHBOARD_STATUS_COUNTERS, event["previous_status_id"], event["status_id"]))
+        queue.update(_counter_deltas(queue_counters, event["previous_status_id"], event["status_id"]))
+    if event["type"] == "application.submitted":
+        dashboard.update(["total_applications", "applications_today", "applications_this_month"])
+        if event.get("new_applicant"):
+            dashboard["total_applicants"] += 1
+    elif event["type"] == "document.verification":
+        queue["pending_documents"] += -1 if event["is_verified"] else 1
+    return {
+        "dashboard": {key: value for key, value in dashboard.items() if value},
+        "queue": {key: value for key, value in queue.items() if value},
+    }
+
+class Subscription:
+    """Events for one SSE client: everything (admin) or one applicant's"""
+
+    def __init__(self, applicant_id: Optional[str] = None, is_admin: bool = False):
+        self.applicant_id = applicant_id
+        self.is_admin = is_admin
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        return self.is_admin or event["type"] == "resync" or event.get("applicant_id") == self.applicant_id
+
+    def put(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog, the client re-fetches instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+            EVENTS_RESYNCS.inc()
+
+    async def events(self) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Events as they arrive; None after EVENTS_KEEPALIVE_SECONDS without one"""
+        while True:
+            try:
+                yield await asyncio.wait_for(self.queue.get(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+
+class EventBroker:
+    """
+    In-process fan-out of application events, fed by a LISTEN connection.
+    One per worker process; start() runs the listener on the event loop.
+    """
+
+    def __init__(self):
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def subscribe(self, *, applicant_id: Optional[str] = None, is_admin: bool = False) -> Subscription:
+        subscription = Subscription(applicant_id=applicant_id, is_admin=is_admin)
+        self._subscribers.add(subscription)
+        EVENT_SUBSCRIBERS.labels("admin" if is_admin else "applicant").inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscribers:
+            self._subscribers.remove(subscription)
+            EVENT_SUBSCRIBERS.labels("admin" if subscription.is_admin else "applicant").dec()
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Hand `event` to the subscribers it concerns; admins get it with the deltas"""
+        if not self._subscribers:
+            return
+        admin_event = None
+        for subscription in list(self._subscribers):
+            if not subscription.wants(event):
+                continue
+            if subscription.is_admin and event["type"] != "resync":
+                admin_event = admin_event or {**event, **admin_deltas(event)}
+                subscription.put(admin_event)
+            else:
+                subscription.put(event)
+        EVENTS_DISPATCHED.labels(event["type"]).inc()
+
+    def start(self) -> None:
+        """Start the LISTEN bridge on the running event loop"""
+        if self.is_running:
+            return
+        if not settings.EVENTS_ENABLED:
+            logger.info("Live events disabled")
+            return
+
+        self._stop = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    def _connect(self):
+        """Dedicated autocommit connection listening on EVENTS_CHANNEL (outside the pool)"""
+        pooled = engine.raw_connection()
+        pooled.detach()
+        connection = pooled.driver_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{settings.EVENTS_CHANNEL}"')
+        return connection
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        reconnecting = False
+        while not self._stop.is_set():
+            try:
+                connection = await run_in_threadpool(self._connect)
+            except Exception as e:
+                logger.warning(f"Event listener could not connect: {str(e)}")
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=settings.EVENTS_RECONNECT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            if reconnecting:
+                # Events sent while we were away are lost
+                self.dispatch({"type": "resync"})
+            reconnecting = True
+            logger.info("Event listener connected")
+
+            readable = asyncio.Event()
+            fd = connection.fileno()
+            loop.add_reader(fd, readable.set)
+            try:
+                while not self._stop.is_set():
+                    try:
+                        await asyncio.wait_for(readable.wait(), timeout=settings.EVENTS_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        # Idle: make sure the connection is still alive
+                        with connection.cursor() as cursor:
+                            cursor.execute("SELECT 1")
+                    readable.clear()
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        try:
+                            self.dispatch(orjson.loads(notify.payload))
+                        except (orjson.JSONDecodeError, KeyError) as e:
+                            logger.warning(f"Ignored malformed event: {str(e)}")
+            except Exception as e:
+                logger.warning(f"Event listener lost its connection: {str(e)}")
+            finally:
+                loop.remove_reader(fd)
+                connection.close()
+
+# Global instance
+event_broker = EventBroker()
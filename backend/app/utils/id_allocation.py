@@ -0,0 +1,78 @@
+# app/utils/id_allocation.py
+"""
+Client-side allocation of prefixed primary keys.
+
+Tables like licenseapplication default their key to
+`'APPID_' || LPAD(nextval('application_seq')::text, 3, '0')`, so an insert has
+to reach the database (flush + RETURNING) before the key is known, and rows
+whose keys come back one at a time can't be batched into one INSERT.
+
+IdAllocator takes values from the same sequences up front: one statement
+reserves a block (`SELECT nextval(...) FROM generate_series(1, n)`), and the
+values are kept per worker and formatted here. Objects built with
+`application_id=id_allocator.next_id(db, "application")` can reference each
+other before anything is flushed, and SQLAlchemy sends rows with known keys
+as a single executemany. Server defaults keep working alongside, since both
+draw from the same sequence; the sequences are not altered.
+
+Ids look the same as server-generated ones (`APPID_007`) except past 999:
+LPAD(..., 3, '0') truncates `1000` to `100`, while ids formatted here keep
+every digit (`APPID_1000`).
+"""
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# kind -> (prefix, sequence)
+ID_SEQUENCES: Dict[str, Tuple[str, str]] = {
+    "applicant": ("APP_", "applicant_seq"),
+    "application": ("APPID_", "application_seq"),
+    "status_history": ("SHID_", "history_seq"),
+    "application_vehicle": ("AVID_", "appvehicle_seq"),
+    "appointment": ("APNID_", "appointment_seq"),
+}
+
+_RESERVE_SQL = text("SELECT nextval(CAST(:sequence AS regclass)) FROM generate_series(1, :count)")
+
+def format_id(prefix: str, value: int) -> str:
+    return f"{prefix}{value:03d}"
+
+class IdAllocator:
+    """Per-worker pools of reserved sequence values, refilled one block per statement"""
+
+    def __init__(self, block_size: Optional[int] = None):
+        self.block_size = block_size or settings.ID_BLOCK_SIZE
+        self._pools: Dict[str, Deque[int]] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def _reserve(self, db: Session, sequence: str, count: int) -> List[int]:
+        rows = db.execute(_RESERVE_SQL, {"sequence": sequence, "count": count})
+        return [row[0] for row in rows]
+
+    def allocate(self, db: Session, kind: str, count: int) -> List[str]:
+        """`count` ids for `kind` (a key of ID_SEQUENCES), reserving more values when the pool runs low"""
+        prefix, sequence = ID_SEQUENCES[kind]
+        if count <= 0:
+            return []
+        with self._lock:
+            pool = self._pools[kind]
+            if len(pool) < count:
+                pool.extend(self._reserve(db, sequence, max(self.block_size, count - len(pool))))
+            values = [pool.popleft() for _ in range(count)]
+        return [format_id(prefix, value) for value in values]
+
+    def next_id(self, db: Session, kind: str) -> str:
+        return self.allocate(db, kind, 1)[0]
+
+    def clear(self) -> None:
+        """Drop the reserved values; the next id of each kind reserves a new block"""
+        with self._lock:
+            self._pools.clear()
+
+# Global instance
+id_allocator = IdAllocator()
@@ -0,0 +1,79 @@
+# app/utils/idempotency.py
+"""
+Purge of expired idempotency keys (app/api/idempotency.py).
+
+Expired keys are already ignored and overwritten when a key is reused, so
+the purge only keeps idempotencykey small. Every worker process runs it
+every IDEMPOTENCY_PURGE_MINUTES; concurrent purges just find less to delete.
+
+By hand:
+
+    python -m app.utils.idempotency
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.idempotency import crud_idempotency
+
+logger = logging.getLogger(__name__)
+
+def purge_expired_keys() -> int:
+    db = SessionLocal()
+    try:
+        return crud_idempotency.purge_expired(db)
+    finally:
+        db.close()
+
+class IdempotencyPurgeWorker:
+    """Background task that deletes expired idempotency keys"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop"""
+        if self.is_running:
+            return
+        if not settings.IDEMPOTENCY_PURGE_ENABLED:
+            logger.info("Idempotency key purge disabled")
+            return
+
+        self._stop = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                purged = await run_in_threadpool(purge_expired_keys)
+                if purged:
+                    logger.info(f"Purged {purged} expired idempotency keys")
+            except Exception as e:
+                logger.warning(f"Idempotency key purge failed: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=settings.IDEMPOTENCY_PURGE_MINUTES * 60)
+            except asyncio.TimeoutError:
+                pass
+
+# Global instance
+idempotency_purge_worker = IdempotencyPurgeWorker()
+
+if __name__ == "__main__":
+    print(f"Purged {purge_expired_keys()} expired idempotency keys")
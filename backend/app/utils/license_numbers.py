@@ -0,0 +1,99 @@
+# app/utils/license_numbers.py
+"""
+Collision-free license number allocation.
+
+Numbers come from the Postgres sequence `license_number_seq`, which
+increments by LICENSE_NUMBER_BLOCK_SIZE: one nextval() reserves a whole block
+for the calling worker, which then hands the block out from memory. Blocks
+never overlap across workers or restarts (a restart only skips the rest of
+its block), so concurrent approvals cannot get the same number, and the
+unique index `ux_applicant_license_number` backs this up.
+
+Sequence values map onto the `A12-34-567890` format (check_license_number_format):
+the letter is value // 10^10 and the ten digits are the rest, multiplied by
+a constant coprime to 10 (a bijection mod 10^10) so consecutive numbers
+don't look sequential. That is 26 * 10^10 numbers.
+
+Numbers assigned before the allocator existed (random, or entered for
+renewals) are skipped: each new block is checked against `applicant` once.
+
+Both database objects are declared in models/applicant.py and created by
+alembic revision 0002:
+
+    CREATE SEQUENCE IF NOT EXISTS license_number_seq START WITH 1 INCREMENT BY 100;
+    CREATE UNIQUE INDEX IF NOT EXISTS ux_applicant_license_number ON applicant (license_number);
+"""
+import re
+import string
+import threading
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.orm import Session
+
+from app.models.applicant import LICENSE_NUMBER_BLOCK_SIZE, Applicant, license_number_seq
+
+LICENSE_NUMBER_PATTERN = re.compile(r"^[A-Z]{1}[0-9]{2}-[0-9]{2}-[0-9]{6}$")
+
+_SERIALS_PER_LETTER = 10 ** 10
+_SCRAMBLE = 7_919_374_357  # odd and not a multiple of 5, so invertible mod 10^10
+
+def format_license_number(value: int) -> str:
+    """Map a sequence value to a license number; distinct values give distinct numbers"""
+    letter_index, serial = divmod(value, _SERIALS_PER_LETTER)
+    if not 0 <= letter_index < len(string.ascii_uppercase):
+        raise ValueError(f"License number space exhausted (sequence value {value})")
+    digits = f"{serial * _SCRAMBLE % _SERIALS_PER_LETTER:010d}"
+    return f"{string.ascii_uppercase[letter_index]}{digits[:2]}-{digits[2:4]}-{digits[4:]}"
+
+def reserve_block_from_sequence(db: Session) -> int:
+    try:
+        return db.execute(select(license_number_seq.next_value())).scalar_one()
+    except ProgrammingError as e:
+        # 42P01: undefined_table, also raised for a missing sequence
+        if getattr(e.orig, "pgcode", None) != "42P01":
+            raise
+        raise RuntimeError(
+            "license_number_seq does not exist; run `alembic upgrade head` (revision 0002 creates it)"
+        ) from e
+
+class LicenseNumberAllocator:
+    """Hands out license numbers from a block reserved with one nextval()"""
+
+    def __init__(
+        self,
+        block_size: int = LICENSE_NUMBER_BLOCK_SIZE,
+        reserve_block: Callable[[Session], int] = reserve_block_from_sequence
+    ):
+        self.block_size = block_size
+        self._reserve_block = reserve_block
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+        self._taken: Set[str] = set()
+        self.blocks_reserved = 0
+
+    def _taken_in_block(self, db: Session, start: int) -> Set[str]:
+        numbers = [format_license_number(value) for value in range(start, start + self.block_size)]
+        rows = db.query(Applicant.license_number).filter(Applicant.license_number.in_(numbers)).all()
+        return {row.license_number for row in rows}
+
+    def allocate(self, db: Optional[Session]) -> str:
+        with self._lock:
+            while True:
+                if self._next >= self._end:
+                    start = self._reserve_block(db)
+                    self._next, self._end = start, start + self.block_size
+                    self._taken = self._taken_in_block(db, start) if db is not None else set()
+                    self.blocks_reserved += 1
+                license_number = format_license_number(self._next)
+                self._next += 1
+                if license_number not in self._taken:
+                    return license_number
+
+    def allocate_many(self, db: Optional[Session], count: int) -> List[str]:
+        return [self.allocate(db) for _ in range(count)]
+
+# Global instance
+license_number_allocator = LicenseNumberAllocator()
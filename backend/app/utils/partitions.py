@@ -0,0 +1,94 @@
+# app/utils/partitions.py
+"""
+Upkeep of the monthly partitions of licenseapplication and
+applicationstatushistory (alembic revision 0004).
+
+Rows go to the partition for their month (UTC). A row with no matching
+partition lands in the DEFAULT partition. That keeps inserts working, but
+nothing is pruned for such rows, and a partition for that month can't be
+created until they are moved out. The worker below creates partitions
+PARTITION_MONTHS_AHEAD months ahead at startup and every
+PARTITION_CHECK_HOURS, so that doesn't happen. Every worker process runs
+it. ensure_monthly_partitions() skips partitions that exist, and a race
+between two workers only logs a warning.
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# partitioned table -> partition key
+PARTITIONED_TABLES: Dict[str, str] = {
+    "licenseapplication": "submission_date",
+    "applicationstatushistory": "status_change_date",
+}
+
+def ensure_partitions(months_ahead: Optional[int] = None) -> List[str]:
+    """Create missing monthly partitions up to `months_ahead` months from now; returns the new partitions"""
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    created: List[str] = []
+    db = SessionLocal()
+    try:
+        for table in PARTITIONED_TABLES:
+            rows = db.execute(
+                text("SELECT ensure_monthly_partitions(:table, :months_ahead)"),
+                {"table": table, "months_ahead": months_ahead}
+            )
+            created.extend(row[0] for row in rows)
+        db.commit()
+    finally:
+        db.close()
+    return created
+
+class PartitionMaintenanceWorker:
+    """Background task that keeps future monthly partitions in place"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop"""
+        if self.is_running:
+            return
+        if not settings.PARTITION_MAINTENANCE_ENABLED:
+            logger.info("Partition maintenance disabled")
+            return
+
+        self._stop = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self._task:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                created = await run_in_threadpool(ensure_partitions)
+                if created:
+                    logger.info(f"Created partitions: {', '.join(created)}")
+            except Exception as e:
+                logger.warning(f"Partition maintenance failed: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=settings.PARTITION_CHECK_HOURS * 3600)
+            except asyncio.TimeoutError:
+                pass
+
+# Global instance
+partition_maintenance_worker = PartitionMaintenanceWorker()
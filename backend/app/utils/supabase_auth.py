@@ -3,6 +3,7 @@ from typing import Optional, Dict, Any
 import httpx
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.instrumentation import InstrumentedTransport
 from app.models.applicant import Applicant
 import random
 import string
@@ -18,6 +19,10 @@ class SupabaseAuth:
         self._otp_store = {}
         self._pending_users = {}
     
+    def _client(self) -> httpx.AsyncClient:
+        """HTTP client for Supabase calls; timed per request when instrumentation is on"""
+        return httpx.AsyncClient(transport=InstrumentedTransport())
+    
     def generate_otp_code(self, length: int = 4) -> str:
         """Generate a random OTP code"""
         return ''.join(random.choices(string.digits, k=length))
@@ -25,9 +30,11 @@ class SupabaseAuth:
     async def send_custom_otp_email(self, email: str, otp_code: str, action: str = "signup") -> bool:
         """Send custom OTP email using our email system"""
         try:
+            from starlette.concurrency import run_in_threadpool
             from app.utils.email import send_otp_email
             action_text = "registration" if action == "signup" else "login"
-            return send_otp_email(email, otp_code, action_text)
+            # Queuing touches the database, so keep it off the event loop
+            return await run_in_threadpool(send_otp_email, email, otp_code, action_text)
         except Exception as e:
             print(f"Failed to send OTP email: {e}")
             return False
@@ -120,7 +127,7 @@ class SupabaseAuth:
             "user_metadata": user_metadata or {}
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.post(url, json=data, headers=headers)
             result = response.json()
             print(f"DEBUG - Create confirmed user result: {result}")
@@ -145,7 +152,7 @@ class SupabaseAuth:
         if user_metadata:
             data["data"] = user_metadata
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.post(url, json=data, headers=headers)
             return response.json()
     
@@ -165,7 +172,7 @@ class SupabaseAuth:
             "password": password
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.post(url, json=data, headers=headers)
             result = response.json()
             print(f"DEBUG - Sign in result for {email}: {result}")
@@ -191,7 +198,7 @@ class SupabaseAuth:
         }
         
         # Search for user by email
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             # Get user list (you might need to implement pagination for large user bases)
             response = await client.get(f"{list_users_url}?email={email}", headers=headers)
             result = response.json()
@@ -238,7 +245,7 @@ class SupabaseAuth:
             "Authorization": f"Bearer {access_token}"
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.get(url, headers=headers)
             if response.status_code == 200:
                 return response.json()
@@ -256,7 +263,7 @@ class SupabaseAuth:
             "Content-Type": "application/json"
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.get(url, headers=headers)
             if response.status_code == 200:
                 return {"user": response.json()}
@@ -284,7 +291,7 @@ class SupabaseAuth:
             "refresh_token": refresh_token
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.post(url, json=data, headers=headers)
             return response.json()
     
@@ -308,7 +315,7 @@ class SupabaseAuth:
             "last_sign_in_at": current_time
         }
         
-        async with httpx.AsyncClient() as client:
+        async with self._client() as client:
             response = await client.put(url, json=data, headers=headers)
             result = response.json()
             print(f"DEBUG - Last sign-in update result for {user_uuid}: {result}")
@@ -0,0 +1,177 @@
+# benchmarks/bench_admin_listing.py
+"""
+Serialization cost of the admin application listing.
+
+Builds LicenseApplication rows in memory (with applicant, type and status
+attached, as crud_admin loads them) and serves them from a stand-in
+GET /admin/applications endpoint through the ASGI stack, so only response
+building and serialization are measured:
+
+  default - the endpoint returns PaginatedResponse(...) and FastAPI validates
+            it against response_model and serializes it
+  adapter - adapter_response() below: one validation through a cached
+            TypeAdapter, JSON dumped by pydantic-core
+  fast    - paginated_response(): ORM rows copied to dicts, rendered by orjson
+
+Every mode must produce the same JSON as `default`; the benchmark checks
+that before timing.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_admin_listing --rows 100 1000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+import app.models  # noqa: F401  (configures every mapper)
+from app.core.config import settings
+from app.core.responses import paginated_response
+from app.models.applicant import Applicant
+from app.models.application import ApplicationStatus, ApplicationType, LicenseApplication
+from app.schemas.admin import AdminApplicationResponse
+from app.schemas.base import get_type_adapter
+from app.schemas.response import PaginatedResponse
+
+LISTING_PATH = "/api/v1/admin/applications"
+MODES = ["default", "adapter", "fast"]
+
+def adapter_response(response_type, content) -> Response:
+    """Validate `content` (models, dicts or ORM objects) once and dump it with pydantic-core"""
+    adapter = get_type_adapter(response_type)
+    value = adapter.validate_python(content, from_attributes=True)
+    return Response(content=adapter.dump_json(value), media_type="application/json")
+
+def build_rows(count: int) -> list:
+    status = ApplicationStatus(application_status_id="ASID_PEN", status_description="Pending")
+    application_type = ApplicationType(application_type_id="ATID_NEW", type_category="New")
+    submitted = datetime(2025, 1, 6, 8, 30, tzinfo=timezone.utc)
+    rows = []
+    for index in range(count):
+        applicant = Applicant(
+            applicant_id=f"APID_{index:06d}",
+            email=f"applicant{index}@example.com",
+            family_name="Dela Cruz",
+            first_name=f"Juan {index}",
+            middle_name="Santos",
+            address="123 Rizal Street, Quezon City",
+            contact_num="+639171234567",
+            nationality="Filipino",
+            birthdate=date(1990, 1, 1) + timedelta(days=index % 3650),
+            birthplace="Manila",
+            height=Decimal("170.5"),
+            weight=Decimal("65.0"),
+            eye_color="Brown",
+            civil_status="Single",
+            educational_attainment="College",
+            blood_type="O+",
+            sex="Male",
+            tin="123456789",
+            is_organ_donor=bool(index % 2),
+            license_number=None,
+            created_date=submitted,
+            last_updated_date=submitted
+        )
+        rows.append(LicenseApplication(
+            application_id=f"APPID_{index:06d}",
+            applicant_id=applicant.applicant_id,
+            application_type_id=application_type.application_type_id,
+            application_status_id=status.application_status_id,
+            submission_date=submitted + timedelta(minutes=index),
+            last_updated_date=submitted + timedelta(minutes=index),
+            additional_requirements=None,
+            applicant=applicant,
+            application_type=application_type,
+            status=status
+        ))
+    return rows
+
+def build_app(mode: str, rows: list) -> FastAPI:
+    app = FastAPI()
+    response_type = PaginatedResponse[AdminApplicationResponse]
+
+    @app.get(LISTING_PATH, response_model=response_type)
+    async def listing():
+        total = len(rows)
+        if mode == "default":
+            return PaginatedResponse(
+                success=True,
+                message="Applications retrieved successfully",
+                data=rows,
+                total=total,
+                page=1,
+                size=total,
+                pages=1
+            )
+        if mode == "adapter":
+            return adapter_response(response_type, {
+                "success": True,
+                "message": "Applications retrieved successfully",
+                "data": rows,
+                "total": total,
+                "page": 1,
+                "size": total,
+                "pages": 1
+            })
+        return paginated_response(
+            AdminApplicationResponse,
+            message="Applications retrieved successfully",
+            items=rows,
+            total=total,
+            page=1,
+            size=total,
+            pages=1
+        )
+
+    return app
+
+async def run_mode(mode: str, rows: list, requests: int) -> tuple:
+    settings.FAST_JSON_RESPONSES = mode == "fast"
+    transport = httpx.ASGITransport(app=build_app(mode, rows))
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(LISTING_PATH)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        for _ in range(5):
+            await client.get(LISTING_PATH)
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get(LISTING_PATH)
+            timings.append((time.perf_counter() - start) * 1000)
+    return body, timings
+
+async def main(row_counts: list, requests: int, modes: list) -> None:
+    for count in row_counts:
+        rows = build_rows(count)
+        results = {}
+        for mode in ["default"] + [mode for mode in modes if mode != "default"]:
+            results[mode] = await run_mode(mode, rows, requests)
+
+        expected = results["default"][0]
+        for mode, (body, _) in results.items():
+            if body != expected:
+                raise SystemExit(f"{mode}: response differs from default\n{json.dumps(body['data'][0], indent=2)}")
+
+        baseline = statistics.mean(results["default"][1])
+        print(f"{count} rows, {requests} requests")
+        for mode, (_, timings) in results.items():
+            mean = statistics.mean(timings)
+            print(f"  {mode:<8} mean={mean:.3f}ms p50={statistics.median(timings):.3f}ms "
+                  f"speedup={baseline / mean:.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark admin listing serialization")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.requests, args.modes))
@@ -0,0 +1,143 @@
+# benchmarks/bench_application_validation.py
+"""
+Validation cost of a /submit-complete body.
+
+Turns sample_application_data.json (the frontend form state) into the
+CompleteApplicationCreate payload the frontend posts, then times the work
+the endpoint does before touching the database:
+
+  legacy - json.loads, FastAPI's `dict = Body(...)` validation,
+           CompleteApplicationCreate(**raw_data), then personal_info.dict()
+           fed into ApplicantCreate(...) (validated again)
+  fast   - parse_complete_application(): one validate_json pass through a
+           cached TypeAdapter, one model_dump(), ApplicantCreate.model_construct()
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_application_validation --iterations 5000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import warnings
+
+from app.schemas.applicant import ApplicantCreate
+from app.schemas.application import CompleteApplicationCreate, parse_complete_application
+from app.schemas.base import get_type_adapter
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "sample_application_data.json")
+
+def build_submission(sample: dict) -> dict:
+    """Same mapping as formatApplicationData() in frontend/src/services/applicationService.js"""
+    personal = sample["personal_details"]
+    license_details = sample["license_details"]
+    address = ", ".join(
+        part for part in (
+            personal.get("house_address"), personal.get("street_address"), personal.get("barangay"),
+            personal.get("municipality"), personal.get("province"), personal.get("zip_code")
+        ) if part
+    )
+    family_info = []
+    for relation in ("father", "mother", "spouse"):
+        if personal.get(f"{relation}_first_name"):
+            family_info.append({
+                "relation_type": relation.title(),
+                "family_name": personal[f"{relation}_family_name"],
+                "first_name": personal[f"{relation}_first_name"],
+                "middle_name": personal.get(f"{relation}_middle_name") or None,
+                "is_deceased": personal.get(f"{relation}_deceased", False)
+            })
+    return {
+        "application_type_id": "ATID_A",
+        "vehicle_categories": license_details["vehicleCategories"],
+        "clutch_types": license_details["clutchTypes"],
+        "additional_requirements": "",
+        "personal_info": {
+            "family_name": personal["family_name"],
+            "first_name": personal["first_name"],
+            "middle_name": personal.get("middle_name") or "",
+            "address": address,
+            "contact_num": personal["contact_num"],
+            "nationality": personal.get("nationality") or "Filipino",
+            "birthdate": personal["birthdate"],
+            "birthplace": personal["birthplace"],
+            "height": float(personal["height"]),
+            "weight": float(personal["weight"]),
+            "eye_color": personal.get("eye_color", "Brown"),
+            "civil_status": personal["civil_status"],
+            "educational_attainment": personal["educational_attainment"],
+            "blood_type": license_details["blood_type"],
+            "sex": personal["sex"],
+            "tin": personal.get("tin"),
+            "is_organ_donor": license_details.get("organDonor") == "yes"
+        },
+        "license_details": {
+            "existing_license_number": license_details.get("driverLicenseNumber") or None,
+            "license_expiry_date": None,
+            "license_restrictions": None
+        },
+        "documents": [
+            {"document_type_id": key, "document_name": info["name"]}
+            for key, info in sample["documents"]["uploadedFiles"].items()
+        ],
+        "emergency_contacts": [{
+            "ec_name": personal["emergencyContactName"],
+            "ec_address": address if personal.get("sameAsApplicantAddress") else None,
+            "ec_contact_no": personal["emergencyContactNumber"]
+        }],
+        "employment_info": [{
+            "employer_business_name": personal["employerBusinessName"],
+            "employer_telephone": personal["employerTelephone"],
+            "employer_address": personal["employerAddress"]
+        }],
+        "family_info": family_info,
+        "additional_data": {
+            "drivingSkill": license_details.get("drivingSkill"),
+            "conditions": license_details.get("conditions"),
+            "organs": license_details.get("organs")
+        }
+    }
+
+def legacy(body: bytes) -> ApplicantCreate:
+    raw_data = get_type_adapter(dict).validate_python(json.loads(body))
+    application_data = CompleteApplicationCreate(**raw_data)
+    return ApplicantCreate(email="applicant@example.com", uuid="uuid", **application_data.personal_info.dict())
+
+def fast(body: bytes) -> ApplicantCreate:
+    application_data = parse_complete_application(body)
+    personal_info = application_data.personal_info.model_dump()
+    return ApplicantCreate.model_construct(email="applicant@example.com", uuid="uuid", **personal_info)
+
+def measure(function, body: bytes, iterations: int) -> list:
+    for _ in range(200):
+        function(body)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function(body)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+def main(iterations: int) -> None:
+    # .dict() in the legacy path warns on pydantic v2
+    warnings.simplefilter("ignore", DeprecationWarning)
+    with open(SAMPLE_PATH) as sample:
+        body = json.dumps(build_submission(json.load(sample))).encode()
+
+    if legacy(body).model_dump() != fast(body).model_dump():
+        raise SystemExit("legacy and fast paths produced different applicant data")
+
+    results = {"legacy": measure(legacy, body, iterations), "fast": measure(fast, body, iterations)}
+    baseline = statistics.mean(results["legacy"])
+    print(f"{iterations} iterations, {len(body)} byte body")
+    for mode, timings in results.items():
+        mean = statistics.mean(timings)
+        print(f"  {mode:<7} mean={mean:.1f}us p50={statistics.median(timings):.1f}us speedup={baseline / mean:.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark submit-complete validation")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,182 @@
+# benchmarks/bench_auth_latency.py
+"""
+How latency of the auth provider shows up in our endpoints.
+
+Runs against the Supabase stand-in (benchmarks.stub_supabase) and raises its
+injected latency step by step (--latencies). At each step every endpoint
+gets --requests requests from --concurrency clients:
+
+  GET  /public/health              no auth call (control)
+  GET  /auth-supabase/verify-token one /auth/v1/user call
+  POST /auth-supabase/refresh-token one /auth/v1/token call
+  GET  /applicants/me              token check plus database work (--with-db)
+
+Per step and endpoint it reports p50/p95/p99, errors, the auth calls made per
+request (from the stand-in's counters) and how much p50 grew over the first
+step. With sequential auth calls, added p50 ~= calls per request x latency;
+more than that points at queueing (connection setup, event loop stalls).
+--error-rate makes the stand-in fail that share of calls, to see which errors
+reach clients.
+
+Run from the backend directory (starts the stand-in and the API):
+
+    python -m benchmarks.bench_auth_latency --start --latencies 0 25 50 100 200 --report auth_latency.json
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.load_test import API, configure_stub, latency_stats, start_servers, stop_servers
+from benchmarks.stub_supabase import ANON_KEY, token_for
+from benchmarks.synthetic_data import LOADTEST_DOMAIN
+
+class Client:
+    """One benchmark client with its own stand-in user and session"""
+
+    def __init__(self, number: int):
+        self.email = f"bench{number}@{LOADTEST_DOMAIN}"
+        self.access_token = ""
+        self.refresh_token = ""
+
+    async def sign_up(self, stub: httpx.AsyncClient) -> None:
+        body = {"email": self.email, "password": "bench-password"}
+        response = await stub.post("/auth/v1/signup", json=body, headers={"apikey": ANON_KEY})
+        if response.status_code != 200:
+            response = await stub.post("/auth/v1/token", params={"grant_type": "password"}, json=body,
+                                       headers={"apikey": ANON_KEY})
+        session = response.json()
+        self.access_token, self.refresh_token = session["access_token"], session["refresh_token"]
+
+# name -> request builder; each returns (method, path, request kwargs)
+Request = Callable[[Client], Tuple[str, str, Dict[str, Any]]]
+
+def endpoints(applicant: Optional[Tuple[str, str]]) -> Dict[str, Request]:
+    requests: Dict[str, Request] = {
+        f"GET {API}/public/health": lambda c: ("GET", f"{API}/public/health", {}),
+        f"GET {API}/auth-supabase/verify-token": lambda c: (
+            "GET", f"{API}/auth-supabase/verify-token", {"params": {"token": c.access_token}}
+        ),
+        f"POST {API}/auth-supabase/refresh-token": lambda c: (
+            "POST", f"{API}/auth-supabase/refresh-token", {"params": {"refresh_token": c.refresh_token}}
+        ),
+    }
+    if applicant:
+        headers = {"Authorization": f"Bearer {token_for(*applicant)}"}
+        requests[f"GET {API}/applicants/me"] = lambda c: ("GET", f"{API}/applicants/me", {"headers": headers})
+    return requests
+
+async def measure(
+    api: httpx.AsyncClient,
+    clients: List[Client],
+    request: Request,
+    total: int
+) -> Tuple[List[float], int]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(client: Client) -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, path, kwargs = request(client)
+            started = time.perf_counter()
+            try:
+                response = await api.request(method, path, **kwargs)
+                ok = response.status_code < 400
+                if ok and path.endswith("/refresh-token"):
+                    # Refresh tokens rotate
+                    client.refresh_token = response.json()["data"]["refresh_token"]
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += not ok
+
+    await asyncio.gather(*[worker(client) for client in clients])
+    return latencies, errors
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    applicant = None
+    if args.with_db:
+        from benchmarks.load_test import load_dataset
+        user = load_dataset(1, args.seed).applicants[0]
+        applicant = (user.user_id, user.email)
+    requests = endpoints(applicant)
+    clients = [Client(i) for i in range(args.concurrency)]
+
+    steps = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.stub_url, timeout=10) as stub, \
+            httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as api:
+        configure_stub(args.stub_url, latency_ms=0, jitter_ms=0, error_rate=0)
+        await asyncio.gather(*[client.sign_up(stub) for client in clients])
+
+        for latency_ms in args.latencies:
+            auth = configure_stub(args.stub_url, latency_ms=latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+            results = {}
+            for name, request in requests.items():
+                await measure(api, clients, request, args.concurrency)  # warm connections
+                before = sum((await stub.get("/_stub/stats")).json()["calls"].values())
+                started = time.perf_counter()
+                latencies, errors = await measure(api, clients, request, args.requests)
+                seconds = time.perf_counter() - started
+                auth_calls = sum((await stub.get("/_stub/stats")).json()["calls"].values()) - before
+                results[name] = {
+                    **latency_stats(latencies, errors, seconds),
+                    "auth_calls_per_request": round(auth_calls / len(latencies), 2),
+                }
+            steps.append({"auth": auth, "endpoints": results})
+        configure_stub(args.stub_url, latency_ms=0, jitter_ms=0, error_rate=0)
+
+    # Growth over the first step
+    baseline = steps[0]
+    for step in steps:
+        for name, stats in step["endpoints"].items():
+            stats["added_p50_ms"] = round(stats["p50_ms"] - baseline["endpoints"][name]["p50_ms"], 2)
+    return {
+        "config": {
+            "base_url": args.base_url, "concurrency": args.concurrency, "requests": args.requests,
+            "latencies_ms": args.latencies, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+        },
+        "steps": steps,
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'auth ms':>8} {'endpoint':<45} {'calls':>6} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'+p50':>8}")
+    for step in report["steps"]:
+        for name, stats in step["endpoints"].items():
+            print(f"{step['auth']['latency_ms']:>8.0f} {name:<45} {stats['auth_calls_per_request']:>6.2f} "
+                  f"{stats['errors']:>5} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+                  f"{stats['added_p50_ms']:>8.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark endpoints against auth provider latency")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0, 25, 50, 100, 200], help="injected ms per auth call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of auth calls the stand-in fails")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and step")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--with-db", action="store_true", help="include /applicants/me (needs benchmarks.synthetic_data)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", default="auth_latency.json")
+    parser.add_argument("--start", action="store_true", help="start the stand-in and the API")
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--stub-port", type=int, default=54321)
+    args = parser.parse_args()
+    args.stub_url = f"http://127.0.0.1:{args.stub_port}"
+
+    processes = start_servers(args) if args.start else []
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        stop_servers(processes)
+    with open(args.report, "w") as output:
+        json.dump(report, output, indent=2)
+    print_report(report)
+    print(f"report written to {args.report}")
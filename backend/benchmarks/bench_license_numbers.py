@@ -0,0 +1,109 @@
+# benchmarks/bench_license_numbers.py
+"""
+Throughput and uniqueness of license number allocation under concurrency.
+
+Starts --workers threads. Each one either owns a LicenseNumberAllocator (as
+separate uvicorn/gunicorn workers would) or all of them share one (as request
+threads inside a worker do, --shared). Every thread allocates --count
+numbers. The run fails if any number repeats or does not match
+check_license_number_format.
+
+  --source db      blocks come from license_number_seq on DATABASE_URL; each
+                   thread uses its own session
+  --source memory  blocks come from an in-process counter, which measures
+                   the allocator itself without a database
+
+The old random-retry generator can be timed against the same database with
+--legacy.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_license_numbers --workers 16 --count 2000
+"""
+import argparse
+import itertools
+import random
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.applicant import LICENSE_NUMBER_BLOCK_SIZE, Applicant
+from app.utils.license_numbers import LICENSE_NUMBER_PATTERN, LicenseNumberAllocator
+
+def memory_block_source():
+    counter = itertools.count(1, LICENSE_NUMBER_BLOCK_SIZE)
+    lock = threading.Lock()
+
+    def reserve_block(db) -> int:
+        with lock:
+            return next(counter)
+
+    return reserve_block
+
+def legacy_generate(db) -> str:
+    while True:
+        letter = random.choice(string.ascii_uppercase)
+        license_number = f"{letter}{random.randint(10, 99)}-{random.randint(10, 99)}-{random.randint(100000, 999999)}"
+        if not db.query(Applicant).filter(Applicant.license_number == license_number).first():
+            return license_number
+
+def run(workers: int, count: int, source: str, shared: bool, legacy: bool) -> None:
+    session_factory = None
+    if source == "db":
+        from app.core.database import SessionLocal
+        session_factory = SessionLocal
+
+    reserve_block = memory_block_source() if source == "memory" else None
+
+    def new_allocator() -> LicenseNumberAllocator:
+        if reserve_block is None:
+            return LicenseNumberAllocator()
+        return LicenseNumberAllocator(reserve_block=reserve_block)
+
+    shared_allocator = new_allocator() if shared else None
+    allocators = []
+
+    def worker(_) -> list:
+        db = session_factory() if session_factory else None
+        allocator = shared_allocator or new_allocator()
+        allocators.append(allocator)
+        try:
+            if legacy:
+                return [legacy_generate(db) for _ in range(count)]
+            return [allocator.allocate(db) for _ in range(count)]
+        finally:
+            if db is not None:
+                db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(worker, range(workers)))
+    elapsed = time.perf_counter() - start
+
+    numbers = [number for result in results for number in result]
+    duplicates = len(numbers) - len(set(numbers))
+    malformed = [number for number in numbers if not LICENSE_NUMBER_PATTERN.match(number)]
+    distinct = {id(allocator): allocator for allocator in allocators}
+    reserved = sum(allocator.blocks_reserved for allocator in distinct.values())
+
+    mode = "legacy" if legacy else ("shared" if shared else "per-worker")
+    print(f"{mode} allocators, {workers} workers x {count} numbers, source={source}")
+    print(f"  {len(numbers) / elapsed:,.0f} numbers/s in {elapsed:.2f}s")
+    if not legacy:
+        print(f"  {len(distinct)} allocator(s), {reserved} block(s) of {LICENSE_NUMBER_BLOCK_SIZE} reserved")
+    print(f"  duplicates={duplicates} malformed={len(malformed)}")
+    if duplicates or malformed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel license number allocation")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--source", choices=["db", "memory"], default="db")
+    parser.add_argument("--shared", action="store_true", help="all threads share one allocator")
+    parser.add_argument("--legacy", action="store_true", help="time the old random-retry generator (needs --source db)")
+    args = parser.parse_args()
+    if args.legacy and args.source != "db":
+        parser.error("--legacy needs --source db")
+    run(args.workers, args.count, args.source, args.shared, args.legacy)
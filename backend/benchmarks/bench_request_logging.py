@@ -0,0 +1,115 @@
+# benchmarks/bench_request_logging.py
+"""
+Request overhead of the logging middleware.
+
+Posts sample_application_data.json to a stand-in /submit-complete endpoint
+through the ASGI stack (no network, no database) and reports per-request
+latency for:
+
+  off     - no request logging middleware
+  sampled - RequestLoggingMiddleware, body capture on, LOG_REQUEST_SAMPLE_RATE=0.1
+  on      - RequestLoggingMiddleware, every request logged with its body
+  legacy  - the old middleware: buffer the body, log headers and an indented
+            JSON dump synchronously on the event loop
+
+Logs are written to os.devnull so only the in-process cost is measured.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_request_logging --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.core.config import settings
+from app.core.logging_setup import logging_pipeline
+from app.middleware.request_logging import RequestLoggingMiddleware
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "sample_application_data.json")
+SUBMIT_PATH = "/api/v1/applications/submit-complete"
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post(SUBMIT_PATH)
+    async def submit(raw_data: dict):
+        return {"success": True, "fields": len(raw_data)}
+
+    if mode in ("sampled", "on"):
+        app.add_middleware(RequestLoggingMiddleware)
+    elif mode == "legacy":
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            logger = logging.getLogger("request_logger")
+            logger.info(f"Headers: {dict(request.headers)}")
+            body = await request.body()
+            logger.info(f"Raw body: {body.decode('utf-8')}")
+            logger.info(f"Parsed JSON: {json.dumps(json.loads(body), indent=2)}")
+
+            async def receive():
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            return await call_next(Request(request.scope, receive))
+
+    return app
+
+async def run_mode(mode: str, payload: bytes, requests: int) -> list:
+    settings.LOG_REQUEST_SAMPLE_RATE = 0.1 if mode == "sampled" else 1.0
+    app = build_app(mode)
+    headers = {"Authorization": "Bearer benchmark-token", "Content-Type": "application/json"}
+    timings = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.post(SUBMIT_PATH, content=payload, headers=headers)
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.post(SUBMIT_PATH, content=payload, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+    return timings
+
+def report(mode: str, timings: list, baseline: float) -> None:
+    timings = sorted(timings)
+    mean = statistics.mean(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{mode:<8} mean={mean:.3f}ms p50={statistics.median(timings):.3f}ms "
+          f"p95={p95:.3f}ms overhead={mean - baseline:+.3f}ms")
+
+async def main(requests: int, modes: list) -> None:
+    with open(SAMPLE_PATH, "rb") as sample:
+        payload = sample.read()
+
+    devnull = open(os.devnull, "w")
+    logging_pipeline.configure(stream=devnull)
+
+    results = {}
+    for mode in ["off"] + [mode for mode in modes if mode != "off"]:
+        results[mode] = await run_mode(mode, payload, requests)
+
+    # Read before shutdown(), which removes the handler that counts them
+    dropped = logging_pipeline.dropped
+    logging_pipeline.shutdown()
+    devnull.close()
+
+    print(f"{requests} requests, {len(payload)} byte body, dropped records: {dropped}")
+    baseline = statistics.mean(results["off"])
+    for mode, timings in results.items():
+        report(mode, timings, baseline)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark request logging overhead")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--modes", nargs="+", default=["sampled", "on", "legacy"],
+                        choices=["off", "sampled", "on", "legacy"])
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.modes))
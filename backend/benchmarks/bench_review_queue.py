@@ -0,0 +1,154 @@
+# benchmarks/bench_review_queue.py
+"""
+Concurrent reviewers on the review work-queue (app/crud/review_queue.py).
+
+For each reviewer count in --reviewers, that many threads work the documents
+queue for --duration seconds (or until it is empty), each with its own
+session, the way admins use the API:
+
+  claim --batch documents -> review each for --review-ms -> verify it
+  (crud_document.verify_document, which completes the lease)
+
+A share of the claimed documents (--abandon-rate) is dropped without a
+review, like a reviewer closing the tab; those come back once their
+--lease-seconds lease expires. Heartbeats are sent every --heartbeat-ms.
+
+Per step it reports documents reviewed per second, the share of the ideal
+rate (reviewers x 1000 / review-ms), claim latency and how often an item was
+claimed again after its lease expired. The run fails if any document was
+verified twice, i.e. two reviewers did the same work.
+
+Verifies documents of the database it runs against, as reviewer
+`bench-reviewer-<n>`; every step first restores the documents and leases of
+earlier runs. Use the synthetic dataset (benchmarks.synthetic_data).
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_review_queue --reviewers 1 2 4 8 16 --duration 20 --report review_queue.json
+"""
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.crud import crud_document, crud_review_queue
+from benchmarks.load_test import latency_stats
+
+REVIEWER_PREFIX = "bench-reviewer-"
+
+RESET_SQL = [
+    text("UPDATE submitteddocuments SET is_verified = false, verified_by = NULL WHERE verified_by LIKE :prefix"),
+    text("DELETE FROM reviewlease WHERE reviewer LIKE :prefix"),
+]
+
+def reset(session_factory) -> int:
+    """Undo earlier runs; returns the documents waiting for review"""
+    with session_factory() as db:
+        for statement in RESET_SQL:
+            db.execute(statement, {"prefix": f"{REVIEWER_PREFIX}%"})
+        db.commit()
+        return crud_review_queue.get_queue_depths(db)["documents"]["waiting"]
+
+def reviewer(number: int, session_factory, args: argparse.Namespace, deadline: float) -> Dict[str, Any]:
+    name = f"{REVIEWER_PREFIX}{number}"
+    rng = random.Random(args.seed + number)
+    claimed: List[str] = []
+    reviewed: List[str] = []
+    claim_ms: List[float] = []
+    last_heartbeat = time.perf_counter()
+
+    with session_factory() as db:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            leases = crud_review_queue.claim(
+                db, queue="documents", reviewer=name, limit=args.batch, lease_seconds=args.lease_seconds
+            )
+            claim_ms.append((time.perf_counter() - started) * 1000)
+            if not leases:
+                # Done once nobody holds a lease that may still come back
+                if not crud_review_queue.get_queue_depths(db)["documents"]["leased"]:
+                    break
+                time.sleep(args.review_ms / 1000)
+                continue
+
+            claimed.extend(lease["item_id"] for lease in leases)
+            kept = [lease for lease in leases if rng.random() >= args.abandon_rate]
+            held = [lease["lease_id"] for lease in kept]
+            for lease in kept:
+                time.sleep(args.review_ms / 1000)
+                if (time.perf_counter() - last_heartbeat) * 1000 >= args.heartbeat_ms:
+                    crud_review_queue.heartbeat(db, reviewer=name, lease_ids=held, lease_seconds=args.lease_seconds)
+                    last_heartbeat = time.perf_counter()
+                crud_document.verify_document(db, document_id=lease["item_id"], verified_by=name)
+                reviewed.append(lease["item_id"])
+
+    return {"claimed": claimed, "reviewed": reviewed, "claim_ms": claim_ms}
+
+def run_step(reviewers: int, session_factory, args: argparse.Namespace) -> Dict[str, Any]:
+    waiting = reset(session_factory)
+    deadline = time.perf_counter() + args.duration
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=reviewers) as pool:
+        results = list(pool.map(lambda n: reviewer(n, session_factory, args, deadline), range(reviewers)))
+    seconds = time.perf_counter() - started
+
+    reviewed = Counter(item for result in results for item in result["reviewed"])
+    claimed = Counter(item for result in results for item in result["claimed"])
+    claim_ms = [ms for result in results for ms in result["claim_ms"]]
+    total = sum(reviewed.values())
+    ideal = reviewers * 1000 / args.review_ms
+    return {
+        "reviewers": reviewers,
+        "waiting_at_start": waiting,
+        "reviewed": total,
+        "seconds": round(seconds, 2),
+        "reviewed_per_s": round(total / seconds, 2),
+        "efficiency": round(total / seconds / ideal, 3),
+        "per_reviewer": [len(result["reviewed"]) for result in results],
+        "duplicates": sum(count - 1 for count in reviewed.values() if count > 1),
+        "reclaimed": sum(count - 1 for count in claimed.values() if count > 1),
+        "claim": latency_stats(claim_ms, 0, seconds),
+    }
+
+def print_report(steps: List[Dict[str, Any]]) -> None:
+    print(f"{'reviewers':>9} {'reviewed':>9} {'per s':>8} {'eff':>6} {'claim p50':>10} {'claim p95':>10} {'reclaimed':>10} {'dups':>5}")
+    for step in steps:
+        print(f"{step['reviewers']:>9} {step['reviewed']:>9} {step['reviewed_per_s']:>8.1f} {step['efficiency']:>6.2f} "
+              f"{step['claim']['p50_ms']:>10.1f} {step['claim']['p95_ms']:>10.1f} {step['reclaimed']:>10} {step['duplicates']:>5}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent reviewers on the review work-queue")
+    parser.add_argument("--reviewers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per step")
+    parser.add_argument("--batch", type=int, default=5, help="documents per claim")
+    parser.add_argument("--review-ms", type=float, default=50.0, help="time spent on each document")
+    parser.add_argument("--abandon-rate", type=float, default=0.0, help="share of claimed documents dropped unreviewed")
+    parser.add_argument("--lease-seconds", type=int, default=5)
+    parser.add_argument("--heartbeat-ms", type=float, default=1000.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report", default="review_queue.json")
+    args = parser.parse_args()
+
+    # One connection per reviewer; the application pool is sized for a web worker
+    engine = create_engine(settings.get_database_url(), pool_size=max(args.reviewers), max_overflow=0)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        steps = [run_step(reviewers, session_factory, args) for reviewers in args.reviewers]
+        reset(session_factory)
+    finally:
+        engine.dispose()
+
+    with open(args.report, "w") as output:
+        json.dump({"config": vars(args), "steps": steps}, output, indent=2)
+    print_report(steps)
+    print(f"report written to {args.report}")
+    if any(step["duplicates"] for step in steps):
+        raise SystemExit(1)
@@ -0,0 +1,321 @@
+# benchmarks/load_test.py
+"""
+Load test of the applicant and admin flows against a running API.
+
+Virtual users act as applicants from the synthetic dataset
+(benchmarks.synthetic_data) or as the admin. Each one repeatedly picks a
+weighted step of its flow and requests it:
+
+  applicant  profile, status, own applications, one application with its
+             history and required documents, appointments, reference data;
+             with --writes also submit-complete as a new user
+  admin      dashboard, listings (plain and filtered, several pages), one
+             application, pending document verifications, analytics
+
+Authentication goes through benchmarks.stub_supabase. Users and application
+ids are read from DATABASE_URL. Every virtual user has its own Random seeded
+from --seed, so the same seed on the same dataset sends the same sequence of
+requests per user.
+
+The report (--report, JSON) has throughput and p50/p95/p99/max latency per
+endpoint, keyed like app/testing/query_budgets.py ("GET /api/v1/...").
+Requests made during --warmup are not counted.
+
+Against a running API (started with the environment printed by
+`python -m benchmarks.stub_supabase --env`):
+
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --duration 60 --concurrency 50
+
+Or let it start the stub and the API (uvicorn, --app-workers processes):
+
+    python -m benchmarks.load_test --start --duration 60 --concurrency 50 --report load_report.json
+
+--auth-latency-ms and --auth-error-rate set the stub's injected latency and
+errors for the run (see also benchmarks.bench_auth_latency).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from benchmarks.bench_application_validation import SAMPLE_PATH, build_submission
+from benchmarks.stub_supabase import api_env, token_for
+from benchmarks.synthetic_data import ADMIN_EMAIL, ADMIN_UUID, LOADTEST_DOMAIN
+
+API = settings.API_V1_STR
+
+@dataclass
+class User:
+    user_id: str
+    email: str
+    application_ids: List[str] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {token_for(self.user_id, self.email)}"}
+
+@dataclass
+class Dataset:
+    applicants: List[User]
+    application_ids: List[str]
+    submission: dict
+
+# A step returns (route template, path, request kwargs)
+Step = Tuple[str, str, Dict[str, Any]]
+
+def _application(user: User, rng: random.Random, dataset: Dataset) -> str:
+    return rng.choice(user.application_ids) if user.application_ids else rng.choice(dataset.application_ids)
+
+def _new_applicant(user: User, rng: random.Random, dataset: Dataset) -> Step:
+    """submit-complete as a user with no applicant row yet"""
+    user_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+    new_user = User(str(user_id), f"new.{user_id.hex[:16]}@{LOADTEST_DOMAIN}")
+    return (f"POST {API}/applications/submit-complete", f"{API}/applications/submit-complete",
+            {"json": dataset.submission, "headers": new_user.headers})
+
+APPLICANT_STEPS: List[Tuple[int, Callable[[User, random.Random, Dataset], Step]]] = [
+    (10, lambda u, r, d: (f"GET {API}/applicants/me", f"{API}/applicants/me", {})),
+    (10, lambda u, r, d: (f"GET {API}/applicants/status", f"{API}/applicants/status", {})),
+    (15, lambda u, r, d: (f"GET {API}/applications/", f"{API}/applications/", {})),
+    (15, lambda u, r, d: (f"GET {API}/applications/{{application_id}}", f"{API}/applications/{_application(u, r, d)}", {})),
+    (10, lambda u, r, d: (f"GET {API}/applications/{{application_id}}/history",
+                          f"{API}/applications/{_application(u, r, d)}/history", {})),
+    (10, lambda u, r, d: (f"GET {API}/applications/{{application_id}}/required-documents",
+                          f"{API}/applications/{_application(u, r, d)}/required-documents", {})),
+    (10, lambda u, r, d: (f"GET {API}/appointments/", f"{API}/appointments/", {})),
+    (10, lambda u, r, d: (f"GET {API}/public/vehicle-categories", f"{API}/public/vehicle-categories", {})),
+    (5, lambda u, r, d: (f"GET {API}/public/locations", f"{API}/public/locations", {})),
+]
+APPLICANT_WRITE_STEPS = [(5, _new_applicant)]
+
+ADMIN_STEPS: List[Tuple[int, Callable[[User, random.Random, Dataset], Step]]] = [
+    (10, lambda u, r, d: (f"GET {API}/admin/dashboard", f"{API}/admin/dashboard", {})),
+    (20, lambda u, r, d: (f"GET {API}/admin/applications", f"{API}/admin/applications",
+                          {"params": {"skip": 20 * r.randint(0, 9), "limit": 20}})),
+    (20, lambda u, r, d: (f"GET {API}/admin/applications/filtered", f"{API}/admin/applications/filtered", {"params": {
+        "status_filter": r.choice(["Verifying", "Resubmission", "Rejected", "Approved"]),
+        "sort_by": r.choice(["date_asc", "date_desc"]),
+        "skip": 20 * r.randint(0, 4), "limit": 20,
+    }})),
+    (20, lambda u, r, d: (f"GET {API}/admin/applications/{{application_id}}",
+                          f"{API}/admin/applications/{r.choice(d.application_ids)}", {})),
+    (10, lambda u, r, d: (f"GET {API}/admin/documents/pending-verification", f"{API}/admin/documents/pending-verification",
+                          {"params": {"skip": 0, "limit": 20}})),
+    (10, lambda u, r, d: (f"GET {API}/admin/analytics/trends", f"{API}/admin/analytics/trends", {"params": {"days": 30}})),
+    (5, lambda u, r, d: (f"GET {API}/admin/analytics/monthly/{{year}}",
+                         f"{API}/admin/analytics/monthly/{datetime.now(timezone.utc).year}", {})),
+    (5, lambda u, r, d: (f"GET {API}/admin/analytics/demographics", f"{API}/admin/analytics/demographics", {})),
+]
+
+def load_dataset(users: int, seed: int) -> Dataset:
+    """`users` synthetic applicants (spread over the dataset by --seed) with their application ids"""
+    db = SessionLocal()
+    try:
+        rows = db.execute(text("""
+            SELECT a.uuid::text, a.email, coalesce(array_agg(l.application_id) FILTER (WHERE l.application_id IS NOT NULL), '{}')
+            FROM (
+                SELECT uuid, email, applicant_id FROM applicant
+                WHERE email LIKE :pattern
+                ORDER BY md5(email || :seed) LIMIT :users
+            ) a
+            LEFT JOIN licenseapplication l ON l.applicant_id = a.applicant_id
+            GROUP BY a.uuid, a.email
+            ORDER BY a.email
+        """), {"pattern": f"applicant%@{LOADTEST_DOMAIN}", "seed": str(seed), "users": users}).all()
+    finally:
+        db.close()
+    if not rows:
+        raise SystemExit(f"no @{LOADTEST_DOMAIN} applicants; run python -m benchmarks.synthetic_data first")
+    applicants = [User(user_id, email, list(application_ids)) for user_id, email, application_ids in rows]
+    with open(SAMPLE_PATH) as sample:
+        submission = build_submission(json.load(sample))
+    return Dataset(
+        applicants=applicants,
+        application_ids=[application_id for user in applicants for application_id in user.application_ids],
+        submission=submission,
+    )
+
+class Recorder:
+    """Latencies per endpoint, after the warmup"""
+
+    def __init__(self, warmup_until: float):
+        self.warmup_until = warmup_until
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started: Optional[float] = None
+
+    def record(self, endpoint: str, started: float, seconds: float, ok: bool) -> None:
+        if started < self.warmup_until:
+            return
+        if self.started is None:
+            self.started = started
+        self.latencies[endpoint].append(seconds * 1000)
+        if not ok:
+            self.errors[endpoint] += 1
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return round(ordered[index], 2)
+
+def latency_stats(latencies: List[float], errors: int, seconds: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / seconds, 2) if seconds else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered), 2),
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    user: User,
+    steps: List[Tuple[int, Callable]],
+    rng: random.Random,
+    dataset: Dataset,
+    recorder: Recorder,
+    deadline: float
+) -> None:
+    weights = [weight for weight, _ in steps]
+    while time.perf_counter() < deadline:
+        step = rng.choices(steps, weights)[0][1]
+        endpoint, path, kwargs = step(user, rng, dataset)
+        method = endpoint.split(" ", 1)[0]
+        kwargs.setdefault("headers", user.headers)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(endpoint, started, time.perf_counter() - started, ok)
+
+def configure_stub(stub_url: str, **values: Any) -> Dict[str, Any]:
+    """Set the stub's injected latency/errors; returns its config"""
+    response = httpx.put(f"{stub_url}/_stub/config", json=values, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    dataset = load_dataset(args.users, args.seed)
+    auth = configure_stub(args.stub_url, latency_ms=args.auth_latency_ms, error_rate=args.auth_error_rate)
+    applicant_steps = APPLICANT_STEPS + (APPLICANT_WRITE_STEPS if args.writes else [])
+    admin = User(ADMIN_UUID, ADMIN_EMAIL)
+
+    # Virtual users by scenario; admins are --admin-share of the mix
+    seeder = random.Random(args.seed)
+    admins = {"applicant": 0, "admin": args.concurrency}.get(args.scenario, round(args.concurrency * args.admin_share))
+    plan = [
+        (admin, ADMIN_STEPS) if i < admins else (seeder.choice(dataset.applicants), applicant_steps)
+        for i in range(args.concurrency)
+    ]
+
+    started = time.perf_counter()
+    recorder = Recorder(warmup_until=started + args.warmup)
+    deadline = started + args.warmup + args.duration
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        await asyncio.gather(*[
+            virtual_user(client, user, steps, random.Random(f"{args.seed}:{i}"), dataset, recorder, deadline)
+            for i, (user, steps) in enumerate(plan)
+        ])
+    seconds = time.perf_counter() - (recorder.started or started)
+
+    all_latencies = [latency for latencies in recorder.latencies.values() for latency in latencies]
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "base_url": args.base_url, "scenario": args.scenario, "concurrency": args.concurrency,
+            "admins": admins, "users": len(dataset.applicants), "duration_s": args.duration,
+            "warmup_s": args.warmup, "seed": args.seed, "writes": args.writes, "auth": auth,
+        },
+        "duration_s": round(seconds, 3),
+        "total": latency_stats(all_latencies, sum(recorder.errors.values()), seconds) if all_latencies else {},
+        "endpoints": {
+            endpoint: latency_stats(latencies, recorder.errors[endpoint], seconds)
+            for endpoint, latencies in sorted(recorder.latencies.items())
+        },
+    }
+
+def start_servers(args: argparse.Namespace) -> List[subprocess.Popen]:
+    """Start the Supabase stub and the API, and wait until the API answers"""
+    env = {**os.environ, **api_env(args.stub_url)}
+    port = httpx.URL(args.base_url).port or 80
+    processes = [
+        subprocess.Popen([sys.executable, "-m", "uvicorn", "benchmarks.stub_supabase:app",
+                          "--port", str(args.stub_port), "--log-level", "warning"], env=env),
+        subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+                          "--workers", str(args.app_workers), "--log-level", "warning"], env=env),
+    ]
+    for _ in range(100):
+        try:
+            if httpx.get(f"{args.base_url}{API}/public/health", timeout=1).status_code == 200:
+                return processes
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    stop_servers(processes)
+    raise SystemExit("API did not start")
+
+def stop_servers(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait(timeout=30)
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'endpoint':<62} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint, stats in [*report["endpoints"].items(), ("total", report["total"])]:
+        if stats:
+            print(f"{endpoint:<62} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8.1f} "
+                  f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the applicant and admin flows")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=["applicant", "admin", "mixed"], default="mixed")
+    parser.add_argument("--admin-share", type=float, default=0.1, help="share of admin users in the mixed scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--users", type=int, default=1000, help="synthetic applicants to act as")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds measured")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds before measuring")
+    parser.add_argument("--timeout", type=float, default=30.0, help="request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--writes", action="store_true", help="include submit-complete in the applicant flow")
+    parser.add_argument("--report", default="load_report.json")
+    parser.add_argument("--start", action="store_true", help="start the Supabase stub and the API")
+    parser.add_argument("--app-workers", type=int, default=2)
+    parser.add_argument("--stub-port", type=int, default=54321)
+    parser.add_argument("--auth-latency-ms", type=float, default=0.0, help="latency the stub adds to each auth call")
+    parser.add_argument("--auth-error-rate", type=float, default=0.0, help="share of auth calls the stub fails")
+    args = parser.parse_args()
+    args.stub_url = f"http://127.0.0.1:{args.stub_port}"
+
+    processes = start_servers(args) if args.start else []
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        stop_servers(processes)
+    with open(args.report, "w") as output:
+        json.dump(report, output, indent=2)
+    print_report(report)
+    print(f"report written to {args.report}")
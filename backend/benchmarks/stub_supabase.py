@@ -0,0 +1,355 @@
+# benchmarks/stub_supabase.py
+"""
+Local stand-in for the Supabase auth (GoTrue) API, for offline load tests.
+
+Implements the part of GoTrue that app/utils/supabase_auth.py calls:
+
+  POST /auth/v1/signup                          sign up (users are confirmed at once)
+  POST /auth/v1/token?grant_type=password       sign in
+  POST /auth/v1/token?grant_type=refresh_token  refresh (refresh tokens rotate)
+  GET  /auth/v1/user                            user of the bearer token
+  GET  /auth/v1/admin/users                     list users (?email= filter, page/per_page)
+  POST /auth/v1/admin/users                     create a user
+  GET/PUT/DELETE /auth/v1/admin/users/{id}      read, update, delete a user
+
+Users live in memory. Access tokens are HS256 JWTs signed with
+STUB_JWT_SECRET, with the claims Supabase puts in them; ANON_KEY and
+SERVICE_KEY are JWTs with the anon and service_role roles, checked like the
+Supabase gateway does. A validly signed token whose user is not in memory is
+accepted and the user is created from its claims, so `token_for()` can mint
+tokens for synthetic applicants without signing them up first.
+
+Latency and errors are injected into every /auth/v1 call: `latency_ms`
+(+ uniform `jitter_ms`), and a share `error_rate` of calls answered with
+`error_status`. Set them with STUB_LATENCY_MS, STUB_JITTER_MS,
+STUB_ERROR_RATE and STUB_ERROR_STATUS, or at runtime with
+PUT /_stub/config. GET /_stub/stats has call counts per operation.
+
+    uvicorn benchmarks.stub_supabase:app --port 54321
+
+and start the API with SUPABASE_URL=http://127.0.0.1:54321,
+SUPABASE_ANON_KEY=<ANON_KEY> and SUPABASE_SERVICE_KEY=<SERVICE_KEY>
+(`python -m benchmarks.stub_supabase --env` prints them). For local tests
+only: passwords are hashed with a single salted SHA-256.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import secrets
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import Body, FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+
+JWT_SECRET = os.getenv("STUB_JWT_SECRET", "super-secret-jwt-token-with-at-least-32-characters-long")
+JWT_EXPIRY_SECONDS = int(os.getenv("STUB_JWT_EXPIRY", "3600"))
+ISSUER = "http://127.0.0.1:54321/auth/v1"
+
+def _api_key(role: str) -> str:
+    return jwt.encode({"iss": "supabase-demo", "role": role, "iat": 1700000000, "exp": 4100000000}, JWT_SECRET, algorithm="HS256")
+
+ANON_KEY = _api_key("anon")
+SERVICE_KEY = _api_key("service_role")
+
+class StubConfig:
+    """Injected latency and errors, changed through /_stub/config"""
+
+    def __init__(self):
+        self.latency_ms = float(os.getenv("STUB_LATENCY_MS", "0"))
+        self.jitter_ms = float(os.getenv("STUB_JITTER_MS", "0"))
+        self.error_rate = float(os.getenv("STUB_ERROR_RATE", "0"))
+        self.error_status = int(os.getenv("STUB_ERROR_STATUS", "500"))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status,
+        }
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for key, value in values.items():
+            if key in ("latency_ms", "jitter_ms", "error_rate"):
+                setattr(self, key, float(value))
+            elif key == "error_status":
+                self.error_status = int(value)
+
+config = StubConfig()
+calls: Counter = Counter()
+injected_errors: Counter = Counter()
+
+# id -> user, email -> id, refresh token -> id
+users: Dict[str, Dict[str, Any]] = {}
+user_ids_by_email: Dict[str, str] = {}
+refresh_tokens: Dict[str, str] = {}
+
+app = FastAPI(title="Supabase auth stand-in")
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+def _error(status_code: int, error_code: str, msg: str) -> JSONResponse:
+    """GoTrue error body"""
+    return JSONResponse({"code": status_code, "error_code": error_code, "msg": msg}, status_code=status_code)
+
+def _hash_password(password: str, salt: Optional[str] = None) -> str:
+    salt = salt or secrets.token_hex(8)
+    return f"{salt}${hashlib.sha256((salt + password).encode()).hexdigest()}"
+
+def _check_password(user: Dict[str, Any], password: str) -> bool:
+    stored = user.get("_password")
+    return bool(stored) and secrets.compare_digest(stored, _hash_password(password, stored.split("$", 1)[0]))
+
+def _public(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in user.items() if not key.startswith("_")}
+
+def _create_user(
+    email: str,
+    password: Optional[str] = None,
+    user_metadata: Optional[Dict[str, Any]] = None,
+    user_id: Optional[str] = None
+) -> Dict[str, Any]:
+    now = _now()
+    user = {
+        "id": user_id or str(uuid.uuid4()),
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": email,
+        "email_confirmed_at": now,
+        "phone": "",
+        "confirmed_at": now,
+        "last_sign_in_at": None,
+        "app_metadata": {"provider": "email", "providers": ["email"]},
+        "user_metadata": user_metadata or {},
+        "identities": [],
+        "created_at": now,
+        "updated_at": now,
+        "_password": _hash_password(password) if password else None,
+    }
+    users[user["id"]] = user
+    user_ids_by_email[email] = user["id"]
+    return user
+
+def token_for(user_id: str, email: str, user_metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Signed access token for this user, as the stand-in would issue it"""
+    now = int(time.time())
+    claims = {
+        "iss": ISSUER,
+        "sub": user_id,
+        "aud": "authenticated",
+        "exp": now + JWT_EXPIRY_SECONDS,
+        "iat": now,
+        "email": email,
+        "phone": "",
+        "app_metadata": {"provider": "email", "providers": ["email"]},
+        "user_metadata": user_metadata or {},
+        "role": "authenticated",
+        "aal": "aal1",
+        "amr": [{"method": "password", "timestamp": now}],
+        "session_id": str(uuid.uuid4()),
+        "is_anonymous": False,
+    }
+    return jwt.encode(claims, JWT_SECRET, algorithm="HS256")
+
+def _session(user: Dict[str, Any]) -> Dict[str, Any]:
+    """Token response of signup and /token"""
+    user["last_sign_in_at"] = _now()
+    refresh_token = secrets.token_urlsafe(16)
+    refresh_tokens[refresh_token] = user["id"]
+    return {
+        "access_token": token_for(user["id"], user["email"], user["user_metadata"]),
+        "token_type": "bearer",
+        "expires_in": JWT_EXPIRY_SECONDS,
+        "expires_at": int(time.time()) + JWT_EXPIRY_SECONDS,
+        "refresh_token": refresh_token,
+        "user": _public(user),
+    }
+
+def _claims(token: str, audience: Optional[str] = "authenticated") -> Optional[Dict[str, Any]]:
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=["HS256"], audience=audience,
+                          options={"verify_aud": audience is not None})
+    except JWTError:
+        return None
+
+def _bearer(authorization: Optional[str]) -> Optional[str]:
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return None
+
+def _is_service(authorization: Optional[str]) -> bool:
+    token = _bearer(authorization)
+    claims = _claims(token, audience=None) if token else None
+    return bool(claims) and claims.get("role") == "service_role"
+
+def _operation(request: Request) -> str:
+    """Route name for stats: path with the user id replaced, plus the grant type"""
+    parts = ["{id}" if len(part) == 36 and part.count("-") == 4 else part for part in request.url.path.split("/")]
+    operation = f"{request.method} {'/'.join(parts)}"
+    grant_type = request.query_params.get("grant_type")
+    return f"{operation}?grant_type={grant_type}" if grant_type else operation
+
+@app.middleware("http")
+async def gateway(request: Request, call_next):
+    """API key check, call counts and injected latency/errors for /auth/v1"""
+    if not request.url.path.startswith("/auth/v1/"):
+        return await call_next(request)
+    operation = _operation(request)
+    calls[operation] += 1
+
+    delay = config.latency_ms + (random.uniform(0, config.jitter_ms) if config.jitter_ms else 0)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if config.error_rate and random.random() < config.error_rate:
+        injected_errors[operation] += 1
+        return _error(config.error_status, "unexpected_failure", "Injected failure")
+
+    if request.headers.get("apikey") not in (ANON_KEY, SERVICE_KEY):
+        return JSONResponse({"message": "Invalid API key"}, status_code=401)
+    return await call_next(request)
+
+@app.post("/auth/v1/signup")
+async def signup(body: Dict[str, Any] = Body(...)):
+    email, password = body.get("email"), body.get("password")
+    if not email or not password:
+        return _error(422, "validation_failed", "Signup requires a valid password")
+    if email in user_ids_by_email:
+        return _error(422, "user_already_exists", "User already registered")
+    return _session(_create_user(email, password, body.get("data")))
+
+@app.post("/auth/v1/token")
+async def token(grant_type: str, body: Dict[str, Any] = Body(...)):
+    if grant_type == "password":
+        user = users.get(user_ids_by_email.get(body.get("email"), ""))
+        if not user or not _check_password(user, body.get("password") or ""):
+            return _error(400, "invalid_credentials", "Invalid login credentials")
+        return _session(user)
+    if grant_type == "refresh_token":
+        user = users.get(refresh_tokens.pop(body.get("refresh_token") or "", ""))
+        if not user:
+            return _error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+        return _session(user)
+    return _error(400, "validation_failed", "unsupported_grant_type")
+
+@app.get("/auth/v1/user")
+async def get_user(authorization: Optional[str] = Header(None)):
+    token = _bearer(authorization)
+    claims = _claims(token) if token else None
+    if not claims or not claims.get("sub"):
+        return _error(403, "bad_jwt", "invalid JWT: unable to parse or verify signature, token is invalid")
+    user = users.get(claims["sub"])
+    if user is None:
+        # Trust tokens signed with the secret, as the load test mints its own
+        user = _create_user(claims.get("email", ""), user_metadata=claims.get("user_metadata"), user_id=claims["sub"])
+    return _public(user)
+
+@app.get("/auth/v1/admin/users")
+async def list_users(
+    email: Optional[str] = None,
+    page: int = 1,
+    per_page: int = 50,
+    authorization: Optional[str] = Header(None)
+):
+    if not _is_service(authorization):
+        return _error(403, "not_admin", "User not allowed")
+    if email:
+        matches = [users[user_ids_by_email[email]]] if email in user_ids_by_email else []
+    else:
+        matches = list(users.values())[(page - 1) * per_page:page * per_page]
+    return {"users": [_public(user) for user in matches], "aud": "authenticated"}
+
+@app.post("/auth/v1/admin/users")
+async def create_user(body: Dict[str, Any] = Body(...), authorization: Optional[str] = Header(None)):
+    if not _is_service(authorization):
+        return _error(403, "not_admin", "User not allowed")
+    email = body.get("email")
+    if not email:
+        return _error(422, "validation_failed", "Unable to validate email address: invalid format")
+    if email in user_ids_by_email:
+        return _error(422, "email_exists", "A user with this email address has already been registered")
+    return _public(_create_user(email, body.get("password"), body.get("user_metadata")))
+
+@app.get("/auth/v1/admin/users/{user_id}")
+async def get_user_by_id(user_id: str, authorization: Optional[str] = Header(None)):
+    if not _is_service(authorization):
+        return _error(403, "not_admin", "User not allowed")
+    user = users.get(user_id)
+    if user is None:
+        return _error(404, "user_not_found", "User not found")
+    return _public(user)
+
+@app.put("/auth/v1/admin/users/{user_id}")
+async def update_user(user_id: str, body: Dict[str, Any] = Body(...), authorization: Optional[str] = Header(None)):
+    if not _is_service(authorization):
+        return _error(403, "not_admin", "User not allowed")
+    user = users.get(user_id)
+    if user is None:
+        return _error(404, "user_not_found", "User not found")
+    if body.get("password"):
+        user["_password"] = _hash_password(body["password"])
+    if body.get("email") and body["email"] != user["email"]:
+        user_ids_by_email.pop(user["email"], None)
+        user["email"] = body["email"]
+        user_ids_by_email[user["email"]] = user_id
+    for key in ("user_metadata", "app_metadata"):
+        if isinstance(body.get(key), dict):
+            user[key] = {**user[key], **body[key]}
+    user["updated_at"] = _now()
+    return _public(user)
+
+@app.delete("/auth/v1/admin/users/{user_id}")
+async def delete_user(user_id: str, authorization: Optional[str] = Header(None)):
+    if not _is_service(authorization):
+        return _error(403, "not_admin", "User not allowed")
+    user = users.pop(user_id, None)
+    if user is None:
+        return _error(404, "user_not_found", "User not found")
+    user_ids_by_email.pop(user["email"], None)
+    return {}
+
+@app.get("/_stub/config")
+async def get_config():
+    return config.as_dict()
+
+@app.put("/_stub/config")
+async def put_config(body: Dict[str, Any] = Body(...)):
+    config.update(body)
+    return config.as_dict()
+
+@app.get("/_stub/stats")
+async def get_stats():
+    return {"users": len(users), "calls": dict(calls), "injected_errors": dict(injected_errors)}
+
+@app.post("/_stub/reset")
+async def reset():
+    """Forget users and counters; keeps the config"""
+    users.clear()
+    user_ids_by_email.clear()
+    refresh_tokens.clear()
+    calls.clear()
+    injected_errors.clear()
+    return {"users": 0}
+
+def api_env(url: str) -> Dict[str, str]:
+    """Environment for an API process that authenticates against the stand-in at `url`"""
+    return {"SUPABASE_URL": url, "SUPABASE_ANON_KEY": ANON_KEY, "SUPABASE_SERVICE_KEY": SERVICE_KEY}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Supabase auth stand-in")
+    parser.add_argument("--env", action="store_true", help="print the API environment and exit")
+    parser.add_argument("--port", type=int, default=54321)
+    args = parser.parse_args()
+    if args.env:
+        for key, value in api_env(f"http://127.0.0.1:{args.port}").items():
+            print(f"{key}={value}")
+    else:
+        import uvicorn
+        uvicorn.run(app, port=args.port, log_level="warning")
@@ -0,0 +1,365 @@
+# benchmarks/synthetic_data.py
+"""
+Synthetic applicants and applications at load-test scale.
+
+Generates applicants with their applications, status histories, vehicle
+categories, documents and appointments. Values satisfy the model
+constraints: the id formats from app/utils/id_allocation.py, the enums and
+CHECK constraints (sex, civil status, blood type, clutch type, appointment
+status), +63 contact numbers, 9-digit TINs, and applicants aged 18-70. Type,
+status, vehicle category and location ids are read from the reference tables,
+so those must be populated.
+
+The data is reproducible: the same --seed produces the same values in the
+same order, with dates relative to the day of the run. With --target db the
+ids come from the real sequences, so they depend on the database.
+
+  --target db     COPY the rows into DATABASE_URL. Each batch of --batch-size
+                  applicants is one transaction. When auth.users exists, each
+                  applicant gets a user row there as well.
+  --target jsonl  write BulkApplicationRecord lines to --output, to feed
+                  app.utils.bulk_import (applicants and applications only;
+                  emails import<n>@loadtest.example). When auth.users
+                  exists, the records' users are created there.
+
+Generation stops once --rows rows are written, counted over every table,
+about 14 per applicant. Emails are applicant<n>@loadtest.example, which is how
+benchmarks.load_test finds its users.
+
+Run from the backend directory:
+
+    python -m benchmarks.synthetic_data --rows 1000000 --seed 42
+    python -m benchmarks.synthetic_data --rows 50000 --target jsonl --output records.jsonl
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import date, datetime, time as clock, timedelta, timezone
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import orjson
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.crud.application import ACTIVE_STATUS_IDS
+from app.crud.bulk_import import copy_rows, crud_bulk_import
+from app.models.location import Location
+from app.utils.id_allocation import ID_SEQUENCES, IdAllocator, format_id
+
+LOADTEST_DOMAIN = "loadtest.example"
+ADMIN_EMAIL = "madalto.official@gmail.com"
+# Recorded as changed_by/verified_by for admin actions, and the admin's id in benchmarks.load_test
+ADMIN_UUID = str(uuid.uuid5(uuid.NAMESPACE_URL, f"mailto:{ADMIN_EMAIL}"))
+
+# (kind, count) -> formatted ids, kinds as in ID_SEQUENCES
+IdSource = Callable[[str, int], List[str]]
+
+FAMILY_NAMES = [
+    "Dela Cruz", "Santos", "Reyes", "Garcia", "Mendoza", "Torres", "Flores", "Gonzales", "Bautista",
+    "Villanueva", "Ramos", "Aquino", "Castillo", "Rivera", "Navarro", "Fernandez", "Lopez", "Mercado",
+]
+FIRST_NAMES = [
+    "Juan", "Maria", "Jose", "Ana", "Mark", "Angel", "John Paul", "Kristine", "Carlo", "Patricia",
+    "Miguel", "Andrea", "Paolo", "Camille", "Rafael", "Bea", "Joshua", "Nicole", "Gabriel", "Joy",
+]
+CITIES = ["Manila", "Quezon City", "Makati", "Pasig", "Cebu City", "Davao City", "Baguio", "Iloilo City"]
+REQUIRED_DOCUMENTS = [
+    "Birth Certificate", "Residence Certificate", "Medical Certificate",
+    "Drug Test Result", "Driving Course Certificate", "Valid ID", "Passport Photo",
+]
+# Final status -> weight and the statuses passed through before it
+STATUS_PATHS: Dict[str, Tuple[int, List[str]]] = {
+    "ASID_PEN": (25, []),
+    "ASID_SFA": (15, ["ASID_PEN"]),
+    "ASID_RSB": (5, ["ASID_PEN"]),
+    "ASID_APR": (45, ["ASID_PEN", "ASID_SFA"]),
+    "ASID_REJ": (10, ["ASID_PEN"]),
+}
+CLUTCH_TYPES = ["Manual", "Automatic", "Semi‑automatic"]
+# 08:00 to 16:30 in 30-minute slots
+APPOINTMENT_SLOTS = [clock(8 + i // 2, 30 * (i % 2)) for i in range(18)]
+
+# table -> COPY columns; values in generated rows follow this order
+COLUMNS: Dict[str, List[str]] = {
+    "auth.users": ["id", "email", "aud", "role", "email_confirmed_at", "created_at"],
+    "applicant": [
+        "uuid", "applicant_id", "email", "family_name", "first_name", "middle_name", "address", "contact_num",
+        "nationality", "birthdate", "birthplace", "height", "weight", "eye_color", "civil_status",
+        "educational_attainment", "blood_type", "sex", "tin", "is_organ_donor", "created_date",
+    ],
+    "licenseapplication": [
+        "application_id", "applicant_id", "application_type_id", "application_status_id",
+        "submission_date", "last_updated_date", "rejection_reason",
+    ],
+    "applicationstatushistory": ["history_id", "application_id", "application_status_id", "status_change_date", "changed_by"],
+    "applicationvehiclecategory": ["app_vehicle_id", "application_id", "category_id", "clutch_type"],
+    "submitteddocuments": ["document_id", "application_id", "document_type", "file_url", "uploaded_at", "is_verified", "verified_by"],
+    "appointment": ["appointment_id", "application_id", "location_id", "appointment_date", "appointment_time", "status"],
+}
+
+class SyntheticDataset:
+    """Rows for one batch of applicants at a time, drawn from one seeded Random"""
+
+    def __init__(self, seed: int, reference: Dict[str, Sequence[str]], months: int, email_prefix: str = "applicant"):
+        self.rng = random.Random(seed)
+        self.email_prefix = email_prefix
+        self.types = sorted(reference["application_types"])
+        self.categories = sorted(reference["vehicle_categories"])
+        self.locations = sorted(reference["locations"])
+        statuses = set(reference["application_statuses"])
+        # Only status paths whose every status exists in applicationstatus
+        self.paths = {
+            final: (weight, path) for final, (weight, path) in STATUS_PATHS.items()
+            if final in statuses and set(path) <= statuses
+        }
+        if "ASID_PEN" not in self.paths:
+            raise ValueError("applicationstatus has no ASID_PEN row")
+        # Start of today (UTC), so runs on the same day generate the same dates
+        self.now = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.first_day = self.now - timedelta(days=30 * months)
+
+    def _contact(self) -> str:
+        return "+639" + "".join(self.rng.choices("0123456789", k=9))
+
+    def applicant(self, applicant_id: str, number: int) -> Dict[str, Any]:
+        rng = self.rng
+        age = rng.randint(18, 70)
+        return {
+            "uuid": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "applicant_id": applicant_id,
+            "email": f"{self.email_prefix}{number}@{LOADTEST_DOMAIN}",
+            "family_name": rng.choice(FAMILY_NAMES),
+            "first_name": rng.choice(FIRST_NAMES),
+            "middle_name": rng.choice(FAMILY_NAMES) if rng.random() < 0.8 else None,
+            "address": f"{rng.randint(1, 999)} {rng.choice(FAMILY_NAMES)} Street, {rng.choice(CITIES)}",
+            "contact_num": self._contact(),
+            "nationality": "Filipino",
+            "birthdate": self.now.date() - timedelta(days=365 * age + rng.randint(0, 364)),
+            "birthplace": rng.choice(CITIES),
+            "height": rng.randint(148, 190),
+            "weight": rng.randint(45, 105),
+            "eye_color": rng.choice(["Brown", "Black"]),
+            "civil_status": rng.choices(["Single", "Married", "Widowed", "Separated"], [50, 40, 5, 5])[0],
+            "educational_attainment": rng.choice(["Postgraduate", "College", "High School", "Elementary"]),
+            "blood_type": rng.choice(["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]),
+            "sex": rng.choice(["Male", "Female"]),
+            "tin": "".join(rng.choices("0123456789", k=9)) if rng.random() < 0.6 else None,
+            "is_organ_donor": rng.random() < 0.2,
+        }
+
+    def application(self) -> Dict[str, Any]:
+        rng = self.rng
+        weights = [weight for weight, _ in self.paths.values()]
+        final = rng.choices(list(self.paths), weights)[0]
+        submitted = self.first_day + timedelta(seconds=rng.randint(0, int((self.now - self.first_day).total_seconds())))
+        # Status changes a few days apart, never in the future
+        changes, changed_at = [], submitted
+        for status_id in self.paths[final][1] + [final]:
+            changes.append((status_id, changed_at))
+            changed_at = min(changed_at + timedelta(days=rng.randint(1, 10), minutes=rng.randint(0, 600)), self.now)
+        categories = rng.sample(self.categories, k=min(len(self.categories), rng.choices([1, 2], [70, 30])[0]))
+        return {
+            "application_type_id": rng.choice(self.types),
+            "application_status_id": final,
+            "submission_date": submitted,
+            "last_updated_date": changes[-1][1],
+            "rejection_reason": "Incomplete requirements" if final == "ASID_REJ" else None,
+            "changes": changes,
+            "vehicles": [(category_id, rng.choice(CLUTCH_TYPES)) for category_id in categories],
+            # Finalized and in-review applications have every document; pending ones some
+            "documents": REQUIRED_DOCUMENTS if final != "ASID_PEN" else rng.sample(REQUIRED_DOCUMENTS, rng.randint(2, 7)),
+            "appointment": final != "ASID_PEN" and rng.random() < 0.8 and bool(self.locations),
+        }
+
+    @staticmethod
+    def conflicting(first: Dict[str, Any], second: Dict[str, Any]) -> bool:
+        """Both active and of the same type"""
+        return (
+            first["application_type_id"] == second["application_type_id"]
+            and first["application_status_id"] in ACTIVE_STATUS_IDS
+            and second["application_status_id"] in ACTIVE_STATUS_IDS
+        )
+
+    def batch(self, ids: IdSource, count: int) -> Dict[str, List[Tuple[Any, ...]]]:
+        """Rows of `count` applicants for every table in COLUMNS"""
+        rng = self.rng
+        rows: Dict[str, List[Tuple[Any, ...]]] = {table: [] for table in COLUMNS}
+        for applicant_id in ids("applicant", count):
+            applicant = self.applicant(applicant_id, int(applicant_id.split("_")[1]))
+            applications = [self.application() for _ in range(rng.choices([1, 2], [85, 15])[0])]
+            # At most one active application per type (licenseapplication_active, alembic 0008)
+            while len(applications) == 2 and self.conflicting(*applications):
+                applications[1] = self.application()
+            created = applicant["created_date"] = min(application["submission_date"] for application in applications)
+            rows["auth.users"].append((applicant["uuid"], applicant["email"], "authenticated", "authenticated", created, created))
+            rows["applicant"].append(tuple(applicant[column] for column in COLUMNS["applicant"]))
+
+            for application in applications:
+                application_id = ids("application", 1)[0]
+                rows["licenseapplication"].append((
+                    application_id, applicant_id, application["application_type_id"], application["application_status_id"],
+                    application["submission_date"], application["last_updated_date"], application["rejection_reason"],
+                ))
+                history_ids = ids("status_history", len(application["changes"]))
+                rows["applicationstatushistory"].extend(
+                    (history_id, application_id, status_id, changed_at, ADMIN_UUID if status_id != "ASID_PEN" else applicant_id)
+                    for history_id, (status_id, changed_at) in zip(history_ids, application["changes"])
+                )
+                vehicle_ids = ids("application_vehicle", len(application["vehicles"]))
+                rows["applicationvehiclecategory"].extend(
+                    (vehicle_id, application_id, *vehicle) for vehicle_id, vehicle in zip(vehicle_ids, application["vehicles"])
+                )
+                verified = application["application_status_id"] in ("ASID_APR", "ASID_REJ", "ASID_SFA")
+                for document_type in application["documents"]:
+                    document_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+                    rows["submitteddocuments"].append((
+                        document_id, application_id, document_type,
+                        f"uploads/documents/{application_id}/{document_id}.pdf",
+                        application["submission_date"] + timedelta(minutes=rng.randint(1, 120)),
+                        verified, ADMIN_UUID if verified else None,
+                    ))
+                if application["appointment"]:
+                    first_change = application["changes"][min(1, len(application["changes"]) - 1)][1]
+                    appointment_date = first_change.date() + timedelta(days=rng.randint(3, 21))
+                    rows["appointment"].append((
+                        ids("appointment", 1)[0], application_id, rng.choice(self.locations),
+                        appointment_date, rng.choice(APPOINTMENT_SLOTS),
+                        "Scheduled" if appointment_date >= self.now.date() else rng.choices(
+                            ["Completed", "Missed", "Cancelled"], [85, 10, 5]
+                        )[0],
+                    ))
+        return rows
+
+def reference_ids(db) -> Dict[str, Sequence[str]]:
+    reference = {name: sorted(ids) for name, ids in crud_bulk_import.get_reference_ids(db).items()}
+    reference["locations"] = sorted(row[0] for row in db.query(Location.location_id))
+    return reference
+
+def ensure_history_partitions(db, months: int) -> None:
+    """Monthly partitions back to the first generated month, when the tables are partitioned"""
+    if not db.execute(text("SELECT to_regprocedure('ensure_monthly_partitions(text, integer, date)')")).scalar():
+        return
+    first_month = date.today().replace(day=1) - timedelta(days=30 * months)
+    for table in ("licenseapplication", "applicationstatushistory"):
+        try:
+            db.execute(text("SELECT ensure_monthly_partitions(:table, 0, :first_month)"), {"table": table, "first_month": first_month})
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"partitions for {table} not created ({str(e).splitlines()[0]}); rows go to the DEFAULT partition")
+
+def load(rows_target: int, seed: int, months: int, batch_size: int) -> Dict[str, int]:
+    db = SessionLocal()
+    # Ids come from the real sequences, one block per batch
+    allocator = IdAllocator(block_size=batch_size)
+    counts = {table: 0 for table in COLUMNS}
+    try:
+        dataset = SyntheticDataset(seed, reference_ids(db), months)
+        ensure_history_partitions(db, months)
+        with_auth_users = bool(db.execute(text("SELECT to_regclass('auth.users')")).scalar())
+        started = time.perf_counter()
+        while sum(counts.values()) < rows_target:
+            rows = dataset.batch(lambda kind, count: allocator.allocate(db, kind, count), batch_size)
+            for table, columns in COLUMNS.items():
+                if table == "auth.users" and not with_auth_users:
+                    continue
+                copy_rows(db, table, rows[table], columns)
+                counts[table] += len(rows[table])
+            db.commit()
+            total = sum(counts.values())
+            print(f"{total} rows ({total / (time.perf_counter() - started):.0f} rows/s)")
+    finally:
+        db.close()
+    return counts
+
+def local_ids() -> IdSource:
+    """Ids numbered from 1 per kind, for rows that never reach the database as generated"""
+    counters = {kind: 0 for kind in ID_SEQUENCES}
+
+    def ids(kind: str, count: int) -> List[str]:
+        first = counters[kind] + 1
+        counters[kind] += count
+        return [format_id(ID_SEQUENCES[kind][0], value) for value in range(first, first + count)]
+    return ids
+
+INSERT_AUTH_USERS_SQL = text(f"""
+INSERT INTO auth.users ({", ".join(COLUMNS["auth.users"])})
+VALUES ({", ".join(f":{column}" for column in COLUMNS["auth.users"])})
+ON CONFLICT DO NOTHING
+""")
+
+def write_jsonl(path: str, records_target: int, seed: int, months: int, batch_size: int) -> int:
+    """
+    BulkApplicationRecord lines, one per generated application. When
+    auth.users exists, the records' users are created there, since the
+    import only creates applicants that have an auth user.
+    """
+    db = SessionLocal()
+    written = 0
+    try:
+        # Different emails from --target db, so imports create new applicants
+        dataset = SyntheticDataset(seed, reference_ids(db), months, email_prefix="import")
+        ids = local_ids()
+        with_auth_users = crud_bulk_import.has_auth_users(db)
+        with open(path, "wb") as output:
+            while written < records_target:
+                rows = dataset.batch(ids, batch_size)
+                if with_auth_users:
+                    # Same seed, same users: a rerun finds them already there
+                    db.execute(INSERT_AUTH_USERS_SQL, [
+                        dict(zip(COLUMNS["auth.users"], row)) for row in rows["auth.users"]
+                    ])
+                    db.commit()
+                applicants = {row[1]: dict(zip(COLUMNS["applicant"], row)) for row in rows["applicant"]}
+                vehicles: Dict[str, List[Tuple[str, str]]] = {}
+                for _, application_id, category_id, clutch_type in rows["applicationvehiclecategory"]:
+                    vehicles.setdefault(application_id, []).append((category_id, clutch_type))
+                for row in rows["licenseapplication"]:
+                    application = dict(zip(COLUMNS["licenseapplication"], row))
+                    applicant = applicants[application["applicant_id"]]
+                    categories = vehicles.get(application["application_id"], [])
+                    record = {
+                        "email": applicant["email"],
+                        "uuid": applicant["uuid"],
+                        "application_type_id": application["application_type_id"],
+                        "application_status_id": application["application_status_id"],
+                        "submission_date": application["submission_date"],
+                        "vehicle_categories": [category_id for category_id, _ in categories],
+                        "clutch_types": [clutch_type for _, clutch_type in categories],
+                        "personal_info": {
+                            column: applicant[column] for column in COLUMNS["applicant"]
+                            if column not in ("uuid", "applicant_id", "email", "created_date")
+                        },
+                        "emergency_contacts": [{
+                            "ec_name": f"{dataset.rng.choice(FIRST_NAMES)} {applicant['family_name']}",
+                            "ec_contact_no": dataset._contact(),
+                        }],
+                    }
+                    output.write(orjson.dumps(record) + b"\n")
+                    written += 1
+    finally:
+        db.close()
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic applicants and applications")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows to write over all tables (jsonl: records)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--months", type=int, default=24, help="spread submissions over this many months")
+    parser.add_argument("--batch-size", type=int, default=5000, help="applicants per transaction")
+    parser.add_argument("--target", choices=["db", "jsonl"], default="db")
+    parser.add_argument("--output", default="synthetic_applications.jsonl", help="file for --target jsonl")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.target == "db":
+        counts = load(args.rows, args.seed, args.months, args.batch_size)
+        for table, count in counts.items():
+            print(f"{table:28} {count:>10}")
+        total = sum(counts.values())
+    else:
+        total = write_jsonl(args.output, args.rows, args.seed, args.months, args.batch_size)
+        print(f"{total} records written to {args.output}")
+    seconds = time.perf_counter() - started
+    print(f"{total} rows in {seconds:.1f}s ({total / seconds:.0f} rows/s)")
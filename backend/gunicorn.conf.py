@@ -0,0 +1,15 @@
+# gunicorn.conf.py
+# gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker app.main:app
+#
+# Metrics from all workers are aggregated through PROMETHEUS_MULTIPROC_DIR,
+# which must exist and be emptied before gunicorn starts.
+import os
+
+from prometheus_client import multiprocess
+
+bind = os.environ.get("BIND", "0.0.0.0:8080")
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,26 @@
+# tests/test_admin_detail.py
+"""GET /admin/applications/{application_id}/detail (app/crud/application_detail.py): one document per application"""
+from app.crud import crud_application_detail
+from app.testing.query_budgets import API
+
+ROUTE = f"{API}/admin/applications/{{application_id}}/detail"
+
+def test_admin_application_detail_cold(client, sample, as_admin, query_budget):
+    crud_application_detail.cache.clear()
+    with query_budget("GET", ROUTE):
+        response = client.get(ROUTE.format(application_id=sample["application_id"]))
+    assert response.status_code == 200
+    assert response.json()["data"]["application_id"] == sample["application_id"]
+
+def test_admin_application_detail_cached(client, sample, as_admin, query_budget):
+    url = ROUTE.format(application_id=sample["application_id"])
+    first = client.get(url)
+    with query_budget("GET", ROUTE) as queries:
+        cached = client.get(url)
+    assert cached.json() == first.json()
+    # Only the version check runs for an unchanged application
+    assert queries.count == 1
+
+def test_admin_application_detail_not_found(client, as_admin):
+    response = client.get(ROUTE.format(application_id="APPID_MISSING"))
+    assert response.status_code == 404
@@ -0,0 +1,36 @@
+# tests/test_bootstrap.py
+"""GET /bootstrap/ (app/api/v1/endpoints/bootstrap.py): one request for reference data and the user's data"""
+from app.crud import crud_reference_data
+from app.testing.query_budgets import API
+from app.utils.supabase_auth import supabase_auth
+
+ROUTE = f"{API}/bootstrap/"
+
+def test_bootstrap_cold(client, as_applicant, query_budget):
+    crud_reference_data.clear()
+    with query_budget("GET", ROUTE):
+        response = client.get(ROUTE)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["user"] is not None
+    assert data["profile"] is not None
+    assert len(data["applications"]) <= data["applications_total"]
+
+def test_bootstrap_skips_known_sections(client, as_applicant, query_budget):
+    reference = client.get(ROUTE).json()["data"]["reference"]
+    known = ",".join(f"{section}:{body['version']}" for section, body in reference.items())
+    with query_budget("GET", ROUTE):
+        response = client.get(ROUTE, params={"known": known})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert all(body["unchanged"] and body["items"] is None for body in data["reference"].values())
+    assert data["profile"] is not None
+
+def test_bootstrap_invalid_token_is_anonymous(client, database, query_budget, monkeypatch):
+    async def reject(access_token):
+        return None
+    monkeypatch.setattr(supabase_auth, "verify_token", reject)
+    with query_budget("GET", ROUTE):
+        response = client.get(ROUTE, headers={"Authorization": "Bearer expired"})
+    assert response.status_code == 200
+    assert response.json()["data"]["user"] is None
@@ -0,0 +1,133 @@
+# tests/test_bulk_import.py
+"""Bulk import (app/utils/bulk_import.py): load_chunk merges and rejects against Postgres"""
+import uuid
+from typing import Any, Dict, Iterator, List
+
+import orjson
+import pytest
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.crud.bulk_import import crud_bulk_import
+from app.utils import bulk_import
+
+CLEANUP_SQL = [
+    "DELETE FROM drivingskill WHERE application_id IN (SELECT application_id FROM {applications})",
+    "DELETE FROM applicationvehiclecategory WHERE application_id IN (SELECT application_id FROM {applications})",
+    "DELETE FROM applicationstatushistory WHERE application_id IN (SELECT application_id FROM {applications})",
+    "DELETE FROM licenseapplication WHERE application_id IN (SELECT application_id FROM {applications})",
+    "DELETE FROM emergencycontact WHERE applicant_id IN (SELECT applicant_id FROM {applicants})",
+    "DELETE FROM applicant WHERE email LIKE :pattern",
+    "DELETE FROM auth.users WHERE email LIKE :pattern",
+]
+APPLICANTS = "applicant WHERE email LIKE :pattern"
+APPLICATIONS = f"licenseapplication WHERE applicant_id IN (SELECT applicant_id FROM {APPLICANTS})"
+
+@pytest.fixture
+def domain(database) -> Iterator[str]:
+    """Email domain of the test's applicants and auth users, all removed afterwards"""
+    domain = f"bulk-{uuid.uuid4().hex[:10]}.example"
+    yield domain
+    db = SessionLocal()
+    try:
+        for statement in CLEANUP_SQL:
+            db.execute(text(statement.format(applications=APPLICATIONS, applicants=APPLICANTS)), {"pattern": f"%@{domain}"})
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.fixture
+def db(database):
+    db = SessionLocal()
+    try:
+        if not crud_bulk_import.has_auth_users(db):
+            pytest.skip("auth.users does not exist")
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def reference(db) -> Dict[str, List[str]]:
+    reference_ids = crud_bulk_import.get_reference_ids(db)
+    db.rollback()
+    bulk_import._init_worker(reference_ids)
+    return {name: sorted(ids) for name, ids in reference_ids.items()}
+
+def auth_user(db, email: str) -> str:
+    user_id = str(uuid.uuid4())
+    db.execute(text("INSERT INTO auth.users (id, email) VALUES (:id, :email)"), {"id": user_id, "email": email})
+    db.commit()
+    return user_id
+
+def record(reference, email: str, **fields: Any) -> bytes:
+    return orjson.dumps({
+        "email": email,
+        "application_type_id": reference["application_types"][0],
+        "vehicle_categories": [reference["vehicle_categories"][0]],
+        "clutch_types": ["Manual"],
+        "personal_info": {"family_name": "Dela Cruz", "first_name": "Juan", "contact_num": "+639171234567"},
+        "emergency_contacts": [{"ec_name": "Maria Dela Cruz", "ec_contact_no": "+639181234567"}],
+        **fields,
+    })
+
+def load(db, lines: List[bytes]) -> Dict[str, Any]:
+    rows, rejected = bulk_import.validate_chunk(list(enumerate(lines, start=1)))
+    assert rejected == []
+    return crud_bulk_import.load_chunk(db, records=rows)
+
+def applications_of(db, email: str) -> List[Any]:
+    return db.execute(text("""
+        SELECT l.application_id, l.application_status_id,
+               (SELECT count(*) FROM applicationstatushistory h WHERE h.application_id = l.application_id) AS history,
+               (SELECT count(*) FROM applicationvehiclecategory v WHERE v.application_id = l.application_id) AS vehicles,
+               (SELECT count(*) FROM drivingskill d WHERE d.application_id = l.application_id) AS skills
+        FROM licenseapplication l JOIN applicant a ON a.applicant_id = l.applicant_id
+        WHERE a.email = :email ORDER BY l.submission_date
+    """), {"email": email}).all()
+
+def test_load_chunk_merges_and_rejects(db, reference, domain):
+    alice, bea, carl, dan = (f"{name}@{domain}" for name in ("alice", "bea", "carl", "dan"))
+    alice_id = auth_user(db, alice)
+    bea_id = auth_user(db, bea)
+
+    result = load(db, [
+        record(reference, alice, uuid=alice_id),
+        record(reference, bea),  # auth user found by email
+        record(reference, carl),  # no auth user
+        record(reference, alice, uuid=alice_id),  # second active application of the type in the chunk
+    ])
+    assert result == {"imported": 2, "rejected_lines": [], "active_conflict_lines": [4], "no_auth_user_lines": [3]}
+    assert db.execute(text("SELECT uuid::text FROM applicant WHERE email = :email"), {"email": bea}).scalar() == bea_id
+    assert db.execute(text("SELECT count(*) FROM applicant WHERE email = :email"), {"email": carl}).scalar() == 0
+    [application] = applications_of(db, alice)
+    assert (application.history, application.vehicles, application.skills) == (1, 1, 1)
+    assert db.execute(text("""
+        SELECT count(*) FROM emergencycontact e JOIN applicant a ON a.applicant_id = e.applicant_id WHERE a.email = :email
+    """), {"email": alice}).scalar() == 1
+
+    result = load(db, [
+        record(reference, alice, application_status_id="ASID_APR", personal_info={"family_name": "Santos"}),
+        record(reference, alice),  # active application of the type already in the database
+        record(reference, dan, uuid=alice_id),  # uuid of another applicant
+    ])
+    assert result == {"imported": 1, "rejected_lines": [3], "active_conflict_lines": [2], "no_auth_user_lines": []}
+    assert [row.application_status_id for row in applications_of(db, alice)] == ["ASID_PEN", "ASID_APR"]
+    existing = db.execute(text("SELECT family_name, first_name FROM applicant WHERE email = :email"), {"email": alice}).one()
+    # Fields missing from the record keep their value
+    assert tuple(existing) == ("Santos", "Juan")
+
+def test_rejected_lines_keep_their_record(db, reference, domain):
+    lines = [
+        record(reference, f"erin@{domain}"),  # rejected while loading: no auth user
+        record(reference, f"fay@{domain}", application_type_id="ATID_ZZ"),  # rejected by validation
+    ]
+    rejected = []
+    summary = bulk_import.import_applications(lines, workers=1, on_rejected=rejected.append)
+
+    assert summary["received"] == 2 and summary["rejected"] == 2 and summary["imported"] == 0
+    assert sorted((entry["line"], entry["record"]) for entry in rejected) == [
+        (1, lines[0].decode()), (2, lines[1].decode())
+    ]
+    assert [entry["errors"][0]["loc"] for entry in sorted(rejected, key=lambda entry: entry["line"])] == [
+        ["email"], ["application_type_id"]
+    ]
@@ -0,0 +1,108 @@
+# tests/test_email_outbox.py
+"""Email outbox: queued messages delivered to the debugging SMTP server, retries with backoff"""
+import asyncio
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.email_outbox import EmailOutbox
+from app.utils.debug_smtp import DebugSMTPServer
+from app.utils.email import send_otp_email
+from app.utils.email_outbox import EmailOutboxWorker
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def smtp_settings(monkeypatch) -> int:
+    port = _free_port()
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", port)
+    monkeypatch.setattr(settings, "SMTP_TLS", False)
+    monkeypatch.setattr(settings, "SMTP_USER", None)
+    monkeypatch.setattr(settings, "SMTP_PASSWORD", None)
+    monkeypatch.setattr(settings, "EMAILS_FROM_EMAIL", "noreply@madalto.example")
+    return port
+
+@pytest.fixture
+def recipient(database) -> Iterator[str]:
+    """A fresh address; its outbox rows are removed afterwards"""
+    to_email = f"outbox-{uuid.uuid4().hex[:12]}@test.example"
+    yield to_email
+    db = SessionLocal()
+    try:
+        db.query(EmailOutbox).filter(EmailOutbox.to_email == to_email).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def _outbox_row(to_email: str) -> EmailOutbox:
+    db = SessionLocal()
+    try:
+        return db.query(EmailOutbox).filter(EmailOutbox.to_email == to_email).one()
+    finally:
+        db.close()
+
+def _drain_once(worker: EmailOutboxWorker) -> int:
+    async def run() -> int:
+        try:
+            return await worker.drain_once()
+        finally:
+            await worker._close_smtp()
+    return asyncio.run(run())
+
+def test_queued_message_is_delivered(smtp_settings, recipient):
+    assert send_otp_email(recipient, "123456", "login")
+    assert _outbox_row(recipient).status == "Pending"
+
+    with DebugSMTPServer(port=smtp_settings) as server:
+        _drain_once(EmailOutboxWorker())
+
+    delivered = [message for message in server.messages if recipient in message["rcpt_tos"]]
+    assert len(delivered) == 1
+    assert "123456" in delivered[0]["message"].get_body(("plain", "html")).get_content()
+
+    row = _outbox_row(recipient)
+    assert row.status == "Sent"
+    assert row.attempts == 1
+    assert row.sent_at is not None
+    assert row.last_error is None
+
+def test_failed_delivery_is_retried_with_backoff(smtp_settings, recipient, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 30)
+    assert send_otp_email(recipient, "654321", "registration")
+
+    # Nothing listens on the port: the first attempt fails and is rescheduled
+    before = datetime.now(timezone.utc)
+    _drain_once(EmailOutboxWorker())
+    row = _outbox_row(recipient)
+    assert row.status == "Pending"
+    assert row.attempts == 1
+    assert row.last_error
+    assert row.next_attempt_at >= before + timedelta(seconds=30)
+
+    # Not due yet, so the next batch leaves it alone
+    _drain_once(EmailOutboxWorker())
+    assert _outbox_row(recipient).attempts == 1
+
+    # Due again and failing once more: attempts are used up
+    db = SessionLocal()
+    try:
+        db.query(EmailOutbox).filter(EmailOutbox.to_email == recipient).update(
+            {"next_attempt_at": before}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    _drain_once(EmailOutboxWorker())
+    row = _outbox_row(recipient)
+    assert row.status == "Failed"
+    assert row.attempts == 2
@@ -0,0 +1,137 @@
+# tests/test_idempotency.py
+"""Idempotency-Key handling (app/api/idempotency.py) on a stand-in endpoint"""
+import asyncio
+import uuid
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+
+from app.api.deps import get_current_user_token
+from app.api.idempotency import REPLAYED_HEADER, IdempotentRoute, claim_idempotency_key
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.idempotency import IdempotencyKey
+
+class Endpoint:
+    """What the stand-in endpoint does on its next run, and how often it ran"""
+
+    def __init__(self):
+        self.runs = 0
+        self.fail = False
+        self.started: Optional[asyncio.Event] = None
+        self.finish: Optional[asyncio.Event] = None
+
+def build_app(endpoint: Endpoint, owner: str) -> FastAPI:
+    router = APIRouter(route_class=IdempotentRoute)
+
+    @router.post("/orders")
+    async def create_order(body: Dict[str, Any], key: Optional[str] = Depends(claim_idempotency_key)):
+        endpoint.runs += 1
+        if endpoint.started:
+            endpoint.started.set()
+            await endpoint.finish.wait()
+        if endpoint.fail:
+            raise HTTPException(status_code=503, detail="Try again")
+        return {"order": endpoint.runs, **body}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user_token] = lambda: {"id": owner, "email": f"{owner}@test.example"}
+    return app
+
+@pytest.fixture
+def owner(database) -> Iterator[str]:
+    owner = str(uuid.uuid4())
+    yield owner
+    db = SessionLocal()
+    try:
+        db.query(IdempotencyKey).filter(IdempotencyKey.owner == owner).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+@pytest.fixture
+def endpoint() -> Endpoint:
+    return Endpoint()
+
+def run(app: FastAPI, scenario):
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+def post(client: httpx.AsyncClient, key: str, body: Dict[str, Any]):
+    return client.post("/orders", json=body, headers={"Idempotency-Key": key})
+
+def test_retry_replays_the_first_response(owner, endpoint):
+    async def scenario(client):
+        return await post(client, "k1", {"item": "A"}), await post(client, "k1", {"item": "A"})
+
+    first, retry = run(build_app(endpoint, owner), scenario)
+    assert first.status_code == 200
+    assert REPLAYED_HEADER not in first.headers
+    assert retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json() == {"order": 1, "item": "A"}
+    assert endpoint.runs == 1
+
+def test_key_reused_for_another_request_is_rejected(owner, endpoint):
+    async def scenario(client):
+        await post(client, "k1", {"item": "A"})
+        return await post(client, "k1", {"item": "B"})
+
+    response = run(build_app(endpoint, owner), scenario)
+    assert response.status_code == 422
+    assert endpoint.runs == 1
+
+def test_concurrent_retry_waits_for_the_first_attempt(owner, endpoint, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 5.0)
+    endpoint.started, endpoint.finish = asyncio.Event(), asyncio.Event()
+
+    async def scenario(client):
+        first = asyncio.create_task(post(client, "k1", {"item": "A"}))
+        await endpoint.started.wait()
+        retry = asyncio.create_task(post(client, "k1", {"item": "A"}))
+        await asyncio.sleep(0.3)
+        endpoint.finish.set()
+        return await first, await retry
+
+    first, retry = run(build_app(endpoint, owner), scenario)
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    assert endpoint.runs == 1
+
+def test_concurrent_retry_gets_409_after_waiting(owner, endpoint, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0.5)
+    endpoint.started, endpoint.finish = asyncio.Event(), asyncio.Event()
+
+    async def scenario(client):
+        first = asyncio.create_task(post(client, "k1", {"item": "A"}))
+        await endpoint.started.wait()
+        retry = await post(client, "k1", {"item": "A"})
+        endpoint.finish.set()
+        return await first, retry
+
+    first, retry = run(build_app(endpoint, owner), scenario)
+    assert first.status_code == 200
+    assert retry.status_code == 409
+    assert retry.headers["Retry-After"] == "1"
+    assert endpoint.runs == 1
+
+def test_failed_attempt_releases_the_key(owner, endpoint):
+    endpoint.fail = True
+
+    async def scenario(client):
+        failed = await post(client, "k1", {"item": "A"})
+        endpoint.fail = False
+        return failed, await post(client, "k1", {"item": "A"})
+
+    failed, retry = run(build_app(endpoint, owner), scenario)
+    assert failed.status_code == 503
+    assert retry.status_code == 200
+    assert REPLAYED_HEADER not in retry.headers
+    assert retry.json() == {"order": 2, "item": "A"}
+    assert endpoint.runs == 2
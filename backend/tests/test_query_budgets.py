@@ -0,0 +1,147 @@
+# tests/test_query_budgets.py
+"""Statements per request against QUERY_BUDGETS, in the reference scenario"""
+from typing import List
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.testing.query_budgets import API, find_stale_budgets, find_unbudgeted_routes
+from app.utils.id_allocation import id_allocator
+
+APPLICATION_TYPE_IDS = ["ATID_N", "ATID_R", "ATID_D"]
+
+def test_every_route_has_a_budget():
+    assert find_unbudgeted_routes() == []
+    assert find_stale_budgets() == []
+
+@pytest.mark.parametrize("route", [f"{API}/public/", f"{API}/public/health"])
+def test_static_endpoints(client, query_budget, route):
+    with query_budget("GET", route):
+        response = client.get(route)
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("route", [
+    f"{API}/public/application-statuses",
+    f"{API}/public/application-types",
+    f"{API}/public/vehicle-categories",
+    f"{API}/public/locations",
+    f"{API}/public/organ-types",
+])
+def test_reference_data_endpoints(client, database, query_budget, route):
+    with query_budget("GET", route):
+        response = client.get(route)
+    assert response.status_code == 200
+
+@pytest.mark.parametrize("route, url", [
+    (f"{API}/applicants/status", f"{API}/applicants/status"),
+    (f"{API}/applicants/me", f"{API}/applicants/me"),
+    (f"{API}/applications/", f"{API}/applications/?limit=20"),
+    (f"{API}/appointments/", f"{API}/appointments/"),
+])
+def test_applicant_endpoints(client, as_applicant, query_budget, route, url):
+    with query_budget("GET", route):
+        response = client.get(url)
+    assert response.status_code == 200
+
+def test_application_endpoints(client, sample, as_applicant, query_budget):
+    application_id = sample["application_id"]
+    for route in ("{application_id}", "{application_id}/history", "{application_id}/required-documents"):
+        with query_budget("GET", f"{API}/applications/{route}"):
+            response = client.get(f"{API}/applications/{route.format(application_id=application_id)}")
+        assert response.status_code == 200
+
+@pytest.mark.parametrize("route, url", [
+    (f"{API}/admin/dashboard", f"{API}/admin/dashboard"),
+    (f"{API}/admin/applications", f"{API}/admin/applications?limit=20"),
+    (f"{API}/admin/applications/filtered", f"{API}/admin/applications/filtered?limit=20"),
+])
+def test_admin_listings(client, as_admin, query_budget, route, url):
+    with query_budget("GET", route):
+        response = client.get(url)
+    assert response.status_code == 200
+
+@pytest.fixture
+def queued_emails(monkeypatch):
+    """Status emails are queued in the outbox (and counted) instead of only logged"""
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "ENABLE_EMAIL_NOTIFICATIONS", True)
+
+def pending_applications(make_applicant, count: int) -> List[str]:
+    """`count` pending applications, one per applicant and type"""
+    application_ids = []
+    db = SessionLocal()
+    try:
+        while len(application_ids) < count:
+            applicant_id = make_applicant()["applicant_id"]
+            for application_type_id in APPLICATION_TYPE_IDS[:count - len(application_ids)]:
+                application_id = id_allocator.next_id(db, "application")
+                db.execute(text("""
+                    INSERT INTO licenseapplication (application_id, applicant_id, application_type_id, application_status_id)
+                    VALUES (:application_id, :applicant_id, :application_type_id, 'ASID_PEN')
+                """), {"application_id": application_id, "applicant_id": applicant_id, "application_type_id": application_type_id})
+                application_ids.append(application_id)
+        db.commit()
+    finally:
+        db.close()
+    return application_ids
+
+# Write tests start with empty id pools (app/utils/id_allocation.py), so their
+# budgets cover reserving a new block of ids
+
+def test_submit_complete(client, as_new_applicant, queued_emails, query_budget):
+    route = f"{API}/applications/submit-complete"
+    id_allocator.clear()
+    with query_budget("POST", route):
+        response = client.post(route, json={
+            "application_type_id": "ATID_N",
+            "vehicle_categories": ["VCID_A1", "VCID_B1"],
+            "clutch_types": ["Manual", "Automatic"],
+            "personal_info": {"family_name": "Dela Cruz", "first_name": "Juan", "contact_num": "+639171234567"},
+            "emergency_contacts": [{"ec_name": "Maria Dela Cruz", "ec_contact_no": "+639181234567"}],
+            "additional_data": {"drivingSkill": "driving_school"},
+        })
+    assert response.status_code == 200, response.text
+
+def test_document_upload(client, new_applicant, as_new_applicant, query_budget, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    [application_id] = pending_applications(lambda: new_applicant, 1)
+    route = f"{API}/documents/upload"
+    id_allocator.clear()
+    with query_budget("POST", route):
+        response = client.post(
+            route,
+            params={"application_id": application_id, "document_type": "Medical Certificate"},
+            files={"file": ("medical.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+    assert response.status_code == 200, response.text
+
+@pytest.mark.parametrize("action, body", [
+    ("approve", None),
+    ("reject", {"rejection_reason": "Blurred photo", "rejected_by": "admin"}),
+])
+def test_admin_decision(client, as_admin, make_applicant, queued_emails, query_budget, action, body):
+    [application_id] = pending_applications(make_applicant, 1)
+    route = f"{API}/admin/applications/{{application_id}}/{action}"
+    id_allocator.clear()
+    with query_budget("POST", route):
+        response = client.post(route.format(application_id=application_id), json=body)
+    assert response.status_code == 200, response.text
+
+@pytest.mark.parametrize("action, params, body", [
+    ("bulk-approve", None, lambda ids: ids),
+    ("bulk-reject", None, lambda ids: {
+        "request_data": {"rejection_reason": "Blurred photo", "rejected_by": "admin"}, "application_ids": ids
+    }),
+    ("bulk-actions", {"action": "approve"}, lambda ids: ids),
+    ("bulk-actions", {"action": "reject", "rejection_reason": "Blurred photo"}, lambda ids: ids),
+])
+def test_admin_bulk_decisions(client, as_admin, make_applicant, queued_emails, query_budget, action, params, body):
+    application_ids = pending_applications(make_applicant, 5)
+    route = f"{API}/admin/applications/{action}"
+    id_allocator.clear()
+    with query_budget("POST", route):
+        response = client.post(route, params=params, json=body(application_ids))
+    assert response.status_code == 200, response.text
+    assert response.json()["data"]["successful_count"] == 5
@@ -1,5 +1,6 @@
 import { useState, useEffect, useCallback } from 'react';
 import applicationService from '../services/applicationService.js';
+import publicService from '../services/publicService.js';
 
 // Hook for managing user applications
 export const useApplications = (autoFetch = true) => {
@@ -36,6 +37,33 @@ export const useApplications = (autoFetch = true) => {
     }
   }, []);
 
+  // Load the most recent applications from /bootstrap, in the same request as
+  // the reference data; later pages and refreshes use /applications/
+  const fetchInitialApplications = useCallback(async () => {
+    setLoading(true);
+    setError(null);
+
+    try {
+      const response = await publicService.getBootstrap();
+      const items = response.data.applications || [];
+      const total = response.data.applications_total || 0;
+      const limit = Math.max(items.length, 20);
+      setApplications(items);
+      setPagination({
+        total,
+        page: 1,
+        size: limit,
+        pages: Math.ceil(total / limit)
+      });
+      return response;
+    } catch (err) {
+      setError(err.message);
+      throw err;
+    } finally {
+      setLoading(false);
+    }
+  }, []);
+
   // Submit complete application
   const submitApplication = async (applicationData) => {
     setLoading(true);
@@ -94,9 +122,9 @@ export const useApplications = (autoFetch = true) => {
   // Auto-fetch on mount
   useEffect(() => {
     if (autoFetch) {
-      fetchApplications();
+      fetchInitialApplications();
     }
-  }, [autoFetch, fetchApplications]);
+  }, [autoFetch, fetchInitialApplications]);
 
   return {
     applications,
@@ -104,6 +132,7 @@ export const useApplications = (autoFetch = true) => {
     error,
     pagination,
     fetchApplications,
+    fetchInitialApplications,
     submitApplication,
     loadMore,
     refresh,
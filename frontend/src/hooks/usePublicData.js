@@ -20,6 +20,8 @@ export const usePublicData = () => {
     setError(null);
 
     try {
+      // One request for every section; unchanged sections come from the cache
+      await publicService.getBootstrap();
       const [
         applicationTypesResponse,
         applicationStatusesResponse,
@@ -9,12 +9,12 @@ import trash from '../assets/trash2-fill.svg';
 
 const Home = () => {
     const [applicationStatus, setApplicationStatus] = useState('none'); // 'none', 'inprogress', 'pending', 'approved'
-    const { applications, loading, fetchApplications } = useApplications(false); // Don't auto-fetch
+    const { applications, loading, fetchInitialApplications } = useApplications(false); // Don't auto-fetch
 
-    // Fetch applications on component mount
+    // Fetch applications on component mount, with the rest of /bootstrap
     useEffect(() => {
-        fetchApplications();
-    }, [fetchApplications]);
+        fetchInitialApplications();
+    }, [fetchInitialApplications]);
 
     // Determine status based on user's applications
     useEffect(() => {
@@ -19,7 +19,7 @@ class AdminService {
 
   // Get individual application details for admin
   async getApplicationDetails(applicationId) {
-    const response = await apiService.get(`/admin/applications/${applicationId}`);
+    const response = await apiService.get(`/admin/applications/${applicationId}/detail`);
     return response;
   }
 
@@ -1,4 +1,5 @@
 import apiService from './api.js';
+import publicService from './publicService.js';
 
 class ApplicantService {
   // Get current user's profile
@@ -7,6 +8,15 @@ class ApplicantService {
     return response;
   }
 
+  // Current user's status (as /applicants/status) and profile (as
+  // /applicants/me, null before the first application) from /bootstrap,
+  // shared with the reference data loaded on start
+  async getStatusAndProfile() {
+    const response = await publicService.getBootstrap();
+    const { user, profile } = response.data;
+    return { success: true, data: { status: user, profile } };
+  }
+
   // Update current user's profile
   async updateProfile(profileData) {
     const response = await apiService.put('/applicants/me', profileData);
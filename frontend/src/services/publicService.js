@@ -16,6 +16,47 @@ class PublicService {
     return response;
   }
 
+  // Reference sections of /bootstrap and the cache keys the getters below use
+  bootstrapSections = {
+    application_statuses: 'applicationStatuses',
+    application_types: 'applicationTypes',
+    vehicle_categories: 'vehicleCategories',
+    locations: 'locations',
+    organ_types: 'organTypes'
+  };
+
+  // Everything the app loads on start in one request: the reference data and,
+  // when signed in, the user's status, profile and recent applications (an
+  // invalid token is served as signed out). Sections already cached are sent
+  // as known versions and come back without items. Callers that ask while a
+  // request is in flight share it.
+  async getBootstrap() {
+    if (!this.bootstrapRequest) {
+      this.bootstrapRequest = this.fetchBootstrap().finally(() => {
+        this.bootstrapRequest = null;
+      });
+    }
+    return this.bootstrapRequest;
+  }
+
+  async fetchBootstrap() {
+    const versions = this.cache.versions || {};
+    const known = Object.entries(versions).map(([section, version]) => `${section}:${version}`).join(',');
+    const response = await apiService.get(`/bootstrap/${known ? `?known=${encodeURIComponent(known)}` : ''}`);
+
+    const nextVersions = {};
+    Object.entries(response.data.reference).forEach(([section, { version, unchanged, items }]) => {
+      const key = this.bootstrapSections[section];
+      if (!key) return;
+      if (!unchanged || !this.cache[key]) {
+        this.cache[key] = { success: true, data: items || [] };
+      }
+      nextVersions[section] = version;
+    });
+    this.cache.versions = nextVersions;
+    return response;
+  }
+
   // Get all application types
   async getApplicationTypes() {
     if (this.cache.applicationTypes) {